@@ -0,0 +1 @@
+from arinc615a.codec import PROTOCOL_VERSION, decode, encode
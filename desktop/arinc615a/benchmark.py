@@ -0,0 +1,76 @@
+"""
+Microbenchmark do codec ARINC 615A. Antes de medir, confere que cada arquivo de
+exemplo sobrevive a uma ida e volta encode/decode (os testes de ida e volta usam
+os mesmos exemplos, em tests/test_arinc615a.py).
+
+Uso: python -m arinc615a.benchmark [iterações]
+"""
+import sys
+import timeit
+
+from arinc615a.codec import decode, encode
+from data.classes import (
+    ArincLCI,
+    ArincLCL,
+    ArincLCLHardware,
+    ArincLCS,
+    ArincLND,
+    ArincLNA,
+    ArincLNL,
+    ArincLNLFile,
+    ArincLNO,
+    ArincLNR,
+    ArincLNS,
+    ArincLNSFile,
+    ArincLUH,
+    ArincLUI,
+    ArincLUR,
+    ArincLURHeaderFile,
+    ArincLUS,
+    ArincLUSHeaderFile,
+)
+from data.enums import LoadProtocolStatusCode
+from data.errors import ArincCodecError
+
+IN_PROGRESS = LoadProtocolStatusCode.IN_PROGRESS
+
+SAMPLES = [
+    ArincLUI(LoadProtocolStatusCode.ACCEPTED, "Operation accepted"),
+    ArincLUR([ArincLURHeaderFile(f"EMB-SW-00{i}.LUH", f"EMB-SW-00{i}.bin") for i in range(3)]),
+    ArincLUH("EMB-SW-007-137-045", "EMB-HW-002-021-003", "ab" * 32),
+    ArincLUS(IN_PROGRESS, "Transfer in progress", 1234, 30, 0, 0, [
+        ArincLUSHeaderFile(f"EMB-SW-00{i}.bin", f"EMB-SW-00{i}", 0, IN_PROGRESS, "Receiving") for i in range(3)
+    ]),
+    ArincLCI(LoadProtocolStatusCode.ACCEPTED, None),
+    ArincLCL([ArincLCLHardware("EMB-HW-002-021-003", ["L", "R"], ["EMB-SW-007-137-045"])]),
+    ArincLCS(LoadProtocolStatusCode.COMPLETED, "Done", 10, 30, 0),
+    ArincLND(LoadProtocolStatusCode.ACCEPTED, None),
+    ArincLNO(LoadProtocolStatusCode.ACCEPTED, "Operator download"),
+    ArincLNR(["log-1.txt", "log-2.txt"]),
+    ArincLNL([ArincLNLFile("log-1.txt", "Boot log"), ArincLNLFile("log-2.txt", None)]),
+    ArincLNA([ArincLNLFile("log-1.txt", "Boot log")]),
+    ArincLNS(IN_PROGRESS, None, 5, 30, 0, [
+        ArincLNSFile("log-1.txt", IN_PROGRESS, "Sending"),
+    ]),
+]
+
+
+def main(iterations: int) -> None:
+    for message in SAMPLES:
+        data = encode(message)
+        if decode(message.FileType, data) != message:
+            raise ArincCodecError(f"{message.FileType.value} round trip failed")
+
+    print(f"{'type':<5}{'bytes':>7}{'encode (us)':>14}{'decode (us)':>14}")
+    for message in SAMPLES:
+        data = encode(message)
+        encode_time = timeit.timeit(lambda: encode(message), number=iterations)
+        decode_time = timeit.timeit(lambda: decode(message.FileType, data), number=iterations)
+        print(
+            f"{message.FileType.value:<5}{len(data):>7}"
+            f"{encode_time / iterations * 1e6:>14.2f}{decode_time / iterations * 1e6:>14.2f}"
+        )
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10000)
@@ -0,0 +1,381 @@
+import struct
+from typing import Any, Callable, Dict
+
+from data.classes import (
+    ArincLCI,
+    ArincLCL,
+    ArincLCLHardware,
+    ArincLCS,
+    ArincLND,
+    ArincLNA,
+    ArincLNL,
+    ArincLNLFile,
+    ArincLNO,
+    ArincLNR,
+    ArincLNS,
+    ArincLNSFile,
+    ArincLUH,
+    ArincLUI,
+    ArincLUR,
+    ArincLURHeaderFile,
+    ArincLUS,
+    ArincLUSHeaderFile,
+)
+from data.enums import ArincFileType, LoadProtocolStatusCode
+from data.errors import ArincCodecError
+
+PROTOCOL_VERSION = b"A4"
+
+# Layouts fixos (big-endian), compilados uma única vez
+_HEADER = struct.Struct(">I2s")      # file length, protocol version
+_U8 = struct.Struct(">B")
+_U16 = struct.Struct(">H")
+_TIMERS = struct.Struct(">HHH")      # counter, exception timer, estimated time
+_RATIO_COUNT = struct.Struct(">3sH")  # load list ratio, number of header files
+_RATIO_STATUS = struct.Struct(">3sH")  # load ratio, load status
+
+# Convenções dos campos de texto (byte de comprimento + caracteres ASCII):
+# o padrão ARINC 615A conta o NUL final no comprimento; o LUS gerado pelo firmware
+# não conta o NUL mas sempre o escreve; o LUI do firmware não tem NUL.
+_NUL_INCLUDED = 0
+_NUL_EXCLUDED = 1
+_NO_NUL = 2
+
+# LUR e LUH sempre foram enviados com o comprimento total em bits; o firmware não
+# confere esse campo, e o formato é mantido para não alterar os bytes enviados
+_LENGTH_IN_BITS = (ArincFileType.LUR, ArincFileType.LUH)
+
+
+class _Reader:
+    __slots__ = ("view", "offset")
+
+    def __init__(self, data: bytes | bytearray | memoryview):
+        self.view = memoryview(data).cast("B")
+        self.offset = 0
+
+    def unpack(self, layout: struct.Struct) -> tuple:
+        values = layout.unpack_from(self.view, self.offset)
+        self.offset += layout.size
+        return values
+
+    def count(self) -> int:
+        return self.unpack(_U16)[0]
+
+    def status(self) -> LoadProtocolStatusCode:
+        return _status(self.unpack(_U16)[0])
+
+    def string(self, mode: int = _NUL_INCLUDED) -> str:
+        (length,) = self.unpack(_U8)
+        end = self.offset + length
+        if end > len(self.view):
+            raise ArincCodecError("Text field exceeds file length")
+
+        raw = self.view[self.offset:end]
+        self.offset = end
+        if mode == _NUL_EXCLUDED:
+            if end >= len(self.view) or self.view[end] != 0:
+                raise ArincCodecError("Missing NUL terminator")
+            self.offset += 1
+        elif mode == _NUL_INCLUDED and length and raw[-1] == 0:
+            raw = raw[:-1]
+
+        return bytes(raw).decode("ascii")
+
+    def finish(self) -> None:
+        if self.offset > len(self.view):
+            raise ArincCodecError("Unexpected end of file")
+
+
+class _Writer:
+    __slots__ = ("buffer",)
+
+    def __init__(self):
+        # O comprimento é preenchido em finish()
+        self.buffer = bytearray(_HEADER.pack(0, PROTOCOL_VERSION))
+
+    def pack(self, layout: struct.Struct, *values) -> None:
+        self.buffer += layout.pack(*values)
+
+    def count(self, value: int) -> None:
+        self.pack(_U16, value)
+
+    def status(self, code: LoadProtocolStatusCode) -> None:
+        self.pack(_U16, int(code.value, 16))
+
+    def string(self, text: str | None, mode: int = _NUL_INCLUDED) -> None:
+        raw = (text or "").encode("ascii")
+        length = len(raw) + 1 if mode == _NUL_INCLUDED else len(raw)
+        if length > 255:
+            raise ArincCodecError(f"Text field too long: {text!r}")
+
+        self.buffer += _U8.pack(length)
+        self.buffer += raw
+        if mode != _NO_NUL:
+            self.buffer += b"\0"
+
+    def finish(self, file_type: ArincFileType) -> bytes:
+        length = len(self.buffer)
+        if file_type in _LENGTH_IN_BITS:
+            length *= 8
+        _HEADER.pack_into(self.buffer, 0, length, PROTOCOL_VERSION)
+        return bytes(self.buffer)
+
+
+def _status(value: int) -> LoadProtocolStatusCode:
+    try:
+        return LoadProtocolStatusCode(f"{value:04x}")
+    except ValueError as e:
+        raise ArincCodecError(f"Unknown status code 0x{value:04x}") from e
+
+
+def _ratio(raw: bytes) -> int:
+    try:
+        return int(raw.decode("ascii"))
+    except ValueError as e:
+        raise ArincCodecError(f"Invalid ratio field {raw!r}") from e
+
+
+# Arquivos de inicialização (LUI, LCI, LND, LNO): status e descrição
+
+def _encode_init(w: _Writer, m, mode: int = _NUL_INCLUDED) -> None:
+    w.status(m.StatusCode)
+    w.string(m.StatusDescription, mode)
+
+def _decode_init(cls, r: _Reader, mode: int = _NUL_INCLUDED):
+    status = r.status()
+    return cls(status, r.string(mode) or None)
+
+
+def _encode_LUI(w: _Writer, m: ArincLUI) -> None:
+    _encode_init(w, m, _NO_NUL)
+
+def _decode_LUI(r: _Reader) -> ArincLUI:
+    return _decode_init(ArincLUI, r, _NO_NUL)
+
+
+def _encode_LUR(w: _Writer, m: ArincLUR) -> None:
+    w.count(len(m.HeaderFiles))
+    for hf in m.HeaderFiles:
+        w.string(hf.FileName)
+        w.string(hf.PartNumberName)
+
+def _decode_LUR(r: _Reader) -> ArincLUR:
+    return ArincLUR([ArincLURHeaderFile(r.string(), r.string()) for _ in range(r.count())])
+
+
+def _encode_LUH(w: _Writer, m: ArincLUH) -> None:
+    w.string(m.SoftwarePartNumber)
+    w.string(m.HardwarePartNumber)
+    w.string(m.DataHash)
+
+def _decode_LUH(r: _Reader) -> ArincLUH:
+    return ArincLUH(r.string(), r.string(), r.string())
+
+
+def _encode_LUS(w: _Writer, m: ArincLUS) -> None:
+    w.status(m.StatusCode)
+    w.string(m.StatusDescription, _NUL_EXCLUDED)
+    w.pack(_TIMERS, m.Counter, m.ExceptionTimer, m.EstimatedTime)
+    w.pack(_RATIO_COUNT, f"{m.LoadListRatio:03d}".encode("ascii"), len(m.HeaderFiles))
+    for hf in m.HeaderFiles:
+        w.string(hf.FileName, _NUL_EXCLUDED)
+        w.string(hf.PartNumberName, _NUL_EXCLUDED)
+        w.pack(_RATIO_STATUS, f"{hf.LoadRatio:03d}".encode("ascii"), int(hf.LoadStatus.value, 16))
+        w.string(hf.LoadDescription, _NUL_EXCLUDED)
+
+def _decode_LUS(r: _Reader) -> ArincLUS:
+    status = r.status()
+    description = r.string(_NUL_EXCLUDED) or None
+    counter, exception_timer, estimated_time = r.unpack(_TIMERS)
+    ratio, header_file_count = r.unpack(_RATIO_COUNT)
+
+    header_files = []
+    for _ in range(header_file_count):
+        file_name = r.string(_NUL_EXCLUDED)
+        part_number = r.string(_NUL_EXCLUDED)
+        load_ratio, load_status = r.unpack(_RATIO_STATUS)
+        header_files.append(ArincLUSHeaderFile(
+            file_name,
+            part_number,
+            _ratio(load_ratio),
+            _status(load_status),
+            r.string(_NUL_EXCLUDED) or None,
+        ))
+
+    return ArincLUS(
+        status, description, counter, exception_timer, estimated_time, _ratio(ratio), header_files
+    )
+
+
+def _encode_LCI(w: _Writer, m: ArincLCI) -> None:
+    _encode_init(w, m)
+
+def _decode_LCI(r: _Reader) -> ArincLCI:
+    return _decode_init(ArincLCI, r)
+
+
+def _encode_LCL(w: _Writer, m: ArincLCL) -> None:
+    w.count(len(m.Hardware))
+    for hw in m.Hardware:
+        w.string(hw.HardwareId)
+        w.count(len(hw.Positions))
+        for position in hw.Positions:
+            w.string(position)
+        w.count(len(hw.LoadPartNumbers))
+        for part_number in hw.LoadPartNumbers:
+            w.string(part_number)
+
+def _decode_LCL(r: _Reader) -> ArincLCL:
+    hardware = []
+    for _ in range(r.count()):
+        hardware_id = r.string()
+        positions = [r.string() for _ in range(r.count())]
+        part_numbers = [r.string() for _ in range(r.count())]
+        hardware.append(ArincLCLHardware(hardware_id, positions, part_numbers))
+    return ArincLCL(hardware)
+
+
+def _encode_LCS(w: _Writer, m: ArincLCS) -> None:
+    w.status(m.StatusCode)
+    w.string(m.StatusDescription)
+    w.pack(_TIMERS, m.Counter, m.ExceptionTimer, m.EstimatedTime)
+
+def _decode_LCS(r: _Reader) -> ArincLCS:
+    status = r.status()
+    description = r.string() or None
+    return ArincLCS(status, description, *r.unpack(_TIMERS))
+
+
+def _encode_LND(w: _Writer, m: ArincLND) -> None:
+    _encode_init(w, m)
+
+def _decode_LND(r: _Reader) -> ArincLND:
+    return _decode_init(ArincLND, r)
+
+
+def _encode_LNO(w: _Writer, m: ArincLNO) -> None:
+    _encode_init(w, m)
+
+def _decode_LNO(r: _Reader) -> ArincLNO:
+    return _decode_init(ArincLNO, r)
+
+
+def _encode_LNR(w: _Writer, m: ArincLNR) -> None:
+    w.count(len(m.FileNames))
+    for file_name in m.FileNames:
+        w.string(file_name)
+
+def _decode_LNR(r: _Reader) -> ArincLNR:
+    return ArincLNR([r.string() for _ in range(r.count())])
+
+
+def _encode_file_list(w: _Writer, m: ArincLNL | ArincLNA) -> None:
+    w.count(len(m.Files))
+    for f in m.Files:
+        w.string(f.FileName)
+        w.string(f.FileDescription)
+
+def _decode_file_list(r: _Reader) -> list[ArincLNLFile]:
+    files = []
+    for _ in range(r.count()):
+        file_name = r.string()
+        files.append(ArincLNLFile(file_name, r.string() or None))
+    return files
+
+def _decode_LNL(r: _Reader) -> ArincLNL:
+    return ArincLNL(_decode_file_list(r))
+
+def _decode_LNA(r: _Reader) -> ArincLNA:
+    return ArincLNA(_decode_file_list(r))
+
+
+def _encode_LNS(w: _Writer, m: ArincLNS) -> None:
+    w.status(m.StatusCode)
+    w.string(m.StatusDescription)
+    w.pack(_TIMERS, m.Counter, m.ExceptionTimer, m.EstimatedTime)
+    w.count(len(m.Files))
+    for f in m.Files:
+        w.string(f.FileName)
+        w.status(f.FileStatus)
+        w.string(f.FileStatusDescription)
+
+def _decode_LNS(r: _Reader) -> ArincLNS:
+    status = r.status()
+    description = r.string() or None
+    counter, exception_timer, estimated_time = r.unpack(_TIMERS)
+
+    files = []
+    for _ in range(r.count()):
+        file_name = r.string()
+        file_status = r.status()
+        files.append(ArincLNSFile(file_name, file_status, r.string() or None))
+
+    return ArincLNS(status, description, counter, exception_timer, estimated_time, files)
+
+
+_ENCODERS: Dict[ArincFileType, Callable[[_Writer, Any], None]] = {
+    ArincFileType.LUI: _encode_LUI,
+    ArincFileType.LUR: _encode_LUR,
+    ArincFileType.LUH: _encode_LUH,
+    ArincFileType.LUS: _encode_LUS,
+    ArincFileType.LCI: _encode_LCI,
+    ArincFileType.LCL: _encode_LCL,
+    ArincFileType.LCS: _encode_LCS,
+    ArincFileType.LND: _encode_LND,
+    ArincFileType.LNR: _encode_LNR,
+    ArincFileType.LNS: _encode_LNS,
+    ArincFileType.LNO: _encode_LNO,
+    ArincFileType.LNL: _encode_file_list,
+    ArincFileType.LNA: _encode_file_list,
+}
+
+_DECODERS: Dict[ArincFileType, Callable[[_Reader], Any]] = {
+    ArincFileType.LUI: _decode_LUI,
+    ArincFileType.LUR: _decode_LUR,
+    ArincFileType.LUH: _decode_LUH,
+    ArincFileType.LUS: _decode_LUS,
+    ArincFileType.LCI: _decode_LCI,
+    ArincFileType.LCL: _decode_LCL,
+    ArincFileType.LCS: _decode_LCS,
+    ArincFileType.LND: _decode_LND,
+    ArincFileType.LNR: _decode_LNR,
+    ArincFileType.LNS: _decode_LNS,
+    ArincFileType.LNO: _decode_LNO,
+    ArincFileType.LNL: _decode_LNL,
+    ArincFileType.LNA: _decode_LNA,
+}
+
+
+def encode(message) -> bytes:
+    """
+    Codifica um arquivo de protocolo (ArincLUI, ArincLUR, ...) nos bytes enviados por TFTP.
+    """
+    file_type = message.FileType
+    writer = _Writer()
+    try:
+        _ENCODERS[file_type](writer, message)
+    except (struct.error, UnicodeEncodeError) as e:
+        raise ArincCodecError(f"Could not encode {file_type.value} file: {e}") from e
+    return writer.finish(file_type)
+
+
+def decode(file_type: ArincFileType, data: bytes | bytearray | memoryview):
+    """
+    Decodifica os bytes de um arquivo de protocolo do tipo file_type.
+    Lança ArincCodecError se o conteúdo estiver malformado.
+    """
+    reader = _Reader(data)
+    try:
+        declared_length, _ = reader.unpack(_HEADER)
+        message = _DECODERS[file_type](reader)
+        reader.finish()
+    except (struct.error, UnicodeDecodeError) as e:
+        raise ArincCodecError(f"Malformed {file_type.value} file: {e}") from e
+
+    expected_length = len(reader.view) * 8 if file_type in _LENGTH_IN_BITS else len(reader.view)
+    if declared_length != expected_length:
+        raise ArincCodecError(
+            f"{file_type.value} file length mismatch: declared {declared_length}, got {expected_length}"
+        )
+
+    return message
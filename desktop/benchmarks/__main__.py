@@ -0,0 +1,152 @@
+"""
+Benchmarks dos caminhos críticos do desktop: verificação de integridade, catálogo de
+imagens, arquivos ARINC, varredura Wi-Fi e carga completa contra um alvo emulado.
+
+Uso:
+    python -m benchmarks run [-b FILTRO] [--max-size 16M] [-o results.json]
+    python -m benchmarks compare baseline.json results.json [--threshold 1.10]
+    python -m benchmarks impair [-s CENÁRIO ...] [--size 256K] [--timeout 5] [-o report.json]
+    python -m benchmarks record trace.jsonl.gz [-s CENÁRIO] [--size 256K]
+    python -m benchmarks replay trace.jsonl.gz [--realtime] [-o report.json]
+
+compare termina com código 1 se algum benchmark ficou mais lento que a baseline
+além do limite (mediana atual > baseline * threshold), falhou ou não foi executado
+(presente só na baseline). impair faz cargas completas
+através de um proxy que degrada a rede e relata goodput, retransmissões e tempo travado
+em cada cenário. record grava uma carga por um cenário em um trace, e replay reproduz
+um trace (gravado assim ou em campo) contra o desktop, rápido ou no tempo original.
+"""
+import argparse
+import json
+import logging
+import os
+import sys
+
+UNITS = {"K": 1024, "M": 1024 ** 2, "G": 1024 ** 3}
+
+
+def _size(text: str) -> int:
+    text = text.strip().upper().removesuffix("IB").removesuffix("B")
+    if text and text[-1] in UNITS:
+        return int(float(text[:-1]) * UNITS[text[-1]])
+    return int(text)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="run the benchmarks and write the results as JSON")
+    run_parser.add_argument("-b", "--bench", default=None, help="only benchmarks whose name contains this text")
+    run_parser.add_argument("--max-size", type=_size, default=None, help="largest image size (e.g. 256M, 1G)")
+    run_parser.add_argument("-o", "--output", default="benchmark-results.json")
+
+    compare_parser = commands.add_parser("compare", help="compare results against a baseline")
+    compare_parser.add_argument("baseline")
+    compare_parser.add_argument("current")
+    compare_parser.add_argument("--threshold", type=float, default=None)
+
+    impair_parser = commands.add_parser("impair", help="run full loads through an impaired network")
+    impair_parser.add_argument("-s", "--scenario", action="append", default=None, help="scenario name (repeatable)")
+    impair_parser.add_argument("--size", type=_size, default=256 * 1024, help="image data size (e.g. 1M)")
+    impair_parser.add_argument("--tftp", choices=["firmware", "negotiated"], default="firmware")
+    impair_parser.add_argument("--timeout", type=float, default=5, help="loader TFTP server timeout (s)")
+    impair_parser.add_argument("--retries", type=int, default=3, help="loader TFTP server retries")
+    impair_parser.add_argument("--deadline", type=float, default=600, help="cancel loads that take longer (s)")
+    impair_parser.add_argument("--seed", type=int, default=None)
+    impair_parser.add_argument("-o", "--output", default=None)
+
+    record_parser = commands.add_parser("record", help="record a full load through an impaired network")
+    record_parser.add_argument("trace", help="trace file (.jsonl, or .jsonl.gz to compress)")
+    record_parser.add_argument("-s", "--scenario", default="clean")
+    record_parser.add_argument("--size", type=_size, default=256 * 1024, help="image data size (e.g. 1M)")
+    record_parser.add_argument("--deadline", type=float, default=600, help="cancel loads that take longer (s)")
+    record_parser.add_argument("--seed", type=int, default=None)
+
+    replay_parser = commands.add_parser("replay", help="replay a recorded session against the desktop")
+    replay_parser.add_argument("trace")
+    replay_parser.add_argument("--realtime", action="store_true", help="keep the recorded timing")
+    replay_parser.add_argument("--deadline", type=float, default=600, help="cancel loads that take longer (s)")
+    replay_parser.add_argument("-o", "--output", default=None)
+
+    args = parser.parse_args()
+
+    if args.command == "record":
+        logging.disable(logging.INFO)
+
+        from benchmarks.impairment import SCENARIOS, formatReport
+        from benchmarks.replay import recordTrace
+        if args.scenario not in SCENARIOS:
+            parser.error(f"unknown scenario {args.scenario}; available: {', '.join(SCENARIOS)}")
+
+        report = recordTrace(args.trace, args.scenario, args.size, args.seed, args.deadline)
+        print(formatReport(args.scenario, report))
+        print(f"trace written to {args.trace}")
+        return 0
+
+    if args.command == "replay":
+        logging.disable(logging.INFO)
+
+        from benchmarks.replay import formatReplay, replayTrace
+        report = replayTrace(args.trace, args.realtime, args.deadline)
+        print(formatReplay(report))
+        if args.output:
+            with open(args.output, "w") as f:
+                json.dump(report, f, indent=2)
+        return 0 if report["result"] == "SUCCESS" else 1
+
+    if args.command == "impair":
+        logging.disable(logging.INFO)
+
+        from benchmarks.impairment import SCENARIOS, runScenarios
+        names = args.scenario or list(SCENARIOS)
+        unknown = [name for name in names if name not in SCENARIOS]
+        if unknown:
+            parser.error(f"unknown scenario(s) {', '.join(unknown)}; available: {', '.join(SCENARIOS)}")
+
+        report = runScenarios(names, args.size, args.tftp, args.timeout, args.retries, args.deadline, args.seed)
+        if args.output:
+            with open(args.output, "w") as f:
+                json.dump(report, f, indent=2)
+        return 0
+
+    if args.command == "run":
+        # Lido por benchmarks.common ao importar os módulos de benchmark
+        if args.max_size is not None:
+            os.environ["BENCH_MAX_SIZE"] = str(args.max_size)
+        logging.disable(logging.INFO)
+
+        from benchmarks.runner import run
+        results = run(args.bench)
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"{len(results['results'])} results written to {args.output}")
+        return 0
+
+    from benchmarks.runner import DEFAULT_THRESHOLD, compare, formatSeconds
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    with open(args.current) as f:
+        current = json.load(f)
+
+    threshold = args.threshold or DEFAULT_THRESHOLD
+    rows = compare(baseline, current, threshold)
+    width = max((len(row[0]) for row in rows), default=10)
+    print(f"{'benchmark':<{width}}  {'baseline':>12}  {'current':>12}  {'ratio':>7}")
+    for key, base, value, status in rows:
+        ratio = f"{value / base:.2f}" if base and value else "-"
+        print(f"{key:<{width}}  {formatSeconds(base):>12}  {formatSeconds(value):>12}  {ratio:>7}  {status}")
+
+    # Benchmarks que falharam ou sumiram não podem esconder uma regressão
+    counts = {status: sum(1 for row in rows if row[3] == status) for status in ("regression", "failed", "missing")}
+    if any(counts.values()):
+        print(
+            f"{counts['regression']} regression(s) above {threshold:.2f}x, "
+            f"{counts['failed']} failed, {counts['missing']} missing"
+        )
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,88 @@
+from types import SimpleNamespace
+
+import arinc615a
+from benchmarks.common import fileRecord, image, workDir
+from data.classes import ArincLUI, ArincLUS, ArincLUSHeaderFile, Connection, Package, Request, Response
+from data.enums import ArincFileType, LoadProtocolStatusCode
+from interfaces.connection_transport import IConnectionTransport
+from services.arinc_module import ArincModule
+from services.connection_service import ConnectionService
+from services.tftp_router import TftpRouter
+
+IN_PROGRESS = LoadProtocolStatusCode.IN_PROGRESS
+
+
+class ArincFiles:
+    """
+    Codificação dos arquivos enviados pelo ArincModule (LUR e LUH, com e sem o cache de
+    arquivos codificados) e decodificação dos arquivos recebidos do alvo (LUI e LUS).
+    """
+
+    def setup(self):
+        connection_service = SimpleNamespace(currentConnection=None)
+        router = TftpRouter(workDir("arinc", "server"), "127.0.0.1", 0)
+        self.module = ArincModule(connection_service, workDir("arinc"), tftp_router=router)
+        self.records = [fileRecord(image(1024, f"EMB-SW-ARINC-{i}"), f"EMB-SW-ARINC-{i}", "ab" * 32) for i in range(3)]
+        self.lui = arinc615a.encode(ArincLUI(LoadProtocolStatusCode.ACCEPTED, None))
+        self.lus = arinc615a.encode(ArincLUS(IN_PROGRESS, "operation in progress", 1234, 30, 0, 0, [
+            ArincLUSHeaderFile(f"{r.softwarePN}.LUH", f"{r.softwarePN}.bin", 0, IN_PROGRESS, "operation in progress")
+            for r in self.records
+        ]))
+
+    def time_encode_LUR(self):
+        self.module._encoded_cache.clear()
+        self.module._LUR_bytes(self.records)
+
+    def time_encode_LUR_cached(self):
+        self.module._LUR_bytes(self.records)
+
+    def time_encode_LUH(self):
+        self.module._encoded_cache.clear()
+        self.module._LUH_bytes(self.records[0])
+
+    def time_decode_LUI(self):
+        self.module._decode(ArincFileType.LUI, self.lui)
+
+    def time_decode_LUS(self):
+        self.module._decode(ArincFileType.LUS, self.lus)
+
+
+class _ScanTransport(IConnectionTransport):
+    # Resultado de varredura com cada SSID repetido em três pontos de acesso
+    def __init__(self, networks: int):
+        self.networks = [
+            {"ssid": f"EMB-HW-{i // 3:05d}", "info": {"signal": f"{-30 - i % 60} dBm", "security": "WPA3 SAE"}}
+            for i in range(networks)
+        ]
+
+    def scan(self):
+        return self.networks
+
+    def connect(self, target: str, password: str | None = None) -> Connection:
+        raise NotImplementedError
+
+    def disconnect(self) -> None:
+        pass
+
+    def sendPackage(self, pkg: Package) -> None:
+        raise NotImplementedError
+
+    def receivePackage(self, file_name: str, in_memory: bool = False) -> Package:
+        raise NotImplementedError
+
+    def sendRequest(self, req: Request, target: str, timeout: int) -> Response:
+        raise NotImplementedError
+
+
+class ConnectionScan:
+    """
+    Consolidação do resultado da varredura Wi-Fi por SSID.
+    """
+    params = [[10, 100, 1000, 10000]]
+    param_names = ["networks"]
+
+    def setup(self, networks):
+        self.service = ConnectionService(_ScanTransport(networks))
+
+    def time_scan(self, networks):
+        self.service.scan()
@@ -0,0 +1,61 @@
+import itertools
+import os
+
+from benchmarks.common import CATALOG_SIZES, HARDWARE_PN, MIB, catalogDir, workDir, writeImage
+from services.file_validator_service import FileValidatorService
+from services.imported_files_service import ImportedFilesService
+
+# Números de SW PN ainda não usados por importações medidas
+_import_ids = itertools.count()
+
+
+class CatalogQueries:
+    """
+    Listagem do catálogo com o cache em memória já carregado (caso da tela de imagens)
+    e a primeira listagem, que lê o catálogo do disco.
+    """
+    params = [CATALOG_SIZES]
+    param_names = ["entries"]
+
+    def setup(self, entries):
+        self.service = ImportedFilesService(FileValidatorService(), catalogDir(entries), watch=False)
+        self.service.list()
+
+    def teardown(self, entries):
+        self.service.close()
+
+    def time_list(self, entries):
+        self.service.list()
+
+    def time_listFiltered(self, entries):
+        self.service.listFiltered("EMB-HW-001")
+
+    def time_list_cold(self, entries):
+        service = ImportedFilesService(FileValidatorService(), self.service.storage_path, watch=False)
+        try:
+            service.list()
+        finally:
+            service.close()
+
+
+class ImportFile:
+    """
+    Importação de uma imagem de 1 MiB em catálogos de tamanhos diferentes.
+    """
+    params = [CATALOG_SIZES]
+    param_names = ["entries"]
+    number = 1
+    repeat = 10
+
+    def setup(self, entries):
+        self.service = ImportedFilesService(FileValidatorService(), catalogDir(entries), watch=False)
+        self.software_pn = f"EMB-SW-IMPORT-{next(_import_ids)}"
+        self.file = writeImage(f"{workDir('imports')}/{self.software_pn}.bin", MIB, self.software_pn, HARDWARE_PN)
+
+    def teardown(self, entries):
+        self.service.delete(self.software_pn)
+        self.service.close()
+        os.remove(self.file.path)
+
+    def time_importFile(self, entries):
+        self.service.importFile(self.file)
@@ -0,0 +1,60 @@
+import time
+
+from benchmarks.common import IMAGE_SIZES, HARDWARE_PN, fileRecord, image, workDir
+from data.classes import TftpOptions
+from data.enums import ArincTransferResult
+from emulator import LoopbackTransport, TargetEmulator
+from services.arinc_module import ArincModule
+from services.connection_service import ConnectionService
+from services.tftp_router import TftpRouter
+
+# Intervalo de consulta do progresso, como o da tela de transferência mas mais curto
+POLL_INTERVAL = 0.01
+
+
+class FullLoad:
+    """
+    Carga completa, de startTransfer até SUCCESS, contra um alvo emulado no loopback.
+    "firmware" usa TFTP básico como o firmware atual; "negotiated" pede as opções
+    padrão do desktop (blksize, windowsize e tsize).
+    """
+    params = [IMAGE_SIZES, ["firmware", "negotiated"]]
+    param_names = ["size", "tftp"]
+    number = 1
+    repeat = 3
+    timeout = 3600
+
+    def setup(self, size, tftp):
+        self.router = TftpRouter(workDir("load", "server"), "127.0.0.1", 0)
+        self.router.start()
+
+        options = TftpOptions() if tftp == "negotiated" else None
+        self.target = TargetEmulator(
+            HARDWARE_PN, "127.0.0.2", 0, "127.0.0.1", self.router.port, workDir("load", "target"), options,
+            negotiate_options=tftp == "negotiated",
+        )
+        self.target.start()
+
+        self.connection_service = ConnectionService(LoopbackTransport([self.target]), test_mode=False)
+        self.connection_service.connect(self.target.ssid)
+        self.module = ArincModule(self.connection_service, workDir("load"), tftp_router=self.router)
+
+        file = image(size)
+        self.record = fileRecord(file, file.fileName.removesuffix(".bin"))
+
+    def teardown(self, size, tftp):
+        self.connection_service.disconnect()
+        self.target.stop()
+        self.router.stop()
+
+    def time_load(self, size, tftp):
+        if not self.module.startTransfer(self.record):
+            raise RuntimeError("Load not accepted by the emulated target")
+
+        status = self.module.getProgress()
+        while not status.transferResult:
+            time.sleep(POLL_INTERVAL)
+            status = self.module.getProgress()
+
+        if status.transferResult != ArincTransferResult.SUCCESS:
+            raise RuntimeError(f"Load finished with {status.transferResult}")
@@ -0,0 +1,28 @@
+from benchmarks.common import IMAGE_SIZES, image, workDir
+from services.file_validator_service import FileValidatorService
+from services.verification_cache import VerificationCache
+
+
+class CheckIntegrity:
+    """
+    SHA-256 da seção de dados: leitura em streaming, com a seção carregada em memória
+    e com o veredito vindo do cache de verificação.
+    """
+    params = [IMAGE_SIZES]
+    param_names = ["size"]
+    timeout = 600
+
+    def setup(self, size):
+        self.file = image(size)
+        self.validator = FileValidatorService()
+        self.cached_validator = FileValidatorService(VerificationCache(f"{workDir('cache')}/verification-{size}.json"))
+        self.cached_validator.checkIntegrity(self.file)
+
+    def time_streaming(self, size):
+        self.validator.checkIntegrity(self.file)
+
+    def time_in_memory(self, size):
+        self.validator.checkIntegrity(self.file, include_data=True)
+
+    def time_cached(self, size):
+        self.cached_validator.checkIntegrity(self.file)
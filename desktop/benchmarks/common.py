@@ -0,0 +1,83 @@
+import hashlib
+import os
+import tempfile
+from datetime import datetime
+
+from data.classes import File, FileRecord
+from services.image_catalog import ImageCatalog
+
+KIB = 1024
+MIB = 1024 * KIB
+GIB = 1024 * MIB
+
+# Tamanhos de imagem medidos; os maiores que BENCH_MAX_SIZE (padrão 16 MiB) ficam de fora
+ALL_IMAGE_SIZES = [1 * MIB, 16 * MIB, 256 * MIB, 1 * GIB]
+IMAGE_SIZES = [s for s in ALL_IMAGE_SIZES if s <= int(os.environ.get("BENCH_MAX_SIZE", 16 * MIB))]
+
+# Tamanhos do catálogo medidos (número de imagens importadas)
+CATALOG_SIZES = [10, 100, 1000, 10000]
+
+HARDWARE_PN = "EMB-HW-002-021-003"
+
+# Diretório de trabalho dos benchmarks; imagens geradas são reaproveitadas entre execuções
+WORK_DIR = os.environ.get("BENCH_WORK_DIR", os.path.join(tempfile.gettempdir(), "pes4-benchmarks"))
+
+def workDir(*parts: str) -> str:
+    path = os.path.join(WORK_DIR, *parts)
+    os.makedirs(path, exist_ok=True)
+    return path
+
+def writeImage(path: str, data_size: int, software_pn: str, hardware_pn: str = HARDWARE_PN) -> File:
+    """
+    Grava uma imagem válida (header com os PNs, dados aleatórios e SHA-256 no trailer).
+    """
+    digest = hashlib.sha256()
+    with open(path, "wb") as f:
+        f.write(software_pn.encode("ascii").ljust(20, b"\0") + hardware_pn.encode("ascii").ljust(20, b"\0"))
+        remaining = data_size
+        while remaining:
+            chunk = os.urandom(min(MIB, remaining))
+            digest.update(chunk)
+            f.write(chunk)
+            remaining -= len(chunk)
+        f.write(digest.digest())
+    return File(path, os.path.basename(path))
+
+def image(data_size: int, software_pn: str | None = None) -> File:
+    """
+    Imagem de data_size bytes de dados, gerada uma única vez por tamanho.
+    """
+    software_pn = software_pn or f"EMB-SW-BENCH-{data_size}"
+    path = os.path.join(workDir("images"), f"{software_pn}.bin")
+    if os.path.exists(path):
+        return File(path, os.path.basename(path))
+    return writeImage(path, data_size, software_pn)
+
+def fileRecord(file: File, software_pn: str, data_hash: str = "", hardware_pn: str = HARDWARE_PN) -> FileRecord:
+    return FileRecord(file, software_pn, hardware_pn, data_hash, datetime.now(), os.path.getsize(file.path))
+
+def catalogDir(entries: int) -> str:
+    """
+    Diretório de armazenamento com um catálogo de entries imagens, espalhadas entre
+    dez hardware PNs. Só o catálogo é preenchido; os arquivos .bin não são gerados.
+    """
+    path = workDir(f"catalog-{entries}")
+    catalog = ImageCatalog(path)
+    try:
+        if len(catalog.list()) < entries:
+            records = [
+                FileRecord(
+                    File(os.path.join(path, f"EMB-SW-{i:06d}.bin"), f"EMB-SW-{i:06d}.bin"),
+                    f"EMB-SW-{i:06d}",
+                    f"EMB-HW-{i % 10:03d}",
+                    f"{i:064x}",
+                    datetime.now(),
+                    MIB,
+                )
+                for i in range(entries)
+            ]
+            catalog.replaceAll(records)
+        catalog.markMigrated()
+    finally:
+        catalog.close()
+    return path
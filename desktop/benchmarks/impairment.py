@@ -0,0 +1,186 @@
+"""
+Cargas completas através de ImpairmentProxy, um cenário de rede por vez, para ajustar
+timeouts e retransmissões do TFTP com dados. Os dois sentidos da carga passam pelo
+proxy: desktop -> alvo (LUI e LUR) e alvo -> desktop (LUH, imagem e LUS).
+"""
+import contextlib
+import io
+import time
+from dataclasses import asdict
+from typing import Dict
+
+from benchmarks.common import HARDWARE_PN, fileRecord, image, workDir
+from data.classes import NetworkImpairment, TftpOptions
+from emulator import ImpairmentProxy, LoopbackTransport, TargetEmulator
+from services.arinc_module import ArincModule
+from services.connection_service import ConnectionService
+from services.tftp_router import TftpRouter
+from services.transport_trace import RecordingTransport, TransportRecorder
+
+# Cenários aplicados igualmente nos dois sentidos dos dois proxies
+SCENARIOS: Dict[str, NetworkImpairment] = {
+    "clean": NetworkImpairment(),
+    "wifi": NetworkImpairment(loss=0.01, delay=0.002, jitter=0.002),
+    "lossy": NetworkImpairment(loss=0.05, delay=0.002, jitter=0.002),
+    "latency": NetworkImpairment(delay=0.05, jitter=0.01),
+    "reorder": NetworkImpairment(reorder=0.05, reorderDelay=0.02),
+    "duplicate": NetworkImpairment(duplicate=0.05),
+    "hangar": NetworkImpairment(loss=0.03, delay=0.005, jitter=0.01, reorder=0.02, duplicate=0.01),
+}
+
+# Intervalo de consulta do progresso (s)
+POLL_INTERVAL = 0.05
+
+# Períodos sem avanço dos bytes servidos maiores que isso (s) contam como tempo travado
+STALL_THRESHOLD = 0.5
+
+class ImpairedLoad:
+    """
+    Carregador, alvo emulado e dois proxies montados para um cenário. O alvo escuta em
+    127.0.0.2 e fala com o carregador pelo proxy, que preserva o IP de origem para o
+    TftpRouter reconhecer a sessão. Com recorder, a sessão é gravada do lado do
+    carregador, como em campo.
+    """
+
+    def __init__(
+        self,
+        impairment: NetworkImpairment,
+        tftp: str = "firmware",
+        timeout: float = 5,
+        retries: int = 3,
+        seed: int | None = None,
+        recorder: TransportRecorder | None = None,
+    ):
+        self.router = TftpRouter(workDir("impairment", "server"), "127.0.0.1", 0, timeout, retries)
+        self.router.start()
+
+        self.loader_proxy = ImpairmentProxy(
+            "127.0.0.1", self.router.port, "127.0.0.1", 0, impairment, impairment, preserve_source=True, seed=seed,
+        )
+        self.loader_proxy.start()
+
+        options = TftpOptions() if tftp == "negotiated" else None
+        self.target = TargetEmulator(
+            HARDWARE_PN, "127.0.0.2", 0, "127.0.0.1", self.loader_proxy.port, workDir("impairment", "target"), options,
+            negotiate_options=tftp == "negotiated",
+        )
+        self.target.start()
+
+        self.target_proxy = ImpairmentProxy(
+            self.target.address, self.target.port, "127.0.0.1", 0, impairment, impairment,
+            seed=None if seed is None else seed + 1,
+        )
+        self.target_proxy.start()
+
+        transport = LoopbackTransport()
+        transport.addTarget(self.target, ("127.0.0.1", self.target_proxy.port))
+        if recorder is not None:
+            recorder.attach(self.router)
+            transport = RecordingTransport(transport, recorder)
+        self.connection_service = ConnectionService(transport, test_mode=False)
+        self.connection_service.connect(self.target.ssid)
+        self.module = ArincModule(self.connection_service, workDir("impairment"), tftp_router=self.router)
+
+    def close(self) -> None:
+        self.connection_service.disconnect()
+        self.target_proxy.stop()
+        self.target.stop()
+        self.loader_proxy.stop()
+        self.router.stop()
+
+    def run(self, size: int, deadline: float) -> dict:
+        """
+        Carrega uma imagem com size bytes de dados e mede o resultado. A carga é cancelada
+        se não terminar em deadline segundos.
+        """
+        file = image(size)
+        record = fileRecord(file, file.fileName.removesuffix(".bin"))
+
+        started = time.monotonic()
+        # O ArincModule imprime o LUS final no stdout; fica fora do relatório
+        with contextlib.redirect_stdout(io.StringIO()):
+            if not self.module.startTransfer(record):
+                raise RuntimeError("Load not accepted by the emulated target")
+
+            stall = 0.0
+            last_bytes = 0
+            last_progress = started
+            status = self.module.getProgress()
+            result = None
+            while result is None:
+                time.sleep(POLL_INTERVAL)
+                now = time.monotonic()
+                if now - started > deadline:
+                    self.module.cancel()
+                    result = "DEADLINE"
+                else:
+                    status = self.module.getProgress()
+                    if status.transferResult is not None:
+                        result = status.transferResult.name
+                if status.bytesSent != last_bytes or result is not None:
+                    if now - last_progress > STALL_THRESHOLD:
+                        stall += now - last_progress
+                    last_bytes = status.bytesSent
+                    last_progress = now
+
+        elapsed = time.monotonic() - started
+        load = self.target.lastLoad()
+        received = load.bytesReceived if load is not None else 0
+        proxies = (self.loader_proxy, self.target_proxy)
+        stats = [s for proxy in proxies for s in proxy.stats.values()]
+        return {
+            "result": result,
+            "elapsed": elapsed,
+            "bytes": received,
+            "goodput": received / elapsed if elapsed else 0.0,
+            "retransmits": sum(s.dataRetransmits for s in stats),
+            "stall": stall,
+            "packets": sum(s.packets for s in stats),
+            "dropped": sum(s.dropped for s in stats),
+            "duplicated": sum(s.duplicated for s in stats),
+            "reordered": sum(s.reordered for s in stats),
+        }
+
+def runScenarios(
+    names: list[str],
+    size: int,
+    tftp: str = "firmware",
+    timeout: float = 5,
+    retries: int = 3,
+    deadline: float = 600,
+    seed: int | None = None,
+    log=print,
+) -> dict:
+    reports = {}
+    for name in names:
+        impairment = SCENARIOS[name]
+        load = ImpairedLoad(impairment, tftp, timeout, retries, seed)
+        try:
+            report = load.run(size, deadline)
+        except Exception as e:
+            report = {"result": "ERROR", "error": str(e)}
+        finally:
+            load.close()
+
+        report["impairment"] = asdict(impairment)
+        reports[name] = report
+        log(formatReport(name, report))
+
+    return {
+        "size": size,
+        "tftp": tftp,
+        "timeout": timeout,
+        "retries": retries,
+        "seed": seed,
+        "scenarios": reports,
+    }
+
+def formatReport(name: str, report: dict) -> str:
+    if "elapsed" not in report:
+        return f"{name:<10} {report['result']:<9} {report.get('error', '')}"
+    return (
+        f"{name:<10} {report['result']:<9} {report['elapsed']:8.2f} s {report['goodput'] / 1024:9.1f} KiB/s "
+        f"{report['retransmits']:6d} retx {report['stall']:7.2f} s stalled "
+        f"({report['dropped']} dropped, {report['duplicated']} dup, {report['reordered']} reordered "
+        f"of {report['packets']})"
+    )
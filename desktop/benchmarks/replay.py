@@ -0,0 +1,100 @@
+"""
+Testes de desempenho a partir de traces de sessões reais: record grava uma carga
+completa através de um cenário de ImpairmentProxy (ou o trace vem do campo, gravado com
+TRANSPORT_TRACE), e replay reproduz o trace contra o desktop e mede a carga.
+"""
+import contextlib
+import io
+import os
+import time
+
+from benchmarks.common import HARDWARE_PN, fileRecord, workDir, writeImage
+from benchmarks.impairment import POLL_INTERVAL, SCENARIOS, ImpairedLoad
+from data.classes import File
+from emulator import ReplayTransport
+from services.arinc_module import ArincModule
+from services.connection_service import ConnectionService
+from services.file_validator_service import HEADER_SIZE, TRAILER_SIZE
+from services.tftp_router import TftpRouter
+from services.transport_trace import TransportRecorder, readTrace
+
+def recordTrace(path: str, scenario: str, size: int, seed: int | None = None, deadline: float = 600) -> dict:
+    """
+    Grava em path uma carga de size bytes através do cenário e retorna o relatório dela.
+    """
+    recorder = TransportRecorder(path)
+    load = ImpairedLoad(SCENARIOS[scenario], seed=seed, recorder=recorder)
+    try:
+        return load.run(size, deadline)
+    finally:
+        load.close()
+        recorder.close()
+
+def _replay_images(transport: ReplayTransport) -> list:
+    # Imagens com os nomes e tamanhos das baixadas pelo alvo na sessão gravada
+    records = []
+    for name, size in transport.images().items():
+        software_pn = name.removesuffix(".bin")
+        path = os.path.join(workDir("replay", "images"), name)
+        if not os.path.exists(path) or os.path.getsize(path) != size:
+            writeImage(path, max(0, size - HEADER_SIZE - TRAILER_SIZE), software_pn)
+        records.append(fileRecord(File(path, name), software_pn))
+    return records
+
+def replayTrace(path: str, realtime: bool = False, deadline: float = 600) -> dict:
+    """
+    Reproduz o trace em path contra ArincModule e TftpRouter locais e mede a carga.
+    """
+    events = readTrace(path)
+    router = TftpRouter(workDir("replay", "server"), "127.0.0.1", 0)
+    router.start()
+    transport = ReplayTransport(events, router.port, realtime=realtime)
+    connection_service = ConnectionService(transport, test_mode=False)
+    try:
+        device = next((e.fields.get("target") for e in events if e.kind == "connect"), HARDWARE_PN)
+        connection_service.connect(device)
+        module = ArincModule(connection_service, workDir("replay"), tftp_router=router)
+        records = _replay_images(transport)
+
+        started = time.monotonic()
+        with contextlib.redirect_stdout(io.StringIO()):
+            if not module.startTransfer(records):
+                raise RuntimeError("Load not accepted in the replayed session")
+
+            status = module.getProgress()
+            result = None
+            while result is None:
+                time.sleep(POLL_INTERVAL)
+                if time.monotonic() - started > deadline:
+                    module.cancel()
+                    result = "DEADLINE"
+                else:
+                    status = module.getProgress()
+                    if status.transferResult is not None:
+                        result = status.transferResult.name
+        elapsed = time.monotonic() - started
+    finally:
+        connection_service.disconnect()
+        router.stop()
+
+    failed = [name for name, _, _, error in transport.sessions if error is not None]
+    # Duração da carga gravada: do pedido do LUI ao fim da última sessão do alvo
+    loaded_at = next((e.time for e in events if e.kind == "receivePackage"), 0.0)
+    finished_at = max((e.time + e.fields.get("duration", 0.0) for e in events if e.kind == "session"), default=loaded_at)
+    return {
+        "result": result,
+        "realtime": realtime,
+        "elapsed": elapsed,
+        "recorded": finished_at - loaded_at,
+        "bytes": status.bytesSent,
+        "goodput": status.bytesSent / elapsed if elapsed else 0.0,
+        "sessions": len(transport.sessions),
+        "failedSessions": failed,
+    }
+
+def formatReplay(report: dict) -> str:
+    return (
+        f"{report['result']:<9} {report['elapsed']:8.2f} s (recorded {report['recorded']:.2f} s) "
+        f"{report['goodput'] / 1024:9.1f} KiB/s, {report['sessions']} target sessions, "
+        f"{len(report['failedSessions'])} failed"
+    )
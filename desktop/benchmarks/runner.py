@@ -0,0 +1,186 @@
+import contextlib
+import importlib
+import io
+import inspect
+import itertools
+import os
+import pkgutil
+import platform
+import statistics
+import subprocess
+import sys
+import threading
+import time
+import timeit
+import traceback
+from datetime import datetime
+from typing import Iterator, List, Tuple
+
+# Repetições por benchmark quando a classe não define repeat
+DEFAULT_REPEAT = 5
+
+# Tempo máximo (s) de um benchmark, somando todas as repetições, quando a classe não define timeout
+DEFAULT_TIMEOUT = 600.0
+
+# Razão (mediana atual / mediana da baseline) acima da qual há regressão
+DEFAULT_THRESHOLD = 1.10
+
+RESULTS_VERSION = 1
+
+def discover(pattern: str | None = None) -> Iterator[Tuple[str, type, str]]:
+    """
+    Benchmarks dos módulos bench_* deste pacote, no formato do asv: classes com
+    params/param_names, setup/teardown opcionais e métodos time_*.
+    """
+    package = sys.modules[__package__]
+    for module_info in sorted(pkgutil.iter_modules(package.__path__), key=lambda m: m.name):
+        if not module_info.name.startswith("bench_"):
+            continue
+        module = importlib.import_module(f"{__package__}.{module_info.name}")
+        for cls_name, cls in inspect.getmembers(module, inspect.isclass):
+            if cls.__module__ != module.__name__ or cls_name.startswith("_"):
+                continue
+            for method in sorted(name for name in dir(cls) if name.startswith("time_")):
+                name = f"{module_info.name}.{cls_name}.{method}"
+                if pattern is None or pattern in name:
+                    yield name, cls, method
+
+def paramSets(cls: type) -> List[tuple]:
+    params = getattr(cls, "params", [])
+    if params and not isinstance(params[0], (list, tuple)):
+        params = [params]
+    return list(itertools.product(*params)) if params else [()]
+
+def resultKey(name: str, values: tuple) -> str:
+    return f"{name}({', '.join(repr(v) for v in values)})" if values else name
+
+def runBenchmark(cls: type, method: str, values: tuple) -> dict:
+    """
+    Mede method com os parâmetros values. Cada repetição chama setup, executa o método
+    number vezes (number=0 ajusta a quantidade para amostras de pelo menos 0,2 s, como
+    o timeit) e chama teardown. A medição roda em uma thread separada; se passar de
+    timeout segundos (atributo da classe) é lançado TimeoutError, e a thread travada é
+    abandonada para que os demais benchmarks continuem.
+    """
+    timeout = getattr(cls, "timeout", DEFAULT_TIMEOUT)
+    outcome = {}
+
+    def target():
+        try:
+            outcome["result"] = _measure(cls, method, values)
+        except BaseException as e:
+            outcome["error"] = e
+
+    worker = threading.Thread(target=target, name=f"benchmark-{cls.__name__}.{method}", daemon=True)
+    worker.start()
+    worker.join(timeout)
+    if worker.is_alive():
+        raise TimeoutError(f"timed out after {timeout:g} s")
+    if "error" in outcome:
+        raise outcome["error"]
+    return outcome["result"]
+
+def _measure(cls: type, method: str, values: tuple) -> dict:
+    repeat = getattr(cls, "repeat", DEFAULT_REPEAT)
+    number = getattr(cls, "number", 0)
+    samples = []
+
+    for _ in range(repeat):
+        bench = cls()
+        if hasattr(bench, "setup"):
+            bench.setup(*values)
+        try:
+            function = getattr(bench, method)
+            call = lambda: function(*values)
+            if not number:
+                number = timeit.Timer(call).autorange()[0]
+            started = time.perf_counter()
+            for _ in range(number):
+                call()
+            samples.append((time.perf_counter() - started) / number)
+        finally:
+            if hasattr(bench, "teardown"):
+                bench.teardown(*values)
+
+    return {
+        "params": dict(zip(getattr(cls, "param_names", []), values)),
+        "unit": "seconds",
+        "number": number,
+        "repeat": repeat,
+        "min": min(samples),
+        "median": statistics.median(samples),
+        "samples": samples,
+    }
+
+def _commit() -> str | None:
+    try:
+        result = subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True, timeout=10)
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return result.stdout.strip() or None
+
+def run(pattern: str | None = None, log=print) -> dict:
+    results = {}
+    for name, cls, method in discover(pattern):
+        for values in paramSets(cls):
+            key = resultKey(name, values)
+            try:
+                # O ArincModule imprime o LUS final no stdout; fica fora do relatório
+                with contextlib.redirect_stdout(io.StringIO()):
+                    result = runBenchmark(cls, method, values)
+            except NotImplementedError:
+                # Convenção do asv: setup pode recusar uma combinação de parâmetros
+                continue
+            except Exception as e:
+                log(f"{key}: failed ({e})")
+                results[key] = {"error": "".join(traceback.format_exception_only(e)).strip()}
+                continue
+            log(f"{key}: {formatSeconds(result['median'])}")
+            results[key] = result
+
+    return {
+        "version": RESULTS_VERSION,
+        "date": datetime.now().isoformat(),
+        "commit": _commit(),
+        "machine": {
+            "platform": platform.platform(),
+            "python": platform.python_version(),
+            "processor": platform.processor() or platform.machine(),
+            "cpus": os.cpu_count(),
+        },
+        "results": results,
+    }
+
+def compare(baseline: dict, current: dict, threshold: float = DEFAULT_THRESHOLD) -> List[Tuple[str, float | None, float | None, str]]:
+    """
+    Compara as medianas de current com as da baseline. Retorna (benchmark, baseline,
+    atual, situação), onde a situação é regression, improved, failed, new, missing ou vazia.
+    """
+    base_results = baseline.get("results", {})
+    current_results = current.get("results", {})
+    rows = []
+    for key in sorted(set(base_results) | set(current_results)):
+        base = base_results.get(key, {}).get("median")
+        value = current_results.get(key, {}).get("median")
+        if key not in current_results:
+            status = "missing"
+        elif value is None:
+            status = "failed"
+        elif base is None:
+            status = "new"
+        elif value > base * threshold:
+            status = "regression"
+        elif value * threshold < base:
+            status = "improved"
+        else:
+            status = ""
+        rows.append((key, base, value, status))
+    return rows
+
+def formatSeconds(value: float | None) -> str:
+    if value is None:
+        return "-"
+    for unit, scale in (("s", 1), ("ms", 1e-3), ("us", 1e-6)):
+        if value >= scale:
+            return f"{value / scale:.3f} {unit}"
+    return f"{value / 1e-9:.1f} ns"
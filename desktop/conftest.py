@@ -0,0 +1 @@
+# Os módulos do app são importados a partir deste diretório (ex.: "from services...")
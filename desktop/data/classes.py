@@ -1,8 +1,8 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import datetime
 import uuid
 
-from data.enums import ArincFileType, ArincTransferResult, ArincTransferStep, LoadProtocolStatusCode
+from data.enums import ArincFileType, ArincTransferResult, ArincTransferStep, LoadProtocolStatusCode, TransferSessionState
 
 @dataclass
 class User:
@@ -28,6 +28,51 @@ class FileRecord:
     importedAt: datetime
     sizeBytes: int
 
+@dataclass
+class ImportResult:
+    source: str
+    fileRecord: FileRecord | None
+    error: Exception | None
+    sizeBytes: int
+    durationSeconds: float
+
+@dataclass
+class BulkImportResult:
+    results: list[ImportResult]
+    importedCount: int
+    failedCount: int
+    totalBytes: int
+    durationSeconds: float
+    throughputBytesPerSecond: float
+
+@dataclass(frozen=True)
+class IntegrityVerdict:
+    calculatedHash: str
+    extractedHash: str
+    dataSize: int
+    isValid: bool
+
+@dataclass(frozen=True)
+class BlockManifest:
+    # Hashes por bloco da imagem inteira (header + dados + trailer) e a raiz Merkle deles
+    blockSize: int
+    fileSize: int
+    leaves: tuple[bytes, ...]
+    merkleRoot: str
+
+@dataclass(frozen=True)
+class ValidationReport:
+    softwarePN: str
+    hardwarePN: str
+    extractedHash: str
+    calculatedHash: str
+    dataSize: int
+    isIdentified: bool
+    isIntegrityValid: bool
+    # None quando a compatibilidade não foi verificada (sem hardware PN alvo)
+    isCompatible: bool | None
+    validatedAt: datetime
+    durationSeconds: float
 
 @dataclass
 class Connection:
@@ -44,6 +89,16 @@ class Connection:
 class Package:
     name: str
     path: str
+    # Conteúdo em memória; quando presente, path é ignorado
+    data: bytes | None = None
+
+@dataclass(frozen=True)
+class TftpOptions:
+    # Opções pedidas no RRQ/WRQ: blksize (RFC 2348), windowsize (RFC 7440) e tsize (RFC 2349).
+    # None (ou False) deixa a opção de fora do pedido
+    blockSize: int | None = 1428
+    windowSize: int | None = 4
+    transferSize: bool = True
 
 @dataclass
 class Request:
@@ -62,6 +117,78 @@ class TransferStatus:
     fileRecord: FileRecord
     progressPercent: int
     transferResult: ArincTransferResult | None
+    # Lista de carga completa (fileRecord é o primeiro item) e progresso por SW PN
+    fileRecords: list[FileRecord] = field(default_factory=list)
+    fileProgress: dict[str, int] = field(default_factory=dict)
+    # Medição do que foi servido ao alvo: bytes, vazão instantânea e média (bytes/s),
+    # blocos retransmitidos, tempo decorrido e restante estimado (s)
+    bytesSent: int = 0
+    throughput: float = 0.0
+    averageThroughput: float = 0.0
+    retransmissions: int = 0
+    elapsedSeconds: float = 0.0
+    etaSeconds: float | None = None
+    # RTT suavizado e timeout de retransmissão atuais da sessão TFTP com o alvo (s)
+    rttSeconds: float | None = None
+    rtoSeconds: float | None = None
+
+@dataclass
+class TransferSessionStatus:
+    targetId: str
+    state: TransferSessionState
+    fileRecords: list[FileRecord]
+    progressPercent: int
+    # Último status informado pelo módulo de transferência (None enquanto na fila)
+    transferStatus: TransferStatus | None
+    error: Exception | None
+
+@dataclass
+class TargetLoad:
+    # Carga recebida por um alvo emulado: arquivos da lista, bytes baixados e tempos (monotônicos)
+    target: str
+    files: list[str]
+    bytesReceived: int
+    startedAt: float
+    finishedAt: float | None = None
+    statusCode: LoadProtocolStatusCode = LoadProtocolStatusCode.IN_PROGRESS
+
+@dataclass
+class RttEstimate:
+    # Estimativa de RTT de um par (RFC 6298), em segundos; srtt e rttvar são None sem amostras
+    srtt: float | None
+    rttvar: float | None
+    rto: float
+    samples: int
+    timeouts: int
+
+@dataclass
+class NetworkImpairment:
+    # Degradação aplicada a cada datagrama em um sentido: probabilidades de 0 a 1 e tempos
+    # em segundos. Pacotes reordenados são atrasados em reorderDelay além do atraso normal
+    loss: float = 0.0
+    delay: float = 0.0
+    jitter: float = 0.0
+    reorder: float = 0.0
+    reorderDelay: float = 0.02
+    duplicate: float = 0.0
+
+@dataclass
+class ImpairmentStats:
+    # Contadores de um sentido do proxy; dataRetransmits conta DATA TFTP com bloco já visto
+    packets: int = 0
+    bytes: int = 0
+    dropped: int = 0
+    duplicated: int = 0
+    reordered: int = 0
+    dataRetransmits: int = 0
+
+@dataclass
+class TraceEvent:
+    # Evento de um trace de sessão: instante (s, monotônico, desde o início da gravação),
+    # tipo (connect, sendPackage, tftp, upload...) e campos do evento
+    time: float
+    kind: str
+    fields: dict = field(default_factory=dict)
 
 @dataclass
 class ArincLUI:
@@ -103,4 +230,78 @@ class ArincLUH:
     FileType = ArincFileType.LUH
     SoftwarePartNumber: str
     HardwarePartNumber: str
-    DataHash: str
\ No newline at end of file
+    DataHash: str
+
+@dataclass
+class ArincLCI:
+    FileType = ArincFileType.LCI
+    StatusCode: LoadProtocolStatusCode
+    StatusDescription: str | None
+
+@dataclass
+class ArincLCLHardware:
+    HardwareId: str
+    Positions: list[str]
+    LoadPartNumbers: list[str]
+
+@dataclass
+class ArincLCL:
+    FileType = ArincFileType.LCL
+    Hardware: list[ArincLCLHardware]
+
+@dataclass
+class ArincLCS:
+    FileType = ArincFileType.LCS
+    StatusCode: LoadProtocolStatusCode
+    StatusDescription: str | None
+    Counter: int
+    ExceptionTimer: int
+    EstimatedTime: int
+
+@dataclass
+class ArincLND:
+    FileType = ArincFileType.LND
+    StatusCode: LoadProtocolStatusCode
+    StatusDescription: str | None
+
+@dataclass
+class ArincLNO:
+    FileType = ArincFileType.LNO
+    StatusCode: LoadProtocolStatusCode
+    StatusDescription: str | None
+
+@dataclass
+class ArincLNR:
+    FileType = ArincFileType.LNR
+    FileNames: list[str]
+
+@dataclass
+class ArincLNLFile:
+    FileName: str
+    FileDescription: str | None
+
+@dataclass
+class ArincLNL:
+    FileType = ArincFileType.LNL
+    Files: list[ArincLNLFile]
+
+@dataclass
+class ArincLNA:
+    FileType = ArincFileType.LNA
+    Files: list[ArincLNLFile]
+
+@dataclass
+class ArincLNSFile:
+    FileName: str
+    FileStatus: LoadProtocolStatusCode
+    FileStatusDescription: str | None
+
+@dataclass
+class ArincLNS:
+    FileType = ArincFileType.LNS
+    StatusCode: LoadProtocolStatusCode
+    StatusDescription: str | None
+    Counter: int
+    ExceptionTimer: int
+    EstimatedTime: int
+    Files: list[ArincLNSFile]
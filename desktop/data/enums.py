@@ -23,6 +23,15 @@ class ArincFileType(Enum):
     LUS='LUS'
     LUR='LUR'
     LUH='LUH'
+    LCI='LCI'
+    LCL='LCL'
+    LCS='LCS'
+    LND='LND'
+    LNR='LNR'
+    LNS='LNS'
+    LNO='LNO'
+    LNL='LNL'
+    LNA='LNA'
 
 class ArincTransferStep(Enum):
     NOT_IN_TRANSFER='not_in_transfer'
@@ -34,6 +43,13 @@ class ArincTransferResult(Enum):
     SUCCESS='success'
     FAILED='failed'
 
+class TransferSessionState(Enum):
+    QUEUED='queued'
+    RUNNING='running'
+    SUCCESS='success'
+    FAILED='failed'
+    CANCELLED='cancelled'
+
 class LoadProtocolStatusCode(Enum):
     ACCEPTED='0001'
     IN_PROGRESS='0002'
@@ -24,4 +24,22 @@ class CompatibilityError(Exception):
     pass
 
 class FileAccessError(Exception):
-    pass
\ No newline at end of file
+    pass
+
+class ArincCodecError(Exception):
+    pass
+
+class TftpError(Exception):
+    pass
+
+class TftpTimeoutError(TftpError):
+    pass
+
+class TftpFileNotFoundError(TftpError):
+    pass
+
+class TftpOptionsRefusedError(TftpError):
+    pass
+
+class TraceReplayError(Exception):
+    pass
@@ -0,0 +1,4 @@
+from emulator.impairment_proxy import ImpairmentProxy
+from emulator.loopback_transport import LoopbackTransport
+from emulator.replay_transport import ReplayTransport
+from emulator.target import TargetEmulator
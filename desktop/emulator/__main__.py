@@ -0,0 +1,61 @@
+"""
+Alvos ARINC 615A emulados na máquina local, para testes e benchmarks sem hardware.
+Cada alvo recebe um endereço de loopback a partir de --address (127.0.0.2, 127.0.0.3...).
+
+Uso: python -m emulator [--targets N] [--address IP] [--port PORTA]
+                        [--loader IP:PORTA] [--storage DIR]
+"""
+import argparse
+import ipaddress
+import time
+
+from emulator.target import DEFAULT_HARDWARE_PN, DEFAULT_LOADER_PORT, DEFAULT_TARGET_PORT, TargetEmulator
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(prog="python -m emulator")
+    parser.add_argument("--targets", type=int, default=1)
+    parser.add_argument("--address", default="127.0.0.2")
+    parser.add_argument("--port", type=int, default=DEFAULT_TARGET_PORT)
+    parser.add_argument("--loader", default=f"127.0.0.1:{DEFAULT_LOADER_PORT}")
+    parser.add_argument("--storage", default=None)
+    args = parser.parse_args()
+
+    loader_address, _, loader_port = args.loader.rpartition(":")
+    first = ipaddress.ip_address(args.address)
+
+    targets = []
+    for i in range(args.targets):
+        hardware_pn = DEFAULT_HARDWARE_PN if args.targets == 1 else f"{DEFAULT_HARDWARE_PN}-{i + 1}"
+        storage = f"{args.storage}/{hardware_pn}" if args.storage else None
+        target = TargetEmulator(
+            hardware_pn, str(first + i), args.port, loader_address, int(loader_port), storage
+        )
+        target.start()
+        targets.append(target)
+        print(f"{hardware_pn} on {target.address}:{target.port}")
+
+    reported = {id(t): 0 for t in targets}
+    try:
+        while True:
+            time.sleep(1)
+            for target in targets:
+                for load in target.loads[reported[id(target)]:]:
+                    if load.finishedAt is None:
+                        break
+                    elapsed = load.finishedAt - load.startedAt
+                    rate = load.bytesReceived / elapsed / 1024 if elapsed else 0
+                    print(
+                        f"{target.hardware_pn}: {load.statusCode.name} {load.files} "
+                        f"{load.bytesReceived} bytes in {elapsed:.2f} s ({rate:.1f} KiB/s)"
+                    )
+                    reported[id(target)] += 1
+    except KeyboardInterrupt:
+        pass
+    finally:
+        for target in targets:
+            target.stop()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,235 @@
+import asyncio
+import random
+import time
+from typing import Dict, List, Tuple
+
+from data.classes import ImpairmentStats, NetworkImpairment
+from services.logging_service import LoggingService
+from tftp import TftpEngine
+from tftp.packets import BLOCK_MODULUS, DATA, ERR_UNKNOWN_TID, RRQ, WRQ, encodeError
+
+Address = Tuple[str, int]
+
+# Sentidos do tráfego, usados como chave de ImpairmentProxy.stats
+TO_SERVER = "toServer"
+TO_CLIENT = "toClient"
+
+# Fluxos sem tráfego por mais tempo que isso (s) são encerrados
+FLOW_IDLE_TIMEOUT = 120.0
+
+class _Listener(asyncio.DatagramProtocol):
+    def __init__(self, proxy: "ImpairmentProxy"):
+        self.proxy = proxy
+
+    def datagram_received(self, data: bytes, addr: Address) -> None:
+        self.proxy._from_client(data, addr)
+
+class _Flow(asyncio.DatagramProtocol):
+    """
+    Tráfego de um cliente (um TID) através do proxy. O cliente ganha um socket próprio
+    para o servidor; o primeiro pacote vai para a porta conhecida do servidor e os
+    seguintes para o TID da sessão, fixado pela primeira resposta. Como faria o cliente,
+    respostas de outro TID (um RRQ retransmitido que abriu outra sessão) recebem erro.
+    """
+
+    def __init__(self, proxy: "ImpairmentProxy", client: Address):
+        self.proxy = proxy
+        self.client = client
+        self.server: Address = (proxy.upstream_address, proxy.upstream_port)
+        self.locked = False
+        self.transport: asyncio.DatagramTransport | None = None
+        self.lastActivity = time.monotonic()
+        # Maior bloco DATA visto em cada sentido, para contar retransmissões
+        self.blocks: Dict[str, int] = {}
+        self._pending: List[bytes] = []
+        self.opening: asyncio.Task | None = None
+
+    def connection_made(self, transport) -> None:
+        self.transport = transport
+        pending, self._pending = self._pending, []
+        for data in pending:
+            transport.sendto(data, self.server)
+
+    def datagram_received(self, data: bytes, addr: Address) -> None:
+        if not self.locked:
+            self.server = addr
+            self.locked = True
+        elif addr != self.server:
+            self.transport.sendto(encodeError(ERR_UNKNOWN_TID, "Unknown transfer ID"), addr)
+            return
+        self.proxy._forward(self, TO_CLIENT, data)
+
+    def restart(self) -> None:
+        self.server = (self.proxy.upstream_address, self.proxy.upstream_port)
+        self.locked = False
+        self.blocks.clear()
+
+    def send(self, direction: str, data: bytes) -> None:
+        if direction == TO_CLIENT:
+            self.proxy._send_to_client(data, self.client)
+        elif self.transport is None:
+            # Socket para o servidor ainda sendo criado
+            self._pending.append(data)
+        elif not self.transport.is_closing():
+            self.transport.sendto(data, self.server)
+
+    def close(self) -> None:
+        if self.transport is not None:
+            self.transport.close()
+
+class ImpairmentProxy:
+    """
+    Proxy UDP que degrada o tráfego TFTP entre clientes e um servidor, como um enlace
+    Wi-Fi ruim: perda, atraso, jitter, reordenação e duplicação, sorteados para cada
+    datagrama e separadamente em cada sentido. Com jitter maior que o intervalo entre
+    pacotes a ordem também muda, como no netem.
+
+    Entende os TIDs do TFTP: cada cliente fala só com a porta do proxy, que repassa os
+    pacotes para a porta de sessão do servidor. Com preserve_source, os pacotes chegam
+    ao servidor do mesmo IP do cliente (o proxy precisa estar na mesma máquina), para
+    servidores que identificam o alvo pelo endereço de origem, como o TftpRouter.
+    """
+
+    def __init__(
+        self,
+        upstream_address: str,
+        upstream_port: int,
+        address: str = "127.0.0.1",
+        port: int = 0,
+        to_server: NetworkImpairment | None = None,
+        to_client: NetworkImpairment | None = None,
+        preserve_source: bool = False,
+        seed: int | None = None,
+        engine: TftpEngine | None = None,
+    ):
+        self.logging_service = LoggingService(ImpairmentProxy.__name__)
+        self.upstream_address = upstream_address
+        self.upstream_port = upstream_port
+        self.address = address
+        self.port = port
+        self.to_server = to_server or NetworkImpairment()
+        self.to_client = to_client or NetworkImpairment()
+        self.preserve_source = preserve_source
+        # Event loop próprio, para que os atrasos não dependam da carga dos outros loops
+        self.engine = engine or TftpEngine()
+        self._own_engine = engine is None
+
+        self.stats: Dict[str, ImpairmentStats] = {TO_SERVER: ImpairmentStats(), TO_CLIENT: ImpairmentStats()}
+
+        self._random = random.Random(seed)
+        self._flows: Dict[Address, _Flow] = {}
+        self._transport: asyncio.DatagramTransport | None = None
+        self._sweeper: asyncio.Task | None = None
+
+    def start(self) -> None:
+        if self.isRunning():
+            return
+        self.engine.run(self._start())
+        self.logging_service.log(
+            f"Impairment proxy on {self.address}:{self.port} -> {self.upstream_address}:{self.upstream_port}"
+        )
+
+    def stop(self) -> None:
+        if self._transport is not None:
+            self.engine.run(self._stop())
+        if self._own_engine:
+            self.engine.stop()
+
+    def isRunning(self) -> bool:
+        return self._transport is not None and not self._transport.is_closing()
+
+    def resetStats(self) -> None:
+        self.stats = {TO_SERVER: ImpairmentStats(), TO_CLIENT: ImpairmentStats()}
+
+    async def _start(self) -> None:
+        loop = asyncio.get_running_loop()
+        self._transport, _ = await loop.create_datagram_endpoint(
+            lambda: _Listener(self), local_addr=(self.address, self.port)
+        )
+        # Com porta 0 o sistema escolhe a porta
+        self.port = self._transport.get_extra_info("sockname")[1]
+        self._sweeper = loop.create_task(self._sweep())
+
+    async def _stop(self) -> None:
+        transport, self._transport = self._transport, None
+        if self._sweeper is not None:
+            self._sweeper.cancel()
+            self._sweeper = None
+        for flow in self._flows.values():
+            flow.close()
+        self._flows.clear()
+        transport.close()
+
+    async def _sweep(self) -> None:
+        while True:
+            await asyncio.sleep(FLOW_IDLE_TIMEOUT / 4)
+            now = time.monotonic()
+            for client, flow in list(self._flows.items()):
+                if now - flow.lastActivity > FLOW_IDLE_TIMEOUT:
+                    flow.close()
+                    del self._flows[client]
+
+    async def _open(self, flow: _Flow) -> None:
+        local_address = flow.client[0] if self.preserve_source else "0.0.0.0"
+        try:
+            await asyncio.get_running_loop().create_datagram_endpoint(lambda: flow, local_addr=(local_address, 0))
+        except OSError as e:
+            self.logging_service.error(f"Could not open upstream socket for {flow.client}", e)
+            self._flows.pop(flow.client, None)
+
+    def _from_client(self, data: bytes, addr: Address) -> None:
+        flow = self._flows.get(addr)
+        if flow is None:
+            flow = _Flow(self, addr)
+            self._flows[addr] = flow
+            flow.opening = asyncio.get_running_loop().create_task(self._open(flow))
+        elif int.from_bytes(data[:2], "big") in (RRQ, WRQ):
+            # Pedido novo (ou repetido) de uma porta já vista: volta para a porta do servidor
+            flow.restart()
+        self._forward(flow, TO_SERVER, data)
+
+    def _send_to_client(self, data: bytes, client: Address) -> None:
+        if self.isRunning():
+            self._transport.sendto(data, client)
+
+    def _forward(self, flow: _Flow, direction: str, data: bytes) -> None:
+        impairment = self.to_server if direction == TO_SERVER else self.to_client
+        stats = self.stats[direction]
+        stats.packets += 1
+        stats.bytes += len(data)
+        flow.lastActivity = time.monotonic()
+        if self._is_retransmission(flow, direction, data):
+            stats.dataRetransmits += 1
+
+        if self._random.random() < impairment.loss:
+            stats.dropped += 1
+            return
+
+        copies = 1
+        if self._random.random() < impairment.duplicate:
+            stats.duplicated += 1
+            copies = 2
+
+        loop = asyncio.get_running_loop()
+        for _ in range(copies):
+            delay = max(0.0, impairment.delay + self._random.uniform(-impairment.jitter, impairment.jitter))
+            if self._random.random() < impairment.reorder:
+                stats.reordered += 1
+                delay += impairment.reorderDelay
+
+            if delay > 0:
+                loop.call_later(delay, flow.send, direction, data)
+            else:
+                flow.send(direction, data)
+
+    def _is_retransmission(self, flow: _Flow, direction: str, data: bytes) -> bool:
+        # Só pacotes DATA; com rollover, blocos até meia volta à frente contam como novos
+        if len(data) < 4 or int.from_bytes(data[:2], "big") != DATA:
+            return False
+
+        block = int.from_bytes(data[2:4], "big")
+        last = flow.blocks.get(direction)
+        if last is not None and not 0 < (block - last) % BLOCK_MODULUS < BLOCK_MODULUS // 2:
+            return True
+        flow.blocks[direction] = block
+        return False
@@ -0,0 +1,97 @@
+import io
+import os
+import time
+from typing import Dict, List, Tuple
+
+from data.classes import Connection, Package, Request, Response, TftpOptions
+from data.errors import ConnectionAuthenticationError, RequestTimeoutError
+from emulator.target import TargetEmulator
+from interfaces.connection_transport import IConnectionTransport
+from services.tftp_client import TftpTransferClient
+
+class LoopbackTransport(IConnectionTransport):
+    """
+    Transporte para alvos emulados na máquina local. A rede Wi-Fi de cada alvo é o seu
+    hardware PN e conectar é só apontar o cliente TFTP para o endereço do emulador, sem
+    nmcli nem netsh.
+    """
+
+    # Opções TFTP pedidas ao alvo, com fallback para TFTP básico se recusadas
+    tftp_options: TftpOptions = TftpOptions()
+    # Timeout (s) e retransmissões do cliente TFTP, os mesmos dos módulos Wi-Fi
+    timeout: float = 60
+    retries: int = 3
+
+    def __init__(self, targets: List[TargetEmulator] | None = None):
+        self.targets: Dict[str, TargetEmulator] = {}
+        # Endereço TFTP usado no lugar do próprio alvo (ex.: um ImpairmentProxy na frente dele)
+        self.endpoints: Dict[str, Tuple[str, int]] = {}
+        self._tftp_client: TftpTransferClient | None = None
+        self._current: TargetEmulator | None = None
+        for target in targets or []:
+            self.addTarget(target)
+
+    def addTarget(self, target: TargetEmulator, endpoint: Tuple[str, int] | None = None) -> None:
+        self.targets[target.ssid] = target
+        if endpoint is not None:
+            self.endpoints[target.ssid] = endpoint
+
+    def scan(self) -> List[dict]:
+        return [
+            {"ssid": ssid, "info": {"signal": "100 dBm", "security": "WPA3 SAE"}}
+            for ssid, target in self.targets.items()
+            if target.isRunning()
+        ]
+
+    def connect(self, target: str, password: str | None = None) -> Connection:
+        emulator = self.targets.get(target)
+        if emulator is None or not emulator.isRunning():
+            raise ConnectionAuthenticationError(f"Failed to connect to '{target}' (no emulated target).")
+
+        self._current = emulator
+        address, port = self.endpoints.get(target, (emulator.address, emulator.port))
+        self._tftp_client = TftpTransferClient(address, port, self.tftp_options)
+        return Connection(
+            device=target,
+            hardwarePN="",
+            address=emulator.address,
+            connectedAt=int(time.time()),
+            pauseHealthCheck=False
+        )
+
+    def disconnect(self) -> None:
+        self._current = None
+        self._tftp_client = None
+
+    def sendPackage(self, pkg: Package) -> None:
+        if self._tftp_client is None:
+            raise Exception("Not connected")
+
+        source = io.BytesIO(pkg.data) if pkg.data is not None else pkg.path
+        self._tftp_client.upload(pkg.name, source, timeout=self.timeout, retries=self.retries)
+
+    def receivePackage(self, file_name: str, in_memory: bool = False) -> Package:
+        if self._tftp_client is None:
+            raise Exception("Not connected")
+
+        if in_memory:
+            buffer = io.BytesIO()
+            self._tftp_client.download(file_name, buffer, timeout=self.timeout, retries=self.retries)
+            return Package(file_name, "", buffer.getvalue())
+
+        file_path = f'file_directory/tftp/client/{int(time.time())}-{file_name}'
+        os.makedirs(os.path.dirname(file_path), exist_ok=True)
+        self._tftp_client.download(file_name, file_path, timeout=self.timeout, retries=self.retries)
+        return Package(file_name, file_path)
+
+    def sendRequest(self, req: Request, target: str, timeout: int) -> Response:
+        emulator = self._current
+        if req.command == "GET_HARDWARE_PN" and emulator is not None:
+            return Response(status="SUCCESS", data=emulator.hardware_pn)
+        if req.command == "HEALTH_CHECK":
+            if emulator is None or not emulator.isRunning():
+                raise TimeoutError("Target is unreacheable")
+            return Response(status="SUCCESS", data="STATUS_OK")
+        if req.command == "TIMEOUT_REQ":
+            raise RequestTimeoutError("Request timed out")
+        return Response(status="ERROR", data="DEFAULT_RESPONSE_MOCK")
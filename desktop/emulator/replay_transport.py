@@ -0,0 +1,262 @@
+import asyncio
+import collections
+import os
+import time
+from typing import Deque, Dict, List, Tuple
+
+from data.classes import Connection, Package, Request, Response, TftpOptions, TraceEvent
+from data.errors import ConnectionAuthenticationError, RequestTimeoutError, TftpError, TraceReplayError
+from interfaces.connection_transport import IConnectionTransport
+from services.logging_service import LoggingService
+from services.transport_trace import TRANSPORT_CALLS, decodeBytes, readTrace
+from tftp import AsyncTftpClient, TftpEngine
+from tftp.packets import WRQ
+from tftp.streams import AsyncSink
+
+# Erros gravados que são levantados com o mesmo tipo na reprodução; os demais viram Exception
+_ERRORS = {
+    error.__name__: error
+    for error in (ConnectionAuthenticationError, ConnectionError, RequestTimeoutError, TimeoutError, TftpError)
+}
+
+class _DiscardSink(AsyncSink):
+    async def write(self, data: bytes) -> None:
+        pass
+
+class ReplaySession:
+    """
+    Sessão TFTP aberta pelo alvo no trace: instante relativo à chamada de transporte
+    anterior e o que foi pedido ou enviado.
+    """
+
+    def __init__(self, event: TraceEvent, offset: float):
+        self.offset = offset
+        self.opcode = event.fields["op"]
+        self.filename = event.fields["file"]
+        self.options = event.fields.get("options", {})
+        self.size = event.fields.get("size", 0)
+        self.duration = event.fields.get("duration", 0.0)
+        self.complete = event.fields.get("complete", True)
+        data = event.fields.get("data")
+        self.data = decodeBytes(data) if data is not None else None
+
+    def tftpOptions(self) -> TftpOptions:
+        return TftpOptions(
+            int(self.options["blksize"]) if "blksize" in self.options else None,
+            int(self.options["windowsize"]) if "windowsize" in self.options else None,
+            "tsize" in self.options,
+        )
+
+class ReplayTransport(IConnectionTransport):
+    """
+    Reproduz contra o desktop uma sessão gravada por RecordingTransport e
+    TransportRecorder. As chamadas de transporte são respondidas com o que foi gravado,
+    na mesma ordem, e as sessões TFTP que o alvo abriu com o carregador (LUS, LUH e
+    imagens) são refeitas por um cliente TFTP saindo de address, para o TftpRouter em
+    loader_address:loader_port.
+
+    Cada sessão do alvo é disparada a partir da chamada de transporte que a precedeu no
+    trace. Com realtime, as chamadas duram o mesmo que na gravação e as sessões começam
+    no mesmo instante relativo, o que reproduz as pausas e travamentos da sessão
+    original; sem ele, tudo roda o mais rápido possível, na ordem gravada. Os pacotes
+    gravados de cada sessão ficam para análise: a reprodução é por sessão, não por pacote.
+    """
+
+    def __init__(
+        self,
+        trace: str | List[TraceEvent],
+        loader_port: int,
+        loader_address: str = "127.0.0.1",
+        address: str = "127.0.0.2",
+        realtime: bool = False,
+        timeout: float = 5,
+        retries: int = 3,
+        engine: TftpEngine | None = None,
+    ):
+        self.logging_service = LoggingService(ReplayTransport.__name__)
+        events = readTrace(trace) if isinstance(trace, str) else sorted(trace, key=lambda event: event.time)
+        self.loader_port = loader_port
+        self.loader_address = loader_address
+        self.address = address
+        self.realtime = realtime
+        self.timeout = timeout
+        self.retries = retries
+        self.engine = engine or TftpEngine.default()
+
+        # Chamadas de transporte na ordem gravada, cada uma com as sessões do alvo que a seguiram
+        self._calls: List[TraceEvent] = []
+        self._sessions: List[List[ReplaySession]] = []
+        # Sessões antes da primeira chamada começam junto com ela
+        early: List[TraceEvent] = []
+        self._requests: Dict[str, Deque[TraceEvent]] = collections.defaultdict(collections.deque)
+        for event in events:
+            if event.kind in TRANSPORT_CALLS:
+                self._calls.append(event)
+                self._sessions.append([])
+            elif event.kind == "request":
+                self._requests[event.fields["command"]].append(event)
+            elif event.kind == "session":
+                if not self._calls:
+                    early.append(event)
+                else:
+                    self._sessions[-1].append(ReplaySession(event, event.time - self._calls[-1].time))
+        if early and self._sessions:
+            self._sessions[0][:0] = [ReplaySession(event, 0.0) for event in early]
+
+        self._next_call = 0
+        self._connection: Connection | None = None
+        self._tasks: List[asyncio.Future] = []
+        # No modo rápido as sessões rodam uma de cada vez, em ordem
+        self._previous: asyncio.Future | None = None
+        # Sessões refeitas: (arquivo, bytes, duração, erro)
+        self.sessions: List[Tuple[str, int, float, Exception | None]] = []
+
+    def images(self) -> Dict[str, int]:
+        """
+        Imagens baixadas pelo alvo no trace (nome do arquivo -> bytes), para montar a
+        carga a reproduzir.
+        """
+        return {
+            session.filename: session.size
+            for sessions in self._sessions
+            for session in sessions
+            if session.opcode != WRQ and session.filename.endswith(".bin") and session.complete
+        }
+
+    def pending(self) -> int:
+        return sum(1 for task in self._tasks if not task.done())
+
+    def wait(self, timeout: float | None = None) -> None:
+        """
+        Aguarda o fim das sessões do alvo já disparadas.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        for task in list(self._tasks):
+            task.result(None if deadline is None else max(0.0, deadline - time.monotonic()))
+
+    def scan(self) -> List[dict]:
+        event = self._replay_call("scan")
+        return event.fields.get("networks", []) if event is not None else []
+
+    def connect(self, target: str, password: str | None = None) -> Connection:
+        event = self._replay_call("connect", target=target)
+        device = event.fields.get("device", target) if event is not None else target
+        self._connection = Connection(
+            device=device,
+            hardwarePN="",
+            address=self.address,
+            connectedAt=int(time.time()),
+            pauseHealthCheck=False
+        )
+        return self._connection
+
+    def disconnect(self) -> None:
+        self._replay_call("disconnect")
+        self._connection = None
+
+    def sendPackage(self, pkg: Package) -> None:
+        self._replay_call("sendPackage", name=pkg.name)
+
+    def receivePackage(self, file_name: str, in_memory: bool = False) -> Package:
+        event = self._replay_call("receivePackage", name=file_name)
+        if "data" not in event.fields:
+            raise TraceReplayError(f"Trace has no content for {file_name}")
+        data = decodeBytes(event.fields["data"])
+        if in_memory:
+            return Package(file_name, "", data)
+
+        file_path = f'file_directory/tftp/client/{int(time.time())}-{file_name}'
+        os.makedirs(os.path.dirname(file_path), exist_ok=True)
+        with open(file_path, "wb") as f:
+            f.write(data)
+        return Package(file_name, file_path)
+
+    def sendRequest(self, req: Request, target: str, timeout: int) -> Response:
+        # Pedidos (health checks, sobretudo) saem em instantes que variam; são respondidos
+        # na ordem gravada para cada comando, e o último se repete quando acabam
+        recorded = self._requests.get(req.command)
+        if not recorded:
+            if self._connection is None:
+                raise TimeoutError("Target is unreacheable")
+            return Response(status="SUCCESS", data="STATUS_OK")
+
+        event = recorded.popleft() if len(recorded) > 1 else recorded[0]
+        self._sleep(event.fields.get("duration", 0.0), timeout)
+        self._raise_recorded(event)
+        return Response(status=event.fields.get("status", ""), data=event.fields.get("data", ""))
+
+    def _replay_call(self, kind: str, **expected) -> TraceEvent | None:
+        if self._next_call >= len(self._calls):
+            if kind in ("scan", "disconnect"):
+                return None
+            raise TraceReplayError(f"Trace has no more transport calls, got {kind}")
+
+        event = self._calls[self._next_call]
+        if event.kind != kind and kind in ("scan", "disconnect"):
+            # Varreduras e desconexões fora do trace não alteram a sessão
+            return None
+        mismatch = [name for name, value in expected.items() if event.fields.get(name, value) != value]
+        if event.kind != kind or mismatch:
+            raise TraceReplayError(
+                f"Replay diverged at call {self._next_call}: expected {event.kind} {event.fields.get('name', '')}, "
+                f"got {kind} {' '.join(str(value) for value in expected.values())}"
+            )
+
+        index = self._next_call
+        self._next_call += 1
+        started = time.monotonic()
+        self._launch(index, started)
+        self._sleep(event.fields.get("duration", 0.0))
+        self._raise_recorded(event)
+        return event
+
+    def _sleep(self, duration: float, limit: float | None = None) -> None:
+        if self.realtime and duration > 0:
+            time.sleep(duration if limit is None else min(duration, limit))
+
+    def _raise_recorded(self, event: TraceEvent) -> None:
+        error = event.fields.get("error")
+        if error is not None:
+            raise _ERRORS.get(error, Exception)(event.fields.get("message", error))
+
+    def _launch(self, index: int, started: float) -> None:
+        for session in self._sessions[index]:
+            if self.realtime:
+                task = self.engine.submit(self._run_at(session, started + session.offset))
+            else:
+                task = self.engine.submit(self._run_after(session, self._previous))
+                self._previous = task
+            self._tasks.append(task)
+
+    async def _run_at(self, session: ReplaySession, at: float) -> None:
+        await asyncio.sleep(max(0.0, at - time.monotonic()))
+        await self._run(session)
+
+    async def _run_after(self, session: ReplaySession, previous) -> None:
+        if previous is not None:
+            await asyncio.wrap_future(previous)
+        await self._run(session)
+
+    async def _run(self, session: ReplaySession) -> None:
+        client = AsyncTftpClient(
+            self.loader_address, self.loader_port, session.tftpOptions(), self.address, adaptive_timeout=False
+        )
+        started = time.monotonic()
+        transferred = 0
+        error = None
+        try:
+            if session.opcode == WRQ:
+                data = session.data if session.data is not None else bytes(session.size)
+                transfer = client.upload(session.filename, data, self.timeout, self.retries)
+            else:
+                transfer = client.download(session.filename, _DiscardSink(), self.timeout, self.retries)
+            if self.realtime and not session.complete:
+                # A sessão original foi abandonada: a reprodução desiste depois do mesmo tempo
+                transferred = await asyncio.wait_for(transfer, session.duration)
+            else:
+                transferred = await transfer
+        except (TftpError, OSError, asyncio.TimeoutError) as e:
+            error = e
+            if session.complete:
+                self.logging_service.error(f"Replayed session for {session.filename} failed", e)
+        self.sessions.append((session.filename, transferred, time.monotonic() - started, error))
@@ -0,0 +1,318 @@
+import asyncio
+import io
+import os
+import threading
+import time
+from typing import Callable, Dict, List
+
+import arinc615a
+from data.classes import ArincLUI, ArincLURHeaderFile, ArincLUS, ArincLUSHeaderFile, TargetLoad, TftpOptions
+from data.enums import ArincFileType, LoadProtocolStatusCode
+from data.errors import ArincCodecError, TftpError
+from services.logging_service import LoggingService
+from tftp import AsyncTftpClient, AsyncTftpServer, TftpEngine
+
+# PN do hardware gravado no firmware (DEVICE_PN)
+DEFAULT_HARDWARE_PN = "EMB-HW-002-021-003"
+
+# O firmware atende na porta 69; sem privilégios o emulador usa esta porta por padrão
+DEFAULT_TARGET_PORT = 6970
+
+# Porta do servidor TFTP do carregador (ArincModule), de onde o alvo baixa os arquivos
+DEFAULT_LOADER_PORT = 6969
+
+# O firmware envia um LUS a cada 10 blocos recebidos
+STATUS_INTERVAL = 10
+
+# Limite de arquivos por LUR aceito pelo firmware
+MAX_FILE_PER_TRANSFER = 3
+
+# Timeouts dos sockets do firmware: sessão do servidor 3 s, RRQ do cliente 5 s e WRQ
+# do LUS 30 s, sempre com até 3 retransmissões
+SERVER_TIMEOUT = 3.0
+CLIENT_TIMEOUT = 5.0
+STATUS_TIMEOUT = 30.0
+CLIENT_RETRIES = 3
+
+class _UploadBuffer(io.BytesIO):
+    """
+    Arquivo recebido em memória; o conteúdo é entregue a on_complete quando o servidor
+    TFTP fecha o objeto ao fim do upload.
+    """
+
+    def __init__(self, on_complete: Callable[[bytes], None]):
+        super().__init__()
+        self._on_complete = on_complete
+
+    def close(self) -> None:
+        if not self.closed:
+            self._on_complete(self.getvalue())
+        super().close()
+
+class _StatusSender:
+    """
+    Envia os LUS ao carregador um de cada vez, como a fila de mensagens do firmware. Um
+    LUS ainda não enviado é substituído pelo mais recente, já que o contador é cumulativo.
+    """
+
+    def __init__(self, client: AsyncTftpClient, file_name: str, logging_service: LoggingService):
+        self.client = client
+        self.file_name = file_name
+        self.logging_service = logging_service
+        self._pending: bytes | None = None
+        self._ready = asyncio.Event()
+        self._closing = False
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    def post(self, lus: ArincLUS) -> None:
+        self._pending = arinc615a.encode(lus)
+        self._ready.set()
+
+    async def close(self) -> None:
+        # Envia o último LUS pendente antes de encerrar
+        self._closing = True
+        self._ready.set()
+        await self._task
+
+    async def _run(self) -> None:
+        while True:
+            await self._ready.wait()
+            self._ready.clear()
+
+            data, self._pending = self._pending, None
+            if data is not None:
+                try:
+                    await self.client.upload(self.file_name, data, STATUS_TIMEOUT, CLIENT_RETRIES)
+                except TftpError as e:
+                    self.logging_service.error(f"Could not send {self.file_name}", e)
+
+            if self._closing and self._pending is None:
+                return
+
+class TargetEmulator:
+    """
+    Alvo ARINC 615A emulado, com a máquina de estados de upload do firmware (arinc_adapter,
+    tftp_server.c e tftp_client.c): serve o LUI, recebe o LUR, baixa o LUH e a imagem de
+    cada arquivo do servidor TFTP do carregador e envia LUS com o contador de blocos.
+
+    Como o firmware, usa TFTP básico nos dois sentidos (sem opções, blocos de 512 bytes).
+    Diferente dele, baixa todos os arquivos da lista de carga, e não só o primeiro.
+    Vários alvos podem rodar ao mesmo tempo, cada um no seu endereço (127.0.0.x).
+    """
+
+    _engine: TftpEngine | None = None
+    _engine_lock = threading.Lock()
+
+    def __init__(
+        self,
+        hardware_pn: str = DEFAULT_HARDWARE_PN,
+        address: str = "127.0.0.1",
+        port: int = DEFAULT_TARGET_PORT,
+        loader_address: str = "127.0.0.1",
+        loader_port: int = DEFAULT_LOADER_PORT,
+        storage: str | None = None,
+        tftp_options: TftpOptions | None = None,
+        negotiate_options: bool = False,
+        fetch_headers: bool = True,
+        status_interval: int = STATUS_INTERVAL,
+        engine: TftpEngine | None = None,
+    ):
+        self.logging_service = LoggingService(TargetEmulator.__name__)
+        self.hardware_pn = hardware_pn
+        self.address = address
+        self.port = port
+        self.loader_address = loader_address
+        self.loader_port = loader_port
+        # Diretório onde as imagens recebidas são gravadas; sem ele ficam em images
+        self.storage = storage
+        # Opções pedidas nos downloads e aceitas pelo servidor; o firmware não usa nenhuma
+        self.tftp_options = tftp_options or TftpOptions(None, None, False)
+        self.negotiate_options = negotiate_options
+        self.fetch_headers = fetch_headers
+        self.status_interval = status_interval
+        self.engine = engine or TargetEmulator.sharedEngine()
+
+        self.loads: List[TargetLoad] = []
+        self.images: Dict[str, bytes] = {}
+
+        self._server: AsyncTftpServer | None = None
+        self._load_task: asyncio.Task | None = None
+
+        if self.storage:
+            os.makedirs(self.storage, exist_ok=True)
+
+    @classmethod
+    def sharedEngine(cls) -> TftpEngine:
+        """
+        Event loop dos alvos emulados, separado do loop do carregador no mesmo processo.
+        """
+        with cls._engine_lock:
+            if cls._engine is None:
+                cls._engine = TftpEngine()
+            return cls._engine
+
+    @property
+    def ssid(self) -> str:
+        # A rede Wi-Fi do módulo tem o nome do hardware PN
+        return self.hardware_pn
+
+    def start(self) -> None:
+        if self.isRunning():
+            return
+
+        server = AsyncTftpServer(
+            self._read_handler,
+            self._write_handler,
+            self.address,
+            self.port,
+            timeout=SERVER_TIMEOUT,
+            retries=CLIENT_RETRIES,
+            negotiate_options=self.negotiate_options,
+            adaptive_timeout=False,
+        )
+        self.engine.run(server.start())
+        self._server = server
+        # Com porta 0 o sistema escolhe a porta
+        self.port = server.port
+        self.logging_service.log(f"Target {self.hardware_pn} listening on {self.address}:{self.port}")
+
+    def stop(self) -> None:
+        server, self._server = self._server, None
+        if server is not None:
+            self.engine.run(self._stop(server))
+
+    def isRunning(self) -> bool:
+        return self._server is not None and self._server.isRunning()
+
+    def isLoading(self) -> bool:
+        return self._load_task is not None and not self._load_task.done()
+
+    def lastLoad(self) -> TargetLoad | None:
+        return self.loads[-1] if self.loads else None
+
+    def waitLoad(self, timeout: float | None = None) -> TargetLoad | None:
+        """
+        Aguarda o fim da carga em andamento (inclusive o envio do último LUS).
+        """
+        self.engine.run(self._wait_load(), timeout)
+        return self.lastLoad()
+
+    async def _wait_load(self) -> None:
+        if self._load_task is not None:
+            await asyncio.shield(self._load_task)
+
+    async def _stop(self, server: AsyncTftpServer) -> None:
+        if self._load_task is not None:
+            self._load_task.cancel()
+            await asyncio.gather(self._load_task, return_exceptions=True)
+        await server.stop()
+
+    def _client(self) -> AsyncTftpClient:
+        # Pedidos saem do endereço do alvo, pelo qual o carregador identifica a sessão
+        # Os temporizadores do firmware são fixos
+        return AsyncTftpClient(
+            self.loader_address, self.loader_port, self.tftp_options, self.address, adaptive_timeout=False
+        )
+
+    def _read_handler(self, filename: str, peer: str) -> bytes | None:
+        if not filename.endswith(f".{ArincFileType.LUI.value}"):
+            return None
+
+        # O firmware só aceita operações endereçadas ao seu PN
+        if self.hardware_pn in filename and not self.isLoading():
+            lui = ArincLUI(LoadProtocolStatusCode.ACCEPTED, None)
+        else:
+            lui = ArincLUI(LoadProtocolStatusCode.NOT_ACCEPTED, "invalid file name")
+        return arinc615a.encode(lui)
+
+    def _write_handler(self, filename: str, peer: str) -> io.BytesIO | None:
+        if not filename.endswith(f".{ArincFileType.LUR.value}") or self.hardware_pn not in filename:
+            return None
+        if self.isLoading():
+            self.logging_service.log(f"Target {self.hardware_pn} busy, refusing {filename}")
+            return None
+        return _UploadBuffer(self._on_load_request)
+
+    def _on_load_request(self, data: bytes) -> None:
+        try:
+            lur = arinc615a.decode(ArincFileType.LUR, data)
+        except ArincCodecError as e:
+            self.logging_service.error("LUR file corrupted or invalid", e)
+            return
+
+        if not lur.HeaderFiles or len(lur.HeaderFiles) > MAX_FILE_PER_TRANSFER:
+            self.logging_service.log(f"Refusing load list with {len(lur.HeaderFiles)} files")
+            return
+
+        self._load_task = asyncio.get_running_loop().create_task(self._load(lur.HeaderFiles))
+
+    def _status(
+        self,
+        code: LoadProtocolStatusCode,
+        description: str,
+        counter: int,
+        header_files: list[ArincLURHeaderFile],
+        file_status: Dict[str, LoadProtocolStatusCode],
+    ) -> ArincLUS:
+        # Como o firmware: contador de 16 bits, exception timer de 30 s e load ratio zerado
+        return ArincLUS(
+            code, description, counter % (1 << 16), 30, 0, 0,
+            [
+                ArincLUSHeaderFile(hf.FileName, hf.PartNumberName, 0, file_status[hf.PartNumberName], description)
+                for hf in header_files
+            ],
+        )
+
+    async def _load(self, header_files: list[ArincLURHeaderFile]) -> None:
+        load = TargetLoad(self.hardware_pn, [hf.PartNumberName for hf in header_files], 0, time.monotonic())
+        self.loads.append(load)
+
+        client = self._client()
+        sender = _StatusSender(client, f"{self.hardware_pn}_UNDEF.{ArincFileType.LUS.value}", self.logging_service)
+        file_status = {hf.PartNumberName: LoadProtocolStatusCode.IN_PROGRESS for hf in header_files}
+        counter = 0
+
+        def on_block(block: int, size: int) -> None:
+            nonlocal counter
+            counter = block
+            load.bytesReceived += size
+            if block % self.status_interval == 0:
+                sender.post(self._status(
+                    LoadProtocolStatusCode.IN_PROGRESS, "operation in progress", block, header_files, file_status
+                ))
+
+        code = LoadProtocolStatusCode.COMPLETED
+        description = "operation finished without error"
+        try:
+            for header_file in header_files:
+                if self.fetch_headers:
+                    await client.download(header_file.FileName, io.BytesIO(), CLIENT_TIMEOUT, CLIENT_RETRIES)
+
+                await self._download_image(client, header_file.PartNumberName, on_block)
+                file_status[header_file.PartNumberName] = LoadProtocolStatusCode.COMPLETED
+                if header_file is not header_files[-1]:
+                    sender.post(self._status(
+                        LoadProtocolStatusCode.IN_PROGRESS, "operation in progress", counter, header_files, file_status
+                    ))
+        except TftpError as e:
+            self.logging_service.error(f"Target {self.hardware_pn} aborted the load", e)
+            code = LoadProtocolStatusCode.ABORTED_BY_TARGET
+            description = str(e)
+            for name, status in file_status.items():
+                if status != LoadProtocolStatusCode.COMPLETED:
+                    file_status[name] = code
+
+        sender.post(self._status(code, description, counter, header_files, file_status))
+        await sender.close()
+        load.finishedAt = time.monotonic()
+        load.statusCode = code
+
+    async def _download_image(self, client: AsyncTftpClient, name: str, on_block: Callable[[int, int], None]) -> None:
+        if self.storage:
+            path = os.path.join(self.storage, os.path.basename(name))
+            await client.download(name, path, CLIENT_TIMEOUT, CLIENT_RETRIES, on_block)
+            return
+
+        buffer = io.BytesIO()
+        await client.download(name, buffer, CLIENT_TIMEOUT, CLIENT_RETRIES, on_block)
+        self.images[name] = buffer.getvalue()
@@ -21,7 +21,7 @@ class IConnectionTransport(ABC):
         pass
     
     @abstractmethod
-    def receivePackage(self, file_name: str) -> Package:
+    def receivePackage(self, file_name: str, in_memory: bool = False) -> Package:
         pass
     
     @abstractmethod
@@ -4,7 +4,7 @@ from data.classes import FileRecord, TransferStatus
 
 class ITransferProtocol(ABC):
     @abstractmethod
-    def startTransfer(self, file: FileRecord) -> bool:
+    def startTransfer(self, files: FileRecord | list[FileRecord]) -> bool:
         pass
 
     # [BST-237]
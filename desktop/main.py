@@ -10,7 +10,10 @@ from services.file_tranfer_service import FileTransferService
 from services.file_validator_service import FileValidatorService
 from services.imported_files_service import ImportedFilesService
 from services.service_facade import ServiceFacade
+from services.transfer_scheduler import TransferScheduler
+from services.transport_trace import RecordingTransport, TransportRecorder
 from services.user_authentication_service import UserAuthenticationService
+from services.verification_cache import VerificationCache
 from services.wifi_module import WifiModule
 from services.wifi_module_linux import WifiModuleLinux
 
@@ -35,7 +38,14 @@ if platform.system() == "Windows":
 else:
     wifi_module = WifiModuleLinux()
 
-file_validator_service = FileValidatorService() 
+# Gravação das sessões de carga para reprodução (python -m benchmarks replay)
+transport_recorder = None
+if os.environ.get("TRANSPORT_TRACE"):
+    transport_recorder = TransportRecorder(os.environ["TRANSPORT_TRACE"])
+    wifi_module = RecordingTransport(wifi_module, transport_recorder)
+
+verification_cache = VerificationCache(f"{FILE_DIRECTORY}/cache/verification.json")
+file_validator_service = FileValidatorService(verification_cache)
 
 user_authentication_service = UserAuthenticationService(
     user_database
@@ -44,16 +54,18 @@ connection_service = ConnectionService(
     wifi_module,
     test_mode=False  # Habilita modo de teste com hardware PN simulado
 )
-arinc_module = ArincModule(connection_service, FILE_DIRECTORY) 
+imported_files_service = ImportedFilesService(
+    file_validator_service,
+    f"{FILE_DIRECTORY}/images"
+)
+arinc_module = ArincModule(connection_service, FILE_DIRECTORY)
+if transport_recorder is not None:
+    transport_recorder.attach(arinc_module.tftp_router)
 file_transfer_service = FileTransferService(
     file_validator_service,
     connection_service,
     arinc_module
 )
-imported_files_service = ImportedFilesService(
-    file_validator_service,
-    f"{FILE_DIRECTORY}/images"
-)
 
 service_facade = ServiceFacade(
     authentication_service=user_authentication_service,
@@ -61,9 +73,14 @@ service_facade = ServiceFacade(
     file_transfer_service=file_transfer_service,
     imported_files_service=imported_files_service,
     file_validator_service=file_validator_service,
+    transfer_scheduler=TransferScheduler(max_parallel=4),
 )
 
 desktop_app = UiManager(service_facade)
 
 if __name__ == '__main__':
-    desktop_app.run()
\ No newline at end of file
+    try:
+        desktop_app.run()
+    finally:
+        if transport_recorder is not None:
+            transport_recorder.close()
\ No newline at end of file
@@ -9,7 +9,7 @@ from kivy.metrics import dp
 from typing import Callable, Optional
 
 from data.enums import ArincTransferResult, ScreenName
-from data.classes import FileRecord
+from data.classes import FileRecord, TransferStatus
 from ui.event_router import emit_event, event_router
 from data.events import Event
 from services.service_facade import ServiceFacade
@@ -22,11 +22,28 @@ def check_authentication(screen_instance, action: Callable, *args, **kwargs):
     else:
         emit_event(Event(Event.EventType.LOGOUT))
 
+def format_rate(bytes_per_second: float) -> str:
+    for unit in ('B/s', 'KB/s'):
+        if bytes_per_second < 1024:
+            return f'{bytes_per_second:.1f} {unit}'
+        bytes_per_second /= 1024
+    return f'{bytes_per_second:.1f} MB/s'
+
+def format_duration(seconds: float | None) -> str:
+    if seconds is None:
+        return '--:--'
+    minutes, seconds = divmod(int(round(seconds)), 60)
+    hours, minutes = divmod(minutes, 60)
+    if hours:
+        return f'{hours}:{minutes:02d}:{seconds:02d}'
+    return f'{minutes:02d}:{seconds:02d}'
+
 class FileTransferScreen(Screen):
     selected_file_text = StringProperty('No files being transferred')
     transfer_status_text = StringProperty('Waiting the start of the transfer...')
     progress_value = NumericProperty(0)
     progress_text = StringProperty('0% - Waiting...')
+    rate_text = StringProperty('')
     transfer_in_progress = BooleanProperty(False) 
     transfer_started = BooleanProperty(False)
 
@@ -57,6 +74,7 @@ class FileTransferScreen(Screen):
         self.transfer_status_text = 'Waiting the start of the transfer...'
         self.progress_value = 0
         self.progress_text = '0% - Waiting...'
+        self.rate_text = ''
         self.transfer_in_progress = False
         self._selected_file = None
         if self._progress_event:
@@ -92,6 +110,7 @@ class FileTransferScreen(Screen):
         self.transfer_started = True
         self.transfer_status_text = 'Initiating transfer via ARINC 615-A...'
         self.progress_text = '0% - Starting...'
+        self.rate_text = ''
         self.progress_value = 0
         
         # [BST-319] 
@@ -123,6 +142,7 @@ class FileTransferScreen(Screen):
                     self.progress_value = percentage
                     self.progress_text = f'{percentage}% - Transferring via ARINC 615-A...'
                     self.transfer_status_text = 'Transfer in progress...'
+                    self.rate_text = self._rate_summary(status)
 
                 # [BST-324]    
                 elif status.transferResult == ArincTransferResult.SUCCESS:
@@ -141,6 +161,15 @@ class FileTransferScreen(Screen):
             
         return True 
         
+    def _rate_summary(self, status: TransferStatus) -> str:
+        rate = format_rate(status.averageThroughput or status.throughput)
+        summary = f'{rate} (now {format_rate(status.throughput)}) - ETA {format_duration(status.etaSeconds)}'
+        if status.retransmissions:
+            summary += f' - {status.retransmissions} retransmitted blocks'
+        if status.rttSeconds is not None:
+            summary += f' - RTT {status.rttSeconds * 1000:.0f} ms'
+        return summary
+
     def transfer_finished(self, success: bool):
         self.transfer_in_progress = False 
         
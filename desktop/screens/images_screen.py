@@ -5,18 +5,24 @@ from kivy.uix.filechooser import FileChooserListView
 from kivy.uix.boxlayout import BoxLayout
 from kivy.uix.popup import Popup
 from kivy.uix.button import Button
+from kivy.uix.label import Label
+from kivy.clock import Clock
 import os
 import platform
+import threading
 
 from data.enums import ScreenName
 from data.classes import File
 from screens.components import ImageListItem
 from data.events import Event
+from services.imported_files_service import TAR_EXTENSIONS, ZIP_EXTENSIONS
 from services.service_facade import ServiceFacade
 from ui.event_router import emit_event
 
 
 UPLOAD_DIR = "uploaded_files"
+# Falhas listadas no popup de importação em lote; as demais ficam só no log
+MAX_LISTED_FAILURES = 8
 
 # [BST-332]
 def check_authentication(screen_instance, action: Callable, *args, **kwargs):
@@ -104,11 +110,58 @@ class ImagesScreen(Screen):
             self._file_popup.dismiss()
 
     def save_file(self, file_path):
+        if os.path.isdir(file_path) or file_path.lower().endswith(ZIP_EXTENSIONS + TAR_EXTENSIONS):
+            # Importação em lote roda fora da thread da UI
+            threading.Thread(target=self._save_many, args=(file_path,), daemon=True).start()
+            return
+
+        # Arquivo único também é copiado e validado fora da thread da UI
+        threading.Thread(target=self._save_one, args=(file_path,), daemon=True).start()
+
+    def _save_one(self, file_path):
+        # Roda em uma thread separada: a UI só é atualizada via Clock
         file_name = os.path.basename(file_path)
         file_object = File(path = file_path, fileName = file_name)
-        # [BST-333]
-        self._service_facade.importFile(file_object)
-        self.load_image_files()
+        try:
+            # [BST-333]
+            self._service_facade.importFile(file_object)
+        except Exception as e:
+            message = f"Could not import {file_name}:\n{e}"
+            Clock.schedule_once(lambda dt: self._show_import_popup('Import Error', message), 0)
+            return
+
+        Clock.schedule_once(lambda dt: self.load_image_files(), 0)
+
+    def _save_many(self, path):
+        # Roda em uma thread separada: a UI só é atualizada via Clock
+        try:
+            result = self._service_facade.importFiles(path)
+        except Exception as e:
+            message = f"Could not import {os.path.basename(path)}:\n{e}"
+            Clock.schedule_once(lambda dt: self._show_import_popup('Import Error', message), 0)
+            return
+
+        failures = [f"{r.source}: {r.error}" for r in result.results if r.error is not None]
+        lines = [f"{result.importedCount} imported, {result.failedCount} failed."]
+        lines += failures[:MAX_LISTED_FAILURES]
+        if len(failures) > MAX_LISTED_FAILURES:
+            lines.append(f"... and {len(failures) - MAX_LISTED_FAILURES} more")
+        message = "\n".join(lines)
+
+        def on_done(dt):
+            self.load_image_files()
+            self._show_import_popup('Import Finished', message)
+
+        Clock.schedule_once(on_done, 0)
+
+    def _show_import_popup(self, title: str, message: str):
+        popup_content = BoxLayout(orientation='vertical', padding='10dp', spacing='10dp')
+        popup_content.add_widget(Label(text=message, halign='center', valign='middle'))
+        close_button = Button(text='Close', size_hint_y=None, height='40dp')
+        popup_content.add_widget(close_button)
+        popup = Popup(title=title, content=popup_content, size_hint=(0.7, 0.5))
+        close_button.bind(on_release=popup.dismiss)
+        popup.open()
         
     def on_delete_clicked(self, software_pn: str):
         # [BST-332]
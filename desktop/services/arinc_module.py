@@ -1,43 +1,119 @@
+import io
+import queue
 import threading
 import time
 import os
 
-from typing import Literal
+from collections import OrderedDict
+from typing import BinaryIO, Callable, Dict
+
+import arinc615a
 from data.classes import (
     ArincLUH,
     ArincLUI,
     ArincLUR,
     ArincLURHeaderFile,
     ArincLUS,
-    ArincLUSHeaderFile,
     FileRecord,
     Package,
     Request,
     TransferStatus,
 )
 
+from data.errors import ArincCodecError
 from data.enums import (
     ArincFileType,
     ArincTransferResult,
     ArincTransferStep,
     LoadProtocolStatusCode,
 )
+from services.block_manifest import TFTP_BLOCK_SIZE
 from services.connection_service import ConnectionService
+from services.file_validator_service import HEADER_SIZE, TRAILER_SIZE
+from services.file_window import FileWindow
 from services.logging_service import LoggingService
-from tftpy import TftpServer
+from services.tftp_router import TftpRouter
+from services.transfer_meter import MeteredFile, TransferMeter
 
 from interfaces.transfer_protocol import ITransferProtocol
 
-version: Literal["A4"] = "A4"
+# Limite de arquivos por LUR aceito pelo firmware
+MAX_FILE_PER_TRANSFER = 3
+
+# Tempo sem avanço do contador do LUS após o qual a conexão é verificada
+STALL_TIMEOUT = 3.0
+
+# Arquivos LUR/LUH codificados mantidos em memória (os mais recentes)
+ENCODED_CACHE_SIZE = 16
+
+# Números de bloco TFTP têm 16 bits
+_BLOCK_NUMBER_MODULUS = 1 << 16
+
+class _UploadSink(io.BytesIO):
+    """
+    Recebe em memória um arquivo enviado pelo alvo. O servidor TFTP fecha o objeto ao
+    fim do upload, e nesse momento o conteúdo é entregue a on_complete.
+    """
+
+    def __init__(self, on_complete: Callable[[bytes], None]):
+        super().__init__()
+        self._on_complete = on_complete
+
+    def close(self) -> None:
+        if not self.closed:
+            self._on_complete(self.getvalue())
+        super().close()
+
+class _ServedImage:
+    """
+    Imagem sendo servida ao alvo. Converte o contador do LUS (número do último bloco
+    TFTP recebido, de 16 bits) em bytes, considerando o blksize negociado e a volta
+    do número de bloco em imagens com mais de 65535 blocos.
+    """
+
+    def __init__(self, window: FileWindow):
+        self.window = window
+        self._epoch = 0
+        self._last_counter = 0
+
+    def blocks(self, counter: int) -> int:
+        # Uma queda de mais de meia volta no contador é tratada como volta do número de bloco
+        if counter < self._last_counter and self._last_counter - counter > _BLOCK_NUMBER_MODULUS // 2:
+            self._epoch += _BLOCK_NUMBER_MODULUS
+        self._last_counter = counter
+        return self._epoch + counter
+
+    def confirmedBytes(self, counter: int) -> int:
+        block_size = self.window.readSize or TFTP_BLOCK_SIZE
+        return min(self.blocks(counter) * block_size, self.window.tell())
 
 class ArincModule(ITransferProtocol):
     transfer_status: TransferStatus | None = None
     transfer_thread: threading.Thread | None = None
-    tftp_server: TftpServer | None = None
 
-    def __init__(self, connection_service: ConnectionService, base_path: str):
+    def __init__(
+        self,
+        connection_service: ConnectionService,
+        base_path: str,
+        serve_data_section_only: bool = False,
+        in_memory: bool = True,
+        server_address: str = "",
+        server_port: int = 6969,
+        tftp_router: TftpRouter | None = None,
+    ):
         self.logging_service = LoggingService(ConnectionService.__name__)
         self.connection_service = connection_service
+        # O alvo verifica o PN do header e o hash do trailer, então por padrão a imagem é enviada inteira
+        self.serve_data_section_only = serve_data_section_only
+        # Em memória, os arquivos LUI/LUR/LUH são trocados sem passar pelo disco
+        self.in_memory = in_memory
+        # Endereço do servidor TFTP de onde o alvo baixa os arquivos; sessões simultâneas
+        # com alvos diferentes usam cada uma a sua interface
+        self.server_address = server_address
+        self.server_port = server_port
+
+        # Arquivos LUR/LUH já codificados, por tipo e (SW PN, HW PN, hash) das imagens; LRU
+        self._encoded_cache: OrderedDict[tuple[ArincFileType, tuple[tuple[str, str, str], ...]], bytes] = OrderedDict()
 
         self._SERVER_PATH = base_path+"/tftp/server"
         self._CLIENT_PATH = base_path+"/tftp/client"
@@ -47,12 +123,29 @@ class ArincModule(ITransferProtocol):
         if not os.path.exists(self._CLIENT_PATH):
             os.makedirs(self._CLIENT_PATH)
 
+        # O servidor TFTP é compartilhado e fica no ar entre transferências; cada
+        # transferência apenas registra os seus handlers nele
+        self.tftp_router = tftp_router or TftpRouter.shared(self._SERVER_PATH, server_address, server_port)
+
+        # Imagens servidas na transferência atual, por SW PN
+        self._served: Dict[str, _ServedImage] = {}
+
+        # Vazão e tempo restante, medidos sobre os bytes das imagens servidos ao alvo
+        self._meter: TransferMeter | None = None
+        self._target_estimate: int | None = None
+
+        self._lus_updates: queue.Queue[bytes | None] = queue.Queue()
+
     # [BST-235]
-    def startTransfer(self, file: FileRecord) -> bool:
+    def startTransfer(self, files: FileRecord | list[FileRecord]) -> bool:
         if not self.connection_service.isConnected():
             raise Exception("Not connected")
 
-        self._create_file_with_data(file)
+        files = [files] if isinstance(files, FileRecord) else list(files)
+        if not files or len(files) > MAX_FILE_PER_TRANSFER:
+            raise ValueError(f"A load list must have between 1 and {MAX_FILE_PER_TRANSFER} files")
+        if len({f.softwarePN for f in files}) != len(files):
+            raise ValueError("A load list cannot repeat a SW PN")
 
         hw_id = self.connection_service.getConnectionHardwarePN()
         target = f"{hw_id}_UNDEF"
@@ -68,22 +161,29 @@ class ArincModule(ITransferProtocol):
         ):  # request not accepted
             return False
 
-        lus_path = f"{self._SERVER_PATH}/{target}.{ArincFileType.LUS.value}"
-        if os.path.exists(lus_path):
-            os.remove(lus_path)
+        # Cada LUS recebido do alvo é entregue à thread de transferência por esta fila
+        self._lus_updates: queue.Queue[bytes | None] = queue.Queue()
+
+        self._served = {}
+        self._meter = TransferMeter(sum(self._image_window(f)[1] for f in files))
+        self._target_estimate = None
 
         self.transfer_status = TransferStatus(
-            False, target, ArincTransferStep.LIST, file, 0, None
+            False, target, ArincTransferStep.LIST, files[0], 0, None,
+            files, {f.softwarePN: 0 for f in files},
         )
 
         self.transfer_thread = threading.Thread(
             target=self._arinc_transfer_thread, daemon=True
         )
 
-        self.tftp_server_thread = threading.Thread(
-            target=self._tftp_server_thread, daemon=True
-        )
-        self.tftp_server_thread.start()
+        try:
+            self.tftp_router.register(self, self._server_callback, self._upload_open, self._peer_address())
+        except Exception:
+            # Sem o servidor TFTP o alvo não consegue baixar a lista de carga
+            self.transfer_status = None
+            self.transfer_thread = None
+            raise
 
         self.transfer_thread.start()
 
@@ -95,13 +195,15 @@ class ArincModule(ITransferProtocol):
         if status is None:
             raise Exception("Not in transfer")
 
+        self._update_rates(status)
+
         if status.transferResult is not None:
             if self.transfer_thread is not None:
                 self.transfer_thread.join()
                 self.transfer_thread = None
             self.transfer_status = None
 
-            self._stop_tftpy_server()
+            self.tftp_router.unregister(self)
 
         return status
 
@@ -113,75 +215,112 @@ class ArincModule(ITransferProtocol):
 
         self.transfer_status.cancelled = True
         self.transfer_status.transferResult = ArincTransferResult.FAILED
+        # Acorda a thread de transferência, que pode estar aguardando um LUS
+        self._lus_updates.put(None)
 
-        self._stop_tftpy_server()
+        self.tftp_router.unregister(self)
 
         if self.transfer_thread is not None:
             self.transfer_thread.join()
             self.transfer_thread = None
 
     def _get_LUI_file(self, target: str) -> ArincLUI | None:
-        pkg = self.connection_service.receivePackage(f"{target}.{ArincFileType.LUI.value}")
-        return self._parse_LUI_file(pkg.path)
-
-    def _put_file(self, target: str, file_path: str, file_type: ArincFileType):
-        pkg = Package(f"{target}.{file_type.value}", file_path)
+        pkg = self.connection_service.receivePackage(f"{target}.{ArincFileType.LUI.value}", self.in_memory)
+        if pkg.data is not None:
+            return self._decode(ArincFileType.LUI, pkg.data)
+
+        with open(pkg.path, "rb") as file:
+            return self._decode(ArincFileType.LUI, file.read())
+
+    def _put_file(self, target: str, data: bytes, file_type: ArincFileType):
+        name = f"{target}.{file_type.value}"
+        if self.in_memory:
+            pkg = Package(name, "", data)
+        else:
+            pkg = Package(name, self._write_server_file(name, data))
         self.connection_service.sendPackage(pkg)
 
-    def _read_LUS_file(self, target: str) -> ArincLUS | None:
-        return self._parse_LUS_file(f"{self._SERVER_PATH}/{target}.{ArincFileType.LUS.value}")
+    def _write_server_file(self, name: str, data: bytes) -> str:
+        file_path = f"{self._SERVER_PATH}/{name}"
+        with open(file_path, "wb") as file:
+            file.write(data)
+        return file_path
 
-    def _tftp_server_thread(self):
-        try:
-            self.tftp_server = TftpServer(f"{self._SERVER_PATH}/", self._server_callback)
-            self.tftp_server.listen(listenport=6969, timeout=5, retries=3)
-        except Exception as e:
-            print(e)
-    
-    def _stop_tftpy_server(self):
-        if self.tftp_server_thread is not None:
-            if self.tftp_server is not None:
-                self.tftp_server.stop(True)
-            self.tftp_server_thread.join()
-            self.tftp_server_thread = None
+    def _encoded(self, file_type: ArincFileType, file_records: list[FileRecord], encode: Callable[[], bytes]) -> bytes:
+        key = (file_type, tuple((f.softwarePN, f.hardwarePN, f.dataHash) for f in file_records))
+        data = self._encoded_cache.get(key)
+        if data is None:
+            data = encode()
+            self._encoded_cache[key] = data
+            while len(self._encoded_cache) > ENCODED_CACHE_SIZE:
+                self._encoded_cache.popitem(last=False)
+        self._encoded_cache.move_to_end(key)
+        return data
+
+    def _LUR_bytes(self, file_records: list[FileRecord]) -> bytes:
+        lur_file = ArincLUR(
+            [
+                ArincLURHeaderFile(
+                    f"{f.softwarePN}.{ArincFileType.LUH.value}",
+                    f"{f.softwarePN}.bin",
+                )
+                for f in file_records
+            ]
+        )
+        return self._encoded(ArincFileType.LUR, file_records, lambda: arinc615a.encode(lur_file))
+
+    def _LUH_bytes(self, file_record: FileRecord) -> bytes:
+        luh_file = ArincLUH(
+            file_record.softwarePN,
+            file_record.hardwarePN,
+            file_record.dataHash,
+        )
+        return self._encoded(ArincFileType.LUH, [file_record], lambda: arinc615a.encode(luh_file))
+
+    def _peer_address(self) -> str | None:
+        # Pedidos TFTP do alvo chegam do endereço da conexão atual
+        connection = self.connection_service.currentConnection
+        return connection.address if connection is not None and connection.address else None
 
     def _arinc_transfer_thread(self):
         if self.transfer_status and not self.transfer_status.cancelled and self.transfer_status.transferStep == ArincTransferStep.LIST:
-            software_pn = self.transfer_status.fileRecord.softwarePN
             target = self.transfer_status.currentTarget
-
-            lur_file = ArincLUR(
-                [
-                    ArincLURHeaderFile(
-                        f"{software_pn}.{ArincFileType.LUH.value}",
-                        f"{software_pn}.bin",
-                    )
-                ]
-            )
-            file_path = self._encode_LUR_file(target, lur_file)
-            self._put_file(target, file_path, ArincFileType.LUR)
+            lur_data = self._LUR_bytes(self.transfer_status.fileRecords)
+            self._put_file(target, lur_data, ArincFileType.LUR)
 
             self.transfer_status.transferStep = ArincTransferStep.TRANFER
             self.transfer_status.progressPercent = 1
 
         last_lus_counter = 0
-        counter = 0
+        last_progress_at = time.monotonic()
 
         while self.transfer_status and not self.transfer_status.cancelled and not self.transfer_status.transferResult:
-            # periodically check for status
-            current_lus_counter = 0
-            lus_file = self._read_LUS_file(self.transfer_status.currentTarget)
-            
+            # Aguarda o próximo LUS enviado pelo alvo; o timeout serve só para detectar travamentos
+            timeout = max(0.0, last_progress_at + STALL_TIMEOUT - time.monotonic())
+            try:
+                lus_data = self._lus_updates.get(timeout=timeout)
+            except queue.Empty:
+                lus_data = None
+
+            lus_file = self._decode(ArincFileType.LUS, lus_data) if lus_data else None
+
             if lus_file:
-                current_lus_counter = lus_file.Counter
                 match lus_file.StatusCode:
                     case LoadProtocolStatusCode.IN_PROGRESS | LoadProtocolStatusCode.IN_PROGRESS_INFO:
-                        if(lus_file.Counter):
-                            self.transfer_status.progressPercent = 1 + min(98,int(98*(lus_file.Counter*512/self.transfer_status.fileRecord.sizeBytes)))
+                        self._update_progress(lus_file)
 
                     case LoadProtocolStatusCode.COMPLETED:
                         print(f"operation completed")
                         print(f"{lus_file}")
+                        self._update_progress(lus_file)
+                        pending = [pn for pn, percent in self.transfer_status.fileProgress.items() if percent < 100]
+                        if pending:
+                            # O alvo encerrou a operação sem confirmar todos os arquivos da lista
+                            self.logging_service.log(f"Target completed without loading: {pending}")
+                            self.transfer_status.transferStep = ArincTransferStep.NOT_IN_TRANSFER
+                            self.transfer_status.progressPercent = 100
+                            self.transfer_status.transferResult = ArincTransferResult.FAILED
+                            return
                         self.transfer_status.transferStep = (
                             ArincTransferStep.NOT_IN_TRANSFER
                         )
@@ -216,18 +355,69 @@ class ArincModule(ITransferProtocol):
                         self.transfer_status.transferResult = ArincTransferResult.FAILED
                         return
 
-            if(last_lus_counter == current_lus_counter):
-                counter += 1
-                if counter > 30:
+            if lus_file and lus_file.Counter != last_lus_counter:
+                last_lus_counter = lus_file.Counter
+                last_progress_at = time.monotonic()
+            elif time.monotonic() - last_progress_at >= STALL_TIMEOUT:
+                if self.transfer_status and not self.transfer_status.cancelled:
                     self.connection_service.sendRequest(Request('HEALTH_CHECK'))
-                    counter = 0
+                last_progress_at = time.monotonic()
+
+    def _update_progress(self, lus_file: ArincLUS):
+        status = self.transfer_status
+        self._target_estimate = lus_file.EstimatedTime
+        records = {f.softwarePN: f for f in status.fileRecords}
+
+        for header_file in lus_file.HeaderFiles:
+            software_pn = self._software_pn_of(header_file.PartNumberName, header_file.FileName)
+            if software_pn not in records:
+                continue
+
+            served = self._served.get(software_pn)
+            confirmed = served.confirmedBytes(lus_file.Counter) if served is not None else 0
+
+            if header_file.LoadStatus == LoadProtocolStatusCode.COMPLETED:
+                percent = 100
+            elif header_file.LoadRatio:
+                percent = header_file.LoadRatio
             else:
-                counter = 0
+                # O firmware não preenche o load ratio
+                size = records[software_pn].sizeBytes or 1
+                percent = min(99, int(100 * confirmed / size))
+            status.fileProgress[software_pn] = max(status.fileProgress.get(software_pn, 0), percent)
+
+        # Progresso geral ponderado pelo tamanho de cada imagem, entre 1 e 99 até a conclusão
+        total_size = sum(f.sizeBytes for f in status.fileRecords) or 1
+        loaded = sum(status.fileProgress.get(f.softwarePN, 0) * f.sizeBytes for f in status.fileRecords)
+        status.progressPercent = max(status.progressPercent, 1 + min(98, int(98 * loaded / (100 * total_size))))
+
+    def _update_rates(self, status: TransferStatus):
+        meter = self._meter
+        if meter is None:
+            return
 
-            last_lus_counter = current_lus_counter
-            time.sleep(0.1)
+        meter.refresh()
+        status.bytesSent = meter.bytes_sent
+        status.throughput = meter.throughput
+        status.averageThroughput = meter.average_throughput or 0.0
+        status.retransmissions = meter.retransmissions
+        status.elapsedSeconds = meter.elapsed()
+        status.etaSeconds = 0.0 if status.transferResult else meter.eta(self._target_estimate)
+
+        peer = self._peer_address()
+        rtt = self.tftp_router.rttEstimate(peer) if peer is not None else None
+        if rtt is not None:
+            status.rttSeconds = rtt.srtt
+            status.rtoSeconds = rtt.rto
+
+    def _software_pn_of(self, *names: str) -> str | None:
+        for name in names:
+            base, _, extension = name.rpartition(".")
+            if base and extension in ("bin", ArincFileType.LUH.value):
+                return base
+        return None
 
-    def _server_callback(self, filename: str, **args):
+    def _server_callback(self, filename: str) -> BinaryIO | None:
         if self.transfer_status is None:
             return None
 
@@ -237,200 +427,55 @@ class ArincModule(ITransferProtocol):
             # return canceled status file
             return None
 
-        if filename == self.transfer_status.fileRecord.file.fileName:
-            return open(self.transfer_status.fileRecord.file.path, "rb")
-        
-        if filename == f'{self.transfer_status.fileRecord}.bin':
-            return open(self.transfer_status.fileRecord.file.path, "rb")
-
-        if filename == f"{target}.{ArincFileType.LUH.value}":
-            file_record = self.transfer_status.fileRecord
-            luh_file = ArincLUH(
-                file_record.softwarePN,
-                file_record.hardwarePN,
-                file_record.dataHash,
-            )
-            file_path = self._encode_LUH_file(target, luh_file)
-            return open(file_path, "rb")
+        for file_record in self.transfer_status.fileRecords:
+            if filename in (file_record.file.fileName, f"{file_record.softwarePN}.bin"):
+                return self._open_image(file_record)
 
-        return None
+            # O LUH com o nome do alvo é mantido para o primeiro arquivo da lista
+            luh_names = [f"{file_record.softwarePN}.{ArincFileType.LUH.value}"]
+            if file_record is self.transfer_status.fileRecord:
+                luh_names.append(f"{target}.{ArincFileType.LUH.value}")
 
+            if filename in luh_names:
+                luh_data = self._LUH_bytes(file_record)
+                if self.in_memory:
+                    return io.BytesIO(luh_data)
+                return open(self._write_server_file(filename, luh_data), "rb")
 
-    def _parse_LUS_file(self, file_path: str) -> ArincLUS | None:
-        if not os.path.exists(file_path):
-            return None
+        return None
 
-        try:
-            with open(file_path, "rb") as file:
-                file_lenght = int.from_bytes(file.read(4), "big", signed=False)
-                protocol_version = file.read(2).decode("ascii")
-                status_code = LoadProtocolStatusCode(file.read(2).hex())
-                status_description_lenght = int.from_bytes(
-                    file.read(1), "big", signed=False
-                )
+    def _upload_open(self, path: str) -> BinaryIO | None:
+        status = self.transfer_status
+        file_name = os.path.basename(path)
 
-                status_description = None
-                if status_description_lenght > 0:
-                    status_description = file.read(status_description_lenght+1).decode(
-                        "ascii"
-                    )[:-1]
-
-                counter = int.from_bytes(file.read(2), "big", signed=False)
-                exception_timer = int.from_bytes(file.read(2), "big", signed=False)
-                estimation_time = int.from_bytes(file.read(2), "big", signed=False)
-                load_list_ratio = int(file.read(3).decode("ascii"))
-                number_of_header_files = int.from_bytes(file.read(2), "big", signed=False)
-
-                header_files = []
-                for _ in range(number_of_header_files):
-                    header_file_name_lenght = int.from_bytes(
-                        file.read(1), "big", signed=False
-                    )
-                    header_file_name = file.read(header_file_name_lenght+1).decode("ascii")[
-                        :-1
-                    ]
-
-                    load_part_number_name_lenght = int.from_bytes(
-                        file.read(1), "big", signed=False
-                    )
-                    load_part_number_name = file.read(load_part_number_name_lenght+1).decode(
-                        "ascii"
-                    )[:-1]
-
-                    load_ratio = int(file.read(3).decode("ascii"))
-                    load_status = LoadProtocolStatusCode(file.read(2).hex())
-
-                    load_status_description_lenght = int.from_bytes(
-                        file.read(1), "big", signed=False
-                    )
-                    load_status_description = None
-                    if load_status_description_lenght > 0:
-                        load_status_description = file.read(
-                            load_status_description_lenght
-                        ).decode("ascii")[:-1]
-
-                    header_files.append(
-                        ArincLUSHeaderFile(
-                            header_file_name,
-                            load_part_number_name,
-                            load_ratio,
-                            load_status,
-                            load_status_description,
-                        )
-                    )
-
-                return ArincLUS(
-                    status_code,
-                    status_description,
-                    counter,
-                    exception_timer,
-                    estimation_time,
-                    load_list_ratio,
-                    header_files,
-                )
-        except Exception as e:
-            print(e)
-            return None
+        if status is not None and file_name == f"{status.currentTarget}.{ArincFileType.LUS.value}":
+            # O LUS é recebido em memória e entregue direto à thread de transferência
+            return _UploadSink(self._lus_updates.put)
 
+        return None
 
-    def _parse_LUI_file(self, file_path: str) -> ArincLUI | None:
-        try:
-            with open(file_path, "rb") as file:
-                file_lenght = int.from_bytes(file.read(4), "big", signed=False)
-                protocol_version = file.read(2).decode("ascii")
-                status_code = LoadProtocolStatusCode(file.read(2).hex())
-                status_description_lenght = int.from_bytes(
-                    file.read(2), "big", signed=False
-                )
-                status_description = None
-                if status_description_lenght > 0:
-                    status_description = file.read(-1).decode("ascii")[:-1]
 
-                return ArincLUI(status_code, status_description)
-        except Exception as e:
-            print(e)
+    def _decode(self, file_type: ArincFileType, data: bytes):
+        try:
+            return arinc615a.decode(file_type, data)
+        except ArincCodecError as e:
+            self.logging_service.error(f"Could not decode {file_type.value} file", e)
             return None
 
-
-    def _encode_LUR_file(self, target: str, lur_file: ArincLUR) -> str:
-        file_path = f"{self._SERVER_PATH}/{target}.{ArincFileType.LUR.value}"
-
-        with open(file_path, "wb") as file:
-            bytes_to_write = bytearray(version.encode("ascii"))
-
-            bytes_to_write.extend(
-                len(lur_file.HeaderFiles).to_bytes(2, "big", signed=False)
-            )
-
-            for hf in lur_file.HeaderFiles:
-                bytes_to_write.extend(
-                    (len(hf.FileName) + 1).to_bytes(1, "big", signed=False)
-                )
-                bytes_to_write.extend(hf.FileName.encode("ascii"))
-                bytes_to_write.extend(b"\0")
-
-                bytes_to_write.extend(
-                    (len(hf.PartNumberName) + 1).to_bytes(1, "big", signed=False)
-                )
-                bytes_to_write.extend(hf.PartNumberName.encode("ascii"))
-                bytes_to_write.extend(b"\0")
-
-            file.write((32 + len(bytes_to_write) * 8).to_bytes(4, "big", signed=False))
-            file.write(bytes_to_write)
-
-        return file_path
-
-
-    def _encode_LUH_file(self, target: str, luh_file: ArincLUH) -> str:
-        file_path = f"{self._SERVER_PATH}/{target}.{ArincFileType.LUH.value}"
-
-        with open(file_path, "wb") as file:
-            bytes_to_write = bytearray(version.encode("ascii"))
-
-            bytes_to_write.extend(
-                (len(luh_file.SoftwarePartNumber) + 1).to_bytes(1, "big", signed=False)
-            )
-            bytes_to_write.extend(luh_file.SoftwarePartNumber.encode("ascii"))
-            bytes_to_write.extend(b"\0")
-
-            bytes_to_write.extend(
-                (len(luh_file.HardwarePartNumber) + 1).to_bytes(1, "big", signed=False)
-            )
-            bytes_to_write.extend(luh_file.HardwarePartNumber.encode("ascii"))
-            bytes_to_write.extend(b"\0")
-
-            bytes_to_write.extend(
-                (len(luh_file.DataHash) + 1).to_bytes(1, "big", signed=False)
-            )
-            bytes_to_write.extend(luh_file.DataHash.encode("ascii"))
-            bytes_to_write.extend(b"\0")
-
-            file.write((32 + len(bytes_to_write) * 8).to_bytes(4, "big", signed=False))
-            file.write(bytes_to_write)
-
-        return file_path
-
-
-    def _create_file_with_data(self, file: FileRecord):
-        data_output_path = f"{self._SERVER_PATH}/{file.softwarePN}.bin"
-        image_input_path = file.file.path
-
-        HEADER_SIZE = 40
-        FOOTER_SIZE = 32
-        
-        with open(image_input_path, 'rb') as image_file:
-            # image_file.seek(0, 2)
-            # total_size = image_file.tell()
-            
-            # bytes_to_copy = total_size - HEADER_SIZE - FOOTER_SIZE
-
-            # if bytes_to_copy <= 0:
-            #     raise Exception("Malformed sofware image file")
-
-            # image_file.seek(HEADER_SIZE)
-            # data_to_copy = image_file.read(bytes_to_copy)
-            data_to_copy = image_file.read(-1)
-
-        with open(data_output_path, 'wb') as data_file:
-            data_file.write(data_to_copy)
-
+    def _image_window(self, file: FileRecord) -> tuple[int, int]:
+        # Trecho do arquivo servido ao alvo: (início, tamanho)
+        file_size = os.path.getsize(file.file.path)
+        if not self.serve_data_section_only:
+            return 0, file_size
+        return HEADER_SIZE, file_size - HEADER_SIZE - TRAILER_SIZE
+
+    def _open_image(self, file: FileRecord) -> BinaryIO:
+        """
+        Serve a imagem diretamente do catálogo, sem cópia para o diretório do servidor.
+        """
+        start, size = self._image_window(file)
+        window = FileWindow(file.file.path, start, size)
+        self._served[file.softwarePN] = _ServedImage(window)
+        if self._meter is None:
+            return window
+        return MeteredFile(window, self._meter)
@@ -0,0 +1,163 @@
+import hashlib
+import os
+import random
+from concurrent.futures import ThreadPoolExecutor
+from typing import BinaryIO, Iterable, List, Sequence
+
+from data.classes import BlockManifest
+from services.logging_service import LoggingService
+
+# Tamanho do bloco de dados TFTP usado na transferência
+TFTP_BLOCK_SIZE = 512
+DEFAULT_BLOCK_SIZE = 64 * 1024
+
+# Prefixos distintos para folhas e nós internos (evita colisão entre os dois níveis)
+_LEAF_PREFIX = b'\x00'
+_NODE_PREFIX = b'\x01'
+
+class BlockManifestWriter:
+    """
+    Repassa o que é escrito para sink e calcula as folhas do manifesto na mesma passada,
+    para que uma cópia (ex.: a importação) produza o manifesto sem reler o arquivo.
+    """
+
+    def __init__(self, sink: BinaryIO, block_size: int = DEFAULT_BLOCK_SIZE):
+        self.sink = sink
+        self.block_size = block_size
+        self._leaves: List[bytes] = []
+        self._current = hashlib.sha256(_LEAF_PREFIX)
+        self._current_size = 0
+        self._file_size = 0
+
+    def write(self, data) -> int:
+        written = self.sink.write(data)
+        view = memoryview(data).cast('B')
+        self._file_size += len(view)
+        while view:
+            take = min(len(view), self.block_size - self._current_size)
+            self._current.update(view[:take])
+            self._current_size += take
+            view = view[take:]
+            if self._current_size == self.block_size:
+                self._leaves.append(self._current.digest())
+                self._current = hashlib.sha256(_LEAF_PREFIX)
+                self._current_size = 0
+        return written
+
+    def manifest(self) -> BlockManifest:
+        leaves = list(self._leaves)
+        # Bloco final incompleto (ou arquivo vazio, que tem uma única folha)
+        if self._current_size or not leaves:
+            leaves.append(self._current.digest())
+        return BlockManifest(
+            self.block_size, self._file_size, tuple(leaves), BlockManifestService.merkleRoot(leaves)
+        )
+
+class BlockManifestService:
+    """
+    Calcula e verifica manifestos de blocos das imagens: um SHA-256 por bloco de
+    block_size bytes do arquivo, combinados em uma árvore Merkle. Com o manifesto um
+    bloco corrompido pode ser localizado e verificado isoladamente, sem reler a imagem
+    inteira. Um block_size múltiplo de TFTP_BLOCK_SIZE alinha as folhas aos blocos TFTP.
+    """
+
+    def __init__(self, block_size: int = DEFAULT_BLOCK_SIZE, max_workers: int | None = None):
+        if block_size <= 0:
+            raise ValueError(f"Invalid block size: {block_size}")
+
+        self.logging_service = LoggingService(BlockManifestService.__name__)
+        self.block_size = block_size
+        self.max_workers = max_workers or os.cpu_count() or 1
+
+    @staticmethod
+    def merkleRoot(leaves: Sequence[bytes]) -> str:
+        if not leaves:
+            return hashlib.sha256(b'').hexdigest()
+
+        level = list(leaves)
+        while len(level) > 1:
+            next_level = [
+                hashlib.sha256(_NODE_PREFIX + level[i] + level[i + 1]).digest()
+                for i in range(0, len(level) - 1, 2)
+            ]
+            # Um nó sem par sobe para o nível seguinte sem alteração
+            if len(level) % 2:
+                next_level.append(level[-1])
+            level = next_level
+
+        return level[0].hex()
+
+    def writer(self, sink: BinaryIO) -> BlockManifestWriter:
+        return BlockManifestWriter(sink, self.block_size)
+
+    def _hash_blocks(self, path: str, block_size: int, indices: Iterable[int]) -> List[bytes]:
+        leaves = []
+        buffer = bytearray(block_size)
+        view = memoryview(buffer)
+        with open(path, 'rb', buffering=0) as f:
+            next_offset = None
+            for index in indices:
+                offset = index * block_size
+                if offset != next_offset:
+                    f.seek(offset)
+
+                read = 0
+                while read < block_size:
+                    n = f.readinto(view[read:])
+                    if not n:
+                        break
+                    read += n
+
+                leaves.append(hashlib.sha256(_LEAF_PREFIX + view[:read]).digest())
+                next_offset = offset + read
+        return leaves
+
+    def _block_count(self, file_size: int, block_size: int) -> int:
+        return max(1, -(-file_size // block_size))
+
+    def build(self, path: str) -> BlockManifest:
+        """
+        Calcula o manifesto de um arquivo já gravado (reverificação ou imagens importadas
+        antes dos manifestos). Faixas contíguas de blocos são processadas em paralelo, cada
+        uma com seu próprio handle (o hashlib libera o GIL).
+        """
+        file_size = os.path.getsize(path)
+        block_count = self._block_count(file_size, self.block_size)
+
+        workers = min(self.max_workers, block_count)
+        per_worker = -(-block_count // workers)
+        ranges = [range(i, min(i + per_worker, block_count)) for i in range(0, block_count, per_worker)]
+
+        if len(ranges) == 1:
+            leaves = self._hash_blocks(path, self.block_size, ranges[0])
+        else:
+            with ThreadPoolExecutor(max_workers=len(ranges)) as executor:
+                parts = executor.map(lambda r: self._hash_blocks(path, self.block_size, r), ranges)
+                leaves = [leaf for part in parts for leaf in part]
+
+        return BlockManifest(self.block_size, file_size, tuple(leaves), self.merkleRoot(leaves))
+
+    def verifyBlocks(self, path: str, manifest: BlockManifest, indices: Iterable[int] | None = None) -> List[int]:
+        """
+        Confere os blocos indicados (todos, se indices for None) e retorna os índices
+        dos blocos que não conferem com o manifesto.
+        """
+        if os.path.getsize(path) != manifest.fileSize:
+            self.logging_service.log(f"Block check: size of {path} does not match its manifest")
+            return list(range(len(manifest.leaves)))
+
+        indices = sorted(set(range(len(manifest.leaves)) if indices is None else indices))
+        leaves = self._hash_blocks(path, manifest.blockSize, indices)
+        corrupted = [index for index, leaf in zip(indices, leaves) if leaf != manifest.leaves[index]]
+
+        if corrupted:
+            self.logging_service.log(f"Block check: {len(corrupted)} corrupted blocks in {path}: {corrupted}")
+        return corrupted
+
+    def spotCheck(self, path: str, manifest: BlockManifest, sample_size: int) -> List[int]:
+        """
+        Confere uma amostra aleatória de blocos, para verificações periódicas baratas.
+        """
+        block_count = len(manifest.leaves)
+        indices = random.sample(range(block_count), min(sample_size, block_count))
+        return self.verifyBlocks(path, manifest, indices)
@@ -1,15 +1,24 @@
+import math
 import time
 import threading
 from typing import Optional, List
 
-from data.classes import Connection, Package, Request, Response
+from data.classes import Connection, Package, Request, Response, RttEstimate
 from data.errors import ConnectionAuthenticationError, DisconnectedError, RequestTimeoutError
 from interfaces.connection_transport import IConnectionTransport
 from services.logging_service import LoggingService
+from tftp.rtt import RttEstimator
 
 from ui.event_router import emit_event
 from data.events import Event
 
+# Limites do timeout dos pedidos ao módulo (s). O timeout é REQUEST_TIMEOUT_RTOS vezes o
+# RTO medido nas respostas anteriores: um pedido sem resposta derruba a conexão, então a
+# margem sobre o RTT é bem maior que a de uma retransmissão
+MIN_REQUEST_TIMEOUT = 10
+MAX_REQUEST_TIMEOUT = 60
+REQUEST_TIMEOUT_RTOS = 10
+
 class ConnectionService:
     def __init__(self, wifi_module: IConnectionTransport, test_mode: bool = True):
         self.logging_service = LoggingService(ConnectionService.__name__)
@@ -24,6 +33,20 @@ class ConnectionService:
         self._health_check_thread: Optional[threading.Thread] = None
         self._stop_health_check = threading.Event()
         self._retry_lock = threading.Lock()
+        # RTT dos pedidos ao módulo conectado; mantido entre reconexões ao mesmo módulo
+        self._request_rtt = self._new_request_rtt()
+        self._request_rtt_device: Optional[str] = None
+
+    def _new_request_rtt(self) -> RttEstimator:
+        max_rto = MAX_REQUEST_TIMEOUT / REQUEST_TIMEOUT_RTOS
+        return RttEstimator(max_rto, initial_rto=max_rto)
+
+    def rttEstimate(self) -> RttEstimate:
+        return self._request_rtt.estimate()
+
+    def _request_timeout(self) -> int:
+        timeout = math.ceil(self._request_rtt.rto * REQUEST_TIMEOUT_RTOS)
+        return min(max(timeout, MIN_REQUEST_TIMEOUT), MAX_REQUEST_TIMEOUT)
 
     def _perform_authentication(self, conn: Connection) -> bool:
         # [BST-220]
@@ -129,6 +152,9 @@ class ConnectionService:
 
             # [BST-219]
             self.currentConnection = connection_base
+            if connection_base.device != self._request_rtt_device:
+                self._request_rtt = self._new_request_rtt()
+                self._request_rtt_device = connection_base.device
             
             # [BST-215] 
             if self.test_mode:
@@ -228,7 +254,7 @@ class ConnectionService:
             raise ConnectionError("SendPackage failed, connection lost.") from e
 
     # [BST-226]
-    def receivePackage(self, file_name: str) -> Package:
+    def receivePackage(self, file_name: str, in_memory: bool = False) -> Package:
         # [BST-224]
         self.logging_service.log("Receiving package...")
         if not self.isConnected():
@@ -237,7 +263,7 @@ class ConnectionService:
             raise err
 
         try:
-            data = self.wifi_module.receivePackage(file_name)
+            data = self.wifi_module.receivePackage(file_name, in_memory)
             # [BST-224]
             self.logging_service.log("ReceivePackage successful.")
             return data
@@ -258,16 +284,19 @@ class ConnectionService:
             
         try:
             # [BST-211]
-            timeout = 60
+            timeout = self._request_timeout()
+            started = time.monotonic()
             response = self.wifi_module.sendRequest(request, target=self.currentConnection.address,timeout=timeout)
+            self._request_rtt.sample(time.monotonic() - started)
             # [BST-224]
             self.logging_service.log(f"SendRequest successful. Response: {response.status}")
             return response
         
         except RequestTimeoutError as e:
             # [BST-211]
+            self._request_rtt.backoff()
             # [BST-224]
-            self.logging_service.error(f"SendRequest '{request.command}' timed out", e)
+            self.logging_service.error(f"SendRequest '{request.command}' timed out after {timeout} s", e)
             # [BST-212]
             self._handle_reconnection()
             raise e
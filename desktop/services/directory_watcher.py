@@ -0,0 +1,169 @@
+import ctypes
+import ctypes.util
+import os
+import platform
+import select
+import struct
+import threading
+from typing import Callable
+
+from services.logging_service import LoggingService
+
+# Máscaras de evento do inotify (linux/inotify.h)
+IN_MODIFY = 0x00000002
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+
+_WATCH_MASK = (
+    IN_MODIFY | IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO
+    | IN_CREATE | IN_DELETE | IN_DELETE_SELF | IN_MOVE_SELF
+)
+_EVENT_HEADER = struct.Struct("iIII")
+
+class DirectoryWatcher:
+    """
+    Chama on_change sempre que algo muda em um diretório. No Linux usa inotify; nos
+    demais sistemas (ou se o inotify não estiver disponível) compara periodicamente
+    uma assinatura do conteúdo do diretório. Com name_filter, só mudanças em entradas
+    cujo nome é aceito pelo filtro são notificadas.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        on_change: Callable[[], None],
+        poll_interval: float = 2.0,
+        name_filter: Callable[[str], bool] | None = None,
+        settle_delay: float = 0.5,
+    ):
+        self.logging_service = LoggingService(DirectoryWatcher.__name__)
+        self.path = path
+        self.on_change = on_change
+        self.poll_interval = poll_interval
+        self.name_filter = name_filter
+        self.settle_delay = settle_delay
+        self.mode: str | None = None
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._inotify_fd: int | None = None
+
+    def start(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+
+        self._stop.clear()
+        self._inotify_fd = self._init_inotify()
+        if self._inotify_fd is not None:
+            self.mode = "inotify"
+            target = self._inotify_loop
+        else:
+            self.mode = "polling"
+            target = self._polling_loop
+
+        self._thread = threading.Thread(target=target, daemon=True)
+        self._thread.start()
+        self.logging_service.log(f"Watching {self.path} ({self.mode})")
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        if self._inotify_fd is not None:
+            os.close(self._inotify_fd)
+            self._inotify_fd = None
+
+    def _init_inotify(self) -> int | None:
+        if platform.system() != "Linux":
+            return None
+
+        try:
+            libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+            fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+            if fd < 0:
+                raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+
+            wd = libc.inotify_add_watch(fd, os.fsencode(self.path), _WATCH_MASK)
+            if wd < 0:
+                errno = ctypes.get_errno()
+                os.close(fd)
+                raise OSError(errno, "inotify_add_watch failed")
+
+            return fd
+        except Exception as e:
+            self.logging_service.error("inotify unavailable, falling back to polling", e)
+            return None
+
+    def _accepts(self, name: str) -> bool:
+        return self.name_filter is None or self.name_filter(name)
+
+    def _notify(self) -> None:
+        try:
+            self.on_change()
+        except Exception as e:
+            self.logging_service.error("Directory change callback failed", e)
+
+    def _inotify_loop(self) -> None:
+        fd = self._inotify_fd
+        changed = False
+        while not self._stop.is_set():
+            # O timeout permite verificar o pedido de parada periodicamente. Depois de uma
+            # mudança, espera settle_delay sem novos eventos antes de notificar, para que
+            # um arquivo sendo copiado só seja notificado quando a cópia terminar.
+            timeout = self.settle_delay if changed else self.poll_interval
+            readable, _, _ = select.select([fd], [], [], timeout)
+            if not readable:
+                if changed:
+                    changed = False
+                    self._notify()
+                continue
+
+            # Esvazia todos os eventos pendentes
+            while True:
+                try:
+                    buffer = os.read(fd, 64 * 1024)
+                except BlockingIOError:
+                    break
+                if not buffer:
+                    break
+                offset = 0
+                while offset + _EVENT_HEADER.size <= len(buffer):
+                    _, mask, _, name_len = _EVENT_HEADER.unpack_from(buffer, offset)
+                    name_start = offset + _EVENT_HEADER.size
+                    # O nome vem completado com NULs até name_len
+                    name = os.fsdecode(buffer[name_start:name_start + name_len].rstrip(b"\0"))
+                    offset = name_start + name_len
+                    if mask & (IN_DELETE_SELF | IN_MOVE_SELF):
+                        self.logging_service.log(f"Watched directory {self.path} was removed or moved")
+                        changed = True
+                    elif mask & IN_Q_OVERFLOW or self._accepts(name):
+                        # Com a fila estourada não se sabe o que mudou
+                        changed = True
+
+    def _signature(self) -> int:
+        try:
+            with os.scandir(self.path) as entries:
+                items = []
+                for entry in entries:
+                    if not self._accepts(entry.name):
+                        continue
+                    st = entry.stat()
+                    items.append((entry.name, st.st_size, st.st_mtime_ns))
+        except OSError:
+            return 0
+        return hash(tuple(sorted(items)))
+
+    def _polling_loop(self) -> None:
+        last_signature = self._signature()
+        while not self._stop.wait(self.poll_interval):
+            signature = self._signature()
+            if signature != last_signature:
+                last_signature = signature
+                self._notify()
@@ -23,8 +23,14 @@ class FileTransferService:
         self.connection_service = connection_service
         self.arinc_module = arinc_module
 
-    def startTransfer(self, file_record: FileRecord) -> bool:
-        file = file_record.file
+    def startTransfer(self, file_records: FileRecord | list[FileRecord]) -> bool:
+        """
+        Inicia a transferência de uma imagem ou de uma lista de carga com várias imagens,
+        enviadas ao alvo em uma única sessão ARINC.
+        """
+        if isinstance(file_records, FileRecord):
+            file_records = [file_records]
+
         # [BST-244]
         if not self.connection_service.isConnected():
             # [BST-242]
@@ -36,9 +42,37 @@ class FileTransferService:
         # [BST-227]
         hardware_pn = self.connection_service.getConnectionHardwarePN()
 
+        for file_record in file_records:
+            self._validate_for_transfer(file_record, hardware_pn)
+
+        # [BST-234]
+        self.connection_service.pauseHealthCheck()
+
+        # [BST-236]
+        file_names = ", ".join(f.file.fileName for f in file_records)
+        self.logging_service.log(
+            f"Starting transfer for {file_names} to {hardware_pn}."
+        )
+
+        # [BST-235]
+        try:
+            result = self.arinc_module.startTransfer(file_records)
+        except Exception:
+            # Lista de carga recusada antes de iniciar: a verificação de conexão volta a rodar
+            self.connection_service.resumeHealthCheck()
+            raise
+
+        # [BST-238]
+        return result
+
+    def _validate_for_transfer(self, file_record: FileRecord, hardware_pn: str) -> None:
+        file = file_record.file
+
+        # [BST-228, BST-230, BST-232]
+        report = self.file_validator.validate(file, hardware_pn)
+
         # [BST-230]
-        _, _, is_identified = self.file_validator.checkIdentification(file)
-        if not is_identified:
+        if not report.isIdentified:
             # [BST-231]
             msg = f"File identification check failed for {file.fileName}"
             err = IdentificationError(msg)
@@ -46,8 +80,7 @@ class FileTransferService:
             raise err
 
         # [BST-232]
-        _, _, is_integrity_valid = self.file_validator.checkIntegrity(file)
-        if not is_integrity_valid:
+        if not report.isIntegrityValid:
             # [BST-233]
             msg = f"File integrity check failed for {file.fileName}"
             err = IntegrityError(msg)
@@ -55,27 +88,13 @@ class FileTransferService:
             raise err
 
         # [BST-228]
-        if not self.file_validator.checkCompatibility(file, hardware_pn):
+        if not report.isCompatible:
             # [BST-229]
             msg = f"File compatibility check failed for {file.fileName} with hardware {hardware_pn}"
             err = CompatibilityError(msg)
             self.logging_service.error(msg, err)
             raise err
 
-        # [BST-234]
-        self.connection_service.pauseHealthCheck()
-
-        # [BST-236]
-        self.logging_service.log(
-            f"Starting transfer for {file.fileName} to {hardware_pn}."
-        )
-
-        # [BST-235]
-        result = self.arinc_module.startTransfer(file_record)
-
-        # [BST-238]
-        return result
-
     def getProgress(self) -> TransferStatus:
         # [BST-244]
         if not self.connection_service.isConnected():
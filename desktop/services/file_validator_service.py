@@ -1,26 +1,40 @@
 import hashlib
-from typing import Dict
-from data.classes import File
+import os
+import time
+from datetime import datetime
+from typing import BinaryIO, Dict
+from data.classes import File, IntegrityVerdict, ValidationReport
+from data.errors import FileAccessError
 from services.logging_service import LoggingService
+from services.verification_cache import VerificationCache
+
+HEADER_SIZE = 40
+TRAILER_SIZE = 32
+# Tamanho do bloco lido por vez ao calcular o hash da seção de dados
+CHUNK_SIZE = 1024 * 1024
 
 class FileValidatorService:
-    def __init__(self):
+    def __init__(self, verification_cache: VerificationCache | None = None):
         self.logging_service = LoggingService(FileValidatorService.__name__)
+        self.verification_cache = verification_cache
+
+    def _parse_header(self, header: bytes) -> Dict[str, str]:
+        # Extrair somente o Software PN
+        sw_pn_bytes = header[0:20]
+        sw_pn = sw_pn_bytes.rstrip(b'\x00').decode('ascii')
+
+        # Extrair somente o Hardware PN
+        hw_pn_bytes = header[20:40]
+        hw_pn = hw_pn_bytes.rstrip(b'\x00').decode('ascii')
+
+        return {"sw_pn": sw_pn, "hw_pn": hw_pn}
 
     def _read_header(self, file: File) -> Dict[str, str]:
         with open(file.path, 'rb') as f:
             # Ler somente o Header do arquivo
-            header = f.read(40)
-            
-            # Extrair somente o Software PN
-            sw_pn_bytes = header[0:20]
-            sw_pn = sw_pn_bytes.rstrip(b'\x00').decode('ascii')
-            
-            # Extrair somente o Hardware PN
-            hw_pn_bytes = header[20:40]
-            hw_pn = hw_pn_bytes.rstrip(b'\x00').decode('ascii')
-            
-        return {"sw_pn": sw_pn, "hw_pn": hw_pn}
+            header = f.read(HEADER_SIZE)
+
+        return self._parse_header(header)
     
     def _read_data_and_trailing(self, file: File) -> tuple[bytes,str]:
         with open(file.path, 'rb') as f:
@@ -28,13 +42,88 @@ class FileValidatorService:
             file_content = f.read()
 
             # Extrai somente a parte dos dados, excluindo o Header e o SHA-256 hash
-            data = file_content[40:-32]   
+            data = file_content[HEADER_SIZE:-TRAILER_SIZE]   
 
             # Extrai somente o SHA-256 hash
-            trailing = file_content[-32:].hex()
+            trailing = file_content[-TRAILER_SIZE:].hex()
             
         return data, trailing
 
+    def _get_data_size(self, f: BinaryIO) -> int:
+        f.seek(0, os.SEEK_END)
+        data_size = f.tell() - HEADER_SIZE - TRAILER_SIZE
+        if data_size < 0:
+            raise ValueError("Malformed software image file")
+        return data_size
+
+    def _hash_stream(self, f: BinaryIO, data_size: int, sink: BinaryIO | None = None) -> str:
+        """
+        Calcula o SHA-256 de data_size bytes a partir da posição atual do arquivo, em blocos
+        de tamanho fixo, sem carregar o arquivo inteiro em memória. Se sink for informado,
+        cada bloco lido também é escrito nele.
+        """
+        sha256 = hashlib.sha256()
+        buffer = bytearray(CHUNK_SIZE)
+        view = memoryview(buffer)
+
+        remaining = data_size
+        while remaining > 0:
+            read = f.readinto(view[:min(remaining, CHUNK_SIZE)])
+            if not read:
+                raise ValueError("Unexpected end of software image file")
+            sha256.update(view[:read])
+            if sink is not None:
+                self._write_copy(sink, view[:read])
+            remaining -= read
+
+        return sha256.hexdigest()
+
+    def _write_copy(self, sink: BinaryIO, data) -> None:
+        # Falhas ao gravar a cópia (ex.: disco cheio) não dizem nada sobre a imagem lida
+        # e não podem virar um resultado de validação negativo
+        try:
+            sink.write(data)
+        except Exception as e:
+            raise FileAccessError("Could not write the copy of the software image") from e
+
+    def _cache_key(self, f: BinaryIO) -> str | None:
+        if self.verification_cache is None:
+            return None
+        return VerificationCache.keyFor(os.fstat(f.fileno()))
+
+    def _store_verdict(self, f: BinaryIO, key: str | None, verdict: IntegrityVerdict) -> None:
+        # Só grava no cache se o arquivo não mudou durante a verificação
+        if key is not None and key == self._cache_key(f):
+            self.verification_cache.put(key, verdict)
+
+    def _verify_data_section(self, file: File, force: bool = False) -> tuple[IntegrityVerdict, bool]:
+        """
+        Retorna o veredito de integridade lendo o arquivo em streaming, ou do cache de
+        verificação quando o arquivo não mudou desde a última verificação e force=False.
+        O segundo item indica se o veredito veio do cache.
+        """
+        with open(file.path, 'rb') as f:
+            key = self._cache_key(f)
+            if key is not None and not force:
+                cached = self.verification_cache.get(key)
+                if cached is not None:
+                    return cached, True
+
+            data_size = self._get_data_size(f)
+
+            # Lê somente o SHA-256 hash no final do arquivo
+            f.seek(-TRAILER_SIZE, os.SEEK_END)
+            trailing = f.read(TRAILER_SIZE).hex()
+
+            # Percorre a seção de dados, excluindo o Header e o SHA-256 hash
+            f.seek(HEADER_SIZE)
+            calculated_hash = self._hash_stream(f, data_size)
+
+            verdict = IntegrityVerdict(calculated_hash, trailing, data_size, calculated_hash == trailing)
+            self._store_verdict(f, key, verdict)
+
+        return verdict, False
+
     def checkIdentification(self, file: File) -> tuple[str, str, bool]:
         try:
             header = self._read_header(file)
@@ -58,11 +147,40 @@ class FileValidatorService:
             )
             return '', '', False
 
-    def checkIntegrity(self, file: File) -> tuple[bytes, str, bool]:
+    def identifyStream(self, stream: BinaryIO) -> tuple[str, str, bool]:
+        """
+        Igual a checkIdentification, mas lê somente o header de um stream já aberto.
+        """
+        header_bytes = stream.read(HEADER_SIZE)
+        if len(header_bytes) != HEADER_SIZE:
+            return '', '', False
+
+        header = self._parse_header(header_bytes)
+        sw_pn = header.get("sw_pn", '')
+        hw_pn = header.get("hw_pn", '')
+
+        # [BST-269]
+        return sw_pn, hw_pn, sw_pn != ""
+
+    def checkIntegrity(
+        self, file: File, include_data: bool = False, force: bool = False
+    ) -> tuple[bytes, str, bool]:
+        """
+        Verifica o SHA-256 da seção de dados. A seção de dados só é carregada em memória
+        e retornada quando include_data=True; caso contrário o hash é calculado em streaming
+        e o primeiro item da tupla é vazio. Com force=True o cache de verificação é ignorado
+        e o arquivo é sempre relido (auditoria).
+        """
         try:
             # [BST-271, BST-272]
-            data_section, extracted_hash = self._read_data_and_trailing(file)
-            calculated_hash = hashlib.sha256(data_section).hexdigest()
+            from_cache = False
+            if include_data:
+                data_section, extracted_hash = self._read_data_and_trailing(file)
+                calculated_hash = hashlib.sha256(data_section).hexdigest()
+            else:
+                data_section = b''
+                verdict, from_cache = self._verify_data_section(file, force)
+                calculated_hash, extracted_hash = verdict.calculatedHash, verdict.extractedHash
 
             # [BST-274]
             is_valid = calculated_hash == extracted_hash
@@ -70,6 +188,7 @@ class FileValidatorService:
             # [BST-280]
             self.logging_service.log(
                 f"checkIntegrity result for {file.fileName}: {is_valid}"
+                f"{' (cached)' if from_cache else ''}"
             )
 
             # [BST-274]
@@ -104,3 +223,172 @@ class FileValidatorService:
                 f"File read error during checkCompatibility for {file.fileName}", e
             )
             return False
+
+    def _scan_stream(
+        self,
+        f: BinaryIO,
+        total_size: int,
+        copy_to: BinaryIO | None = None,
+        header_bytes: bytes | None = None,
+    ) -> tuple[Dict[str, str], IntegrityVerdict]:
+        """
+        Lê header, seção de dados e trailer em sequência a partir do início do stream,
+        sem seeks, para que também funcione com membros de arquivos .zip/.tar. Se o header
+        já foi lido do stream, header_bytes o repassa e a leitura começa na seção de dados.
+        """
+        data_size = total_size - HEADER_SIZE - TRAILER_SIZE
+        if data_size < 0:
+            raise ValueError("Malformed software image file")
+
+        # [BST-269]
+        if header_bytes is None:
+            header_bytes = f.read(HEADER_SIZE)
+        if len(header_bytes) != HEADER_SIZE:
+            raise ValueError("Unexpected end of software image file")
+        header = self._parse_header(header_bytes)
+        if copy_to is not None:
+            self._write_copy(copy_to, header_bytes)
+
+        # [BST-271, BST-272]
+        calculated_hash = self._hash_stream(f, data_size, copy_to)
+        trailer_bytes = f.read(TRAILER_SIZE)
+        if len(trailer_bytes) != TRAILER_SIZE:
+            raise ValueError("Unexpected end of software image file")
+        extracted_hash = trailer_bytes.hex()
+        if copy_to is not None:
+            self._write_copy(copy_to, trailer_bytes)
+
+        verdict = IntegrityVerdict(
+            calculated_hash, extracted_hash, data_size, calculated_hash == extracted_hash
+        )
+        return header, verdict
+
+    def _build_report(
+        self,
+        file_name: str,
+        header: Dict[str, str] | None,
+        verdict: IntegrityVerdict | None,
+        hardware_pn: str | None,
+        started_at: datetime,
+        start: float,
+        from_cache: bool = False,
+    ) -> ValidationReport:
+        sw_pn = header.get("sw_pn", '') if header else ''
+        hw_pn = header.get("hw_pn", '') if header else ''
+
+        # [BST-269, BST-274, BST-278]
+        report = ValidationReport(
+            softwarePN=sw_pn,
+            hardwarePN=hw_pn,
+            extractedHash=verdict.extractedHash if verdict else '',
+            calculatedHash=verdict.calculatedHash if verdict else '',
+            dataSize=verdict.dataSize if verdict else 0,
+            isIdentified=sw_pn != "",
+            isIntegrityValid=verdict.isValid if verdict else False,
+            isCompatible=None if hardware_pn is None else hw_pn == hardware_pn,
+            validatedAt=started_at,
+            durationSeconds=time.perf_counter() - start,
+        )
+
+        # [BST-280]
+        self.logging_service.log(
+            f"validate result for {file_name} (Target: {hardware_pn}): "
+            f"identified={report.isIdentified}, integrity={report.isIntegrityValid}, "
+            f"compatible={report.isCompatible} in {report.durationSeconds:.3f}s"
+            f"{' (cached)' if from_cache else ''}"
+        )
+
+        return report
+
+    def validate(
+        self,
+        file: File,
+        hardware_pn: str | None = None,
+        force: bool = False,
+        copy_to: BinaryIO | None = None,
+    ) -> ValidationReport:
+        """
+        Executa identificação, integridade e (se hardware_pn for informado) compatibilidade
+        em uma única leitura sequencial do arquivo. Se o arquivo não mudou desde a última
+        verificação, somente o header é lido, a menos que force=True.
+
+        Se copy_to for informado, o arquivo inteiro é lido (o cache é ignorado) e cada byte
+        lido é escrito em copy_to, de forma que o hash calculado corresponde exatamente aos
+        bytes copiados. Falhas ao escrever em copy_to são levantadas como FileAccessError.
+        """
+        if copy_to is not None:
+            force = True
+
+        started_at = datetime.now()
+        start = time.perf_counter()
+        header = None
+        verdict = None
+        from_cache = False
+
+        try:
+            with open(file.path, 'rb') as f:
+                key = self._cache_key(f)
+                if key is not None and not force:
+                    verdict = self.verification_cache.get(key)
+                    from_cache = verdict is not None
+
+                if verdict is not None:
+                    # [BST-269]
+                    header = self._parse_header(f.read(HEADER_SIZE))
+                else:
+                    header, verdict = self._scan_stream(f, os.fstat(f.fileno()).st_size, copy_to)
+                    self._store_verdict(f, key, verdict)
+
+        except FileAccessError:
+            raise
+        except Exception as e:
+            self.logging_service.error(
+                f"File read error during validate for {file.fileName}", e
+            )
+
+        return self._build_report(
+            file.fileName, header, verdict, hardware_pn, started_at, start, from_cache
+        )
+
+    def validateStream(
+        self,
+        stream: BinaryIO,
+        file_name: str,
+        size: int,
+        hardware_pn: str | None = None,
+        copy_to: BinaryIO | None = None,
+        header_bytes: bytes | None = None,
+    ) -> ValidationReport:
+        """
+        Igual a validate, mas lê de um stream já aberto com tamanho conhecido (ex.: membro
+        de um arquivo .zip/.tar), sem extraí-lo para o disco. O cache não é consultado.
+        header_bytes repassa um header já lido do stream (ex.: para checar duplicatas).
+        """
+        started_at = datetime.now()
+        start = time.perf_counter()
+        header = None
+        verdict = None
+
+        try:
+            header, verdict = self._scan_stream(stream, size, copy_to, header_bytes)
+        except FileAccessError:
+            raise
+        except Exception as e:
+            self.logging_service.error(
+                f"File read error during validate for {file_name}", e
+            )
+
+        return self._build_report(file_name, header, verdict, hardware_pn, started_at, start)
+
+    def recordVerdict(self, file: File, report: ValidationReport) -> None:
+        """
+        Registra no cache de verificação o resultado de integridade de um arquivo cujo
+        conteúdo foi verificado enquanto era escrito (ex.: cópia feita por validate(copy_to=...)).
+        """
+        if self.verification_cache is None:
+            return
+
+        verdict = IntegrityVerdict(
+            report.calculatedHash, report.extractedHash, report.dataSize, report.isIntegrityValid
+        )
+        self.verification_cache.put(VerificationCache.keyFor(os.stat(file.path)), verdict)
@@ -0,0 +1,69 @@
+import io
+import os
+
+class FileWindow(io.RawIOBase):
+    """
+    Visão somente leitura e com seek sobre um trecho [offset, offset + length) de um arquivo.
+    Permite servir uma imagem (ou só a sua seção de dados) diretamente do catálogo,
+    sem copiar o arquivo.
+    """
+
+    def __init__(self, path: str, offset: int = 0, length: int | None = None):
+        super().__init__()
+        self._file = open(path, 'rb', buffering=0)
+        size = os.fstat(self._file.fileno()).st_size
+
+        if length is None:
+            length = size - offset
+        if offset < 0 or length < 0 or offset + length > size:
+            self._file.close()
+            raise ValueError(f"Invalid window [{offset}, {offset + length}) for {path} ({size} bytes)")
+
+        self.name = path
+        self._offset = offset
+        self._length = length
+        self._pos = 0
+        # Tamanho pedido na última leitura; servido por TFTP, é o blksize negociado
+        self.readSize: int | None = None
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def readinto(self, b) -> int:
+        remaining = self._length - self._pos
+        if remaining <= 0:
+            return 0
+
+        view = memoryview(b).cast('B')
+        self.readSize = len(view)
+        size = min(len(view), remaining)
+        self._file.seek(self._offset + self._pos)
+        read = self._file.readinto(view[:size]) or 0
+        self._pos += read
+        return read
+
+    def seek(self, pos: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_SET:
+            new_pos = pos
+        elif whence == io.SEEK_CUR:
+            new_pos = self._pos + pos
+        elif whence == io.SEEK_END:
+            new_pos = self._length + pos
+        else:
+            raise ValueError(f"Invalid whence: {whence}")
+
+        if new_pos < 0:
+            raise ValueError("Negative seek position")
+        self._pos = new_pos
+        return self._pos
+
+    def tell(self) -> int:
+        return self._pos
+
+    def close(self) -> None:
+        if not self.closed:
+            self._file.close()
+        super().close()
@@ -0,0 +1,148 @@
+import os
+import sqlite3
+import threading
+from datetime import datetime
+from typing import Iterable, List
+
+from data.classes import BlockManifest, File, FileRecord
+from services.logging_service import LoggingService
+
+_SCHEMA_VERSION = 1
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS images (
+    softwarePN TEXT PRIMARY KEY,
+    hardwarePN TEXT NOT NULL,
+    dataHash TEXT NOT NULL,
+    importedAt TEXT NOT NULL,
+    sizeBytes INTEGER NOT NULL,
+    fileName TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS images_hardwarePN ON images (hardwarePN);
+CREATE INDEX IF NOT EXISTS images_dataHash ON images (dataHash);
+CREATE INDEX IF NOT EXISTS images_importedAt ON images (importedAt);
+CREATE TABLE IF NOT EXISTS manifests (
+    softwarePN TEXT PRIMARY KEY,
+    blockSize INTEGER NOT NULL,
+    fileSize INTEGER NOT NULL,
+    merkleRoot TEXT NOT NULL,
+    leaves BLOB NOT NULL
+);
+"""
+
+_COLUMNS = "softwarePN, hardwarePN, dataHash, importedAt, sizeBytes, fileName"
+
+class ImageCatalog:
+    """
+    Índice SQLite dos arquivos importados. Os arquivos .bin e os metadados .txt continuam
+    no diretório de armazenamento; o catálogo evita reabrir cada .txt a cada listagem.
+    """
+
+    def __init__(self, storage_path: str, db_name: str = "catalog.sqlite3"):
+        self.logging_service = LoggingService(ImageCatalog.__name__)
+        self.storage_path = storage_path
+        self.db_path = os.path.join(storage_path, db_name)
+        self._lock = threading.Lock()
+
+        # A conexão é compartilhada entre threads (importação em lote); o acesso é serializado por _lock
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._conn.executescript(_SCHEMA)
+        self._conn.commit()
+
+    def needsMigration(self) -> bool:
+        with self._lock:
+            version = self._conn.execute("PRAGMA user_version").fetchone()[0]
+        return version < _SCHEMA_VERSION
+
+    def markMigrated(self) -> None:
+        with self._lock:
+            self._conn.execute(f"PRAGMA user_version = {_SCHEMA_VERSION}")
+            self._conn.commit()
+
+    def _to_record(self, row: tuple) -> FileRecord:
+        sw_pn, hw_pn, data_hash, imported_at, size_bytes, file_name = row
+        return FileRecord(
+            file=File(path=os.path.join(self.storage_path, file_name), fileName=file_name),
+            softwarePN=sw_pn,
+            hardwarePN=hw_pn,
+            dataHash=data_hash,
+            importedAt=datetime.fromisoformat(imported_at),
+            sizeBytes=size_bytes,
+        )
+
+    def _to_row(self, record: FileRecord) -> tuple:
+        return (
+            record.softwarePN,
+            record.hardwarePN,
+            record.dataHash,
+            record.importedAt.isoformat(),
+            record.sizeBytes,
+            record.file.fileName,
+        )
+
+    def _query(self, sql: str, params: tuple = ()) -> List[FileRecord]:
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        return [self._to_record(row) for row in rows]
+
+    def list(self) -> List[FileRecord]:
+        return self._query(f"SELECT {_COLUMNS} FROM images ORDER BY importedAt")
+
+    def listByHardwarePN(self, hardwarePN: str) -> List[FileRecord]:
+        return self._query(
+            f"SELECT {_COLUMNS} FROM images WHERE hardwarePN = ? ORDER BY importedAt", (hardwarePN,)
+        )
+
+    def listByDataHash(self, dataHash: str) -> List[FileRecord]:
+        return self._query(f"SELECT {_COLUMNS} FROM images WHERE dataHash = ?", (dataHash,))
+
+    def get(self, softwarePN: str) -> FileRecord | None:
+        records = self._query(f"SELECT {_COLUMNS} FROM images WHERE softwarePN = ?", (softwarePN,))
+        return records[0] if records else None
+
+    def add(self, record: FileRecord) -> None:
+        # Lança sqlite3.IntegrityError se o SW PN já estiver no catálogo
+        with self._lock, self._conn:
+            self._conn.execute(
+                f"INSERT INTO images ({_COLUMNS}) VALUES (?, ?, ?, ?, ?, ?)", self._to_row(record)
+            )
+
+    def remove(self, softwarePN: str) -> None:
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM images WHERE softwarePN = ?", (softwarePN,))
+            self._conn.execute("DELETE FROM manifests WHERE softwarePN = ?", (softwarePN,))
+
+    def replaceAll(self, records: Iterable[FileRecord]) -> None:
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM images")
+            self._conn.executemany(
+                f"INSERT OR REPLACE INTO images ({_COLUMNS}) VALUES (?, ?, ?, ?, ?, ?)",
+                [self._to_row(record) for record in records],
+            )
+            # Manifestos de imagens que não estão mais no catálogo são descartados
+            self._conn.execute("DELETE FROM manifests WHERE softwarePN NOT IN (SELECT softwarePN FROM images)")
+
+    def getManifest(self, softwarePN: str) -> BlockManifest | None:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT blockSize, fileSize, merkleRoot, leaves FROM manifests WHERE softwarePN = ?", (softwarePN,)
+            ).fetchone()
+        if row is None:
+            return None
+
+        block_size, file_size, merkle_root, leaves = row
+        # As folhas são gravadas concatenadas, 32 bytes cada
+        leaves = tuple(leaves[i:i + 32] for i in range(0, len(leaves), 32))
+        return BlockManifest(block_size, file_size, leaves, merkle_root)
+
+    def putManifest(self, softwarePN: str, manifest: BlockManifest) -> None:
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO manifests (softwarePN, blockSize, fileSize, merkleRoot, leaves) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (softwarePN, manifest.blockSize, manifest.fileSize, manifest.merkleRoot, b''.join(manifest.leaves)),
+            )
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
@@ -1,21 +1,179 @@
+import io
 import os
-import shutil
 import glob
+import functools
+import tarfile
+import tempfile
+import threading
+import time
+import zipfile
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass
 from datetime import datetime
-from typing import List
-from data.classes import File, FileRecord
+from typing import BinaryIO, Callable, ContextManager, Dict, Iterator, List
+from data.classes import BlockManifest, BulkImportResult, File, FileRecord, ImportResult
 from data.errors import DuplicateFileError, FileAccessError, IdentificationError, IntegrityError
-from services.file_validator_service import FileValidatorService
+from services.block_manifest import BlockManifestService
+from services.directory_watcher import DirectoryWatcher
+from services.file_validator_service import HEADER_SIZE, FileValidatorService
+from services.image_catalog import ImageCatalog
 from services.logging_service import LoggingService
 
+ZIP_EXTENSIONS = (".zip",)
+TAR_EXTENSIONS = (".tar", ".tar.gz", ".tgz", ".tar.bz2", ".tbz2", ".tar.xz", ".txz")
+
+@dataclass
+class _ImportSource:
+    name: str
+    size: int
+    open: Callable[[], ContextManager[BinaryIO]] | None
+    # Membros de .tar compactados não têm acesso aleatório: são lidos em streaming, com o
+    # header lido na mesma passada que lista o arquivo, e importados em uma segunda passada
+    archive: str | None = None
+    member: str | None = None
+    header: bytes | None = None
+
+@contextmanager
+def _open_zip_member(archive_path: str, info: zipfile.ZipInfo) -> Iterator[BinaryIO]:
+    # Cada leitura abre seu próprio handle, para que membros possam ser lidos em paralelo
+    with zipfile.ZipFile(archive_path) as archive, archive.open(info) as member:
+        yield member
+
+@contextmanager
+def _open_tar_member(archive_path: str, info: tarfile.TarInfo) -> Iterator[BinaryIO]:
+    # Só para .tar sem compressão: a abertura lê um único header e extractfile vai
+    # direto ao offset do membro
+    with tarfile.open(archive_path, 'r:') as archive, archive.extractfile(info) as member:
+        yield member
+
+def _is_compressed_tar(lower_path: str) -> bool:
+    return lower_path.endswith(TAR_EXTENSIONS) and not lower_path.endswith(".tar")
+
 class ImportedFilesService:
-    def __init__(self, file_validator: FileValidatorService, storage_path: str):
+    def __init__(
+        self,
+        file_validator: FileValidatorService,
+        storage_path: str,
+        watch: bool = True,
+        block_manifest: BlockManifestService | None = None,
+    ):
         self.logging_service = LoggingService(ImportedFilesService.__name__)
         self.file_validator = file_validator
+        self.block_manifest = block_manifest or BlockManifestService()
         self.storage_path = storage_path
         if not os.path.exists(self.storage_path):
             os.makedirs(self.storage_path)
 
+        self.catalog = ImageCatalog(self.storage_path)
+        if self.catalog.needsMigration():
+            self._migrate_sidecars()
+
+        # Cache em memória do catálogo, carregado sob demanda e atualizado a cada
+        # importação/remoção e quando o diretório muda por fora do app
+        self._records: Dict[str, FileRecord] | None = None
+        self._snapshot: tuple[FileRecord, ...] = ()
+        self._by_hardware: Dict[str, tuple[FileRecord, ...]] = {}
+        self._records_lock = threading.Lock()
+
+        # Serializa a sincronização com o diretório e as mudanças feitas pelo próprio app
+        self._catalog_lock = threading.Lock()
+        self._changing_files: set[str] = set()
+
+        self._watcher: DirectoryWatcher | None = None
+        if watch:
+            self._watcher = DirectoryWatcher(
+                self.storage_path, self._reconcile, name_filter=self._is_catalog_entry
+            )
+            self._watcher.start()
+
+    def close(self) -> None:
+        if self._watcher is not None:
+            self._watcher.stop()
+            self._watcher = None
+        self.catalog.close()
+
+    def _rebuild_views(self) -> None:
+        # Deve ser chamado com _records_lock adquirido
+        self._snapshot = tuple(self._records.values())
+        by_hardware: Dict[str, List[FileRecord]] = {}
+        for record in self._snapshot:
+            by_hardware.setdefault(record.hardwarePN, []).append(record)
+        self._by_hardware = {hw_pn: tuple(records) for hw_pn, records in by_hardware.items()}
+
+    def _load_records(self) -> None:
+        # Deve ser chamado com _records_lock adquirido
+        if self._records is None:
+            self._records = {record.softwarePN: record for record in self.catalog.list()}
+            self._rebuild_views()
+
+    def _invalidate_records(self) -> None:
+        with self._records_lock:
+            self._records = None
+
+    @staticmethod
+    def _is_catalog_entry(name: str) -> bool:
+        # Temporários de importação, o banco do catálogo e seu journal ficam de fora
+        return name.endswith((".bin", ".txt")) and not name.startswith(".")
+
+    @contextmanager
+    def _changing(self, file_name: str) -> Iterator[None]:
+        """
+        Marca um .bin que o próprio app está criando ou removendo.
+        """
+        with self._catalog_lock:
+            self._changing_files.add(file_name)
+        try:
+            yield
+        finally:
+            with self._catalog_lock:
+                self._changing_files.discard(file_name)
+
+    def _reconcile(self) -> None:
+        """
+        Chamado pelo watcher: sincroniza o catálogo com os .bin presentes no diretório.
+        Mudanças feitas pelo próprio app já estão no catálogo e não geram trabalho aqui.
+        """
+        with self._catalog_lock:
+            with os.scandir(self.storage_path) as entries:
+                on_disk = {e.name for e in entries if e.name.endswith(".bin") and e.is_file()}
+            cataloged = {record.file.fileName: record.softwarePN for record in self.catalog.list()}
+
+            removed = [name for name in cataloged if name not in on_disk and name not in self._changing_files]
+            added = [name for name in on_disk if name not in cataloged and name not in self._changing_files]
+            if not removed and not added:
+                return
+
+            for name in removed:
+                self.catalog.remove(cataloged[name])
+                self._cache_remove(cataloged[name])
+
+            indexed = 0
+            for name in sorted(added):
+                record = self._index_bin(os.path.join(self.storage_path, name))
+                if record is None or self.catalog.get(record.softwarePN):
+                    continue
+                self.catalog.add(record)
+                self._cache_put(record)
+                indexed += 1
+
+        # [BST-257]
+        self.logging_service.log(
+            f"Storage directory changed: {indexed} records indexed, {len(removed)} records removed."
+        )
+
+    def _cache_put(self, record: FileRecord) -> None:
+        with self._records_lock:
+            if self._records is not None:
+                self._records[record.softwarePN] = record
+                self._rebuild_views()
+
+    def _cache_remove(self, softwarePN: str) -> None:
+        with self._records_lock:
+            if self._records is not None and self._records.pop(softwarePN, None) is not None:
+                self._rebuild_views()
+
     def _parse_txt_file(self, txt_path: str) -> FileRecord:
         """
         Helper para ler um arquivo .txt de metadados e convertê-lo em um FileRecord.
@@ -40,81 +198,171 @@ class ImportedFilesService:
             sizeBytes=int(props['sizeBytes'])
         )
 
-    def list(self) -> List[FileRecord]:
+    def _migrate_sidecars(self) -> None:
+        # Migração única: indexa no catálogo os metadados .txt existentes
         records = []
-        # [BST-250]
-        search_pattern = os.path.join(self.storage_path, "*.txt")
-        for txt_path in glob.glob(search_pattern):
-            records.append(self._parse_txt_file(txt_path))
+        for txt_path in glob.glob(os.path.join(glob.escape(self.storage_path), "*.txt")):
+            try:
+                records.append(self._parse_txt_file(txt_path))
+            except Exception as e:
+                self.logging_service.error(f"Catalog migration: could not parse {txt_path}", e)
+
+        self.catalog.replaceAll(records)
+        self.catalog.markMigrated()
+        self.logging_service.log(f"Catalog migration finished: {len(records)} records indexed.")
+
+    def _index_bin(self, bin_path: str) -> FileRecord | None:
+        """
+        Registro de catálogo de um .bin encontrado no diretório: lido do .txt de metadados
+        quando existe, senão obtido validando o arquivo. Retorna None se a imagem for inválida.
+        """
+        sw_pn = os.path.basename(bin_path)[:-len(".bin")]
+        txt_paths = glob.glob(os.path.join(glob.escape(self.storage_path), f"{glob.escape(sw_pn)}-*.txt"))
+        try:
+            if txt_paths:
+                return self._parse_txt_file(txt_paths[0])
+
+            bin_file = File(path=bin_path, fileName=os.path.basename(bin_path))
+            report = self.file_validator.validate(bin_file)
+            if not report.isIdentified or not report.isIntegrityValid or report.softwarePN != sw_pn:
+                self.logging_service.log(f"Catalog indexing: skipping invalid image {bin_path}")
+                return None
+
+            return FileRecord(
+                file=bin_file,
+                softwarePN=report.softwarePN,
+                hardwarePN=report.hardwarePN,
+                dataHash=report.extractedHash,
+                importedAt=datetime.fromtimestamp(os.path.getmtime(bin_path)),
+                sizeBytes=report.dataSize,
+            )
+        except Exception as e:
+            self.logging_service.error(f"Catalog indexing: could not index {bin_path}", e)
+            return None
+
+    def rebuildCatalog(self) -> List[FileRecord]:
+        """
+        Reconstrói o catálogo a partir dos arquivos .bin do diretório de armazenamento.
+        Os metadados .txt são usados quando existem; caso contrário o arquivo é validado
+        e indexado com a data de modificação como data de importação.
+        """
+        with self._catalog_lock:
+            records = []
+            for bin_path in sorted(glob.glob(os.path.join(glob.escape(self.storage_path), "*.bin"))):
+                record = self._index_bin(bin_path)
+                if record is not None:
+                    records.append(record)
+
+            self.catalog.replaceAll(records)
+            self.catalog.markMigrated()
+            self._invalidate_records()
+        # [BST-257]
+        self.logging_service.log(f"Catalog rebuild finished: {len(records)} records indexed.")
         return records
 
+    def list(self) -> List[FileRecord]:
+        # [BST-250]
+        with self._records_lock:
+            self._load_records()
+            return list(self._snapshot)
+
     def listFiltered(self, hardwarePN: str) -> List[FileRecord]:
-        records = []
         # [BST-254]
-        search_pattern = os.path.join(self.storage_path, f"*-{hardwarePN}.txt")
-        for txt_path in glob.glob(search_pattern):
-            records.append(self._parse_txt_file(txt_path))
-        return records
+        with self._records_lock:
+            self._load_records()
+            return list(self._by_hardware.get(hardwarePN, ()))
 
     def get(self, softwarePN: str) -> FileRecord:
         # [BST-256]
-        search_pattern = os.path.join(self.storage_path, f"{softwarePN}-*.txt")
-        found_files = glob.glob(search_pattern)
+        with self._records_lock:
+            self._load_records()
+            file_record = self._records.get(softwarePN)
 
-        if not found_files:
+        if file_record is None:
             raise FileAccessError("File not found")
         
-        txt_path = found_files[0]
-        
-        file_record = self._parse_txt_file(txt_path)
         self.logging_service.log(f"File retrieved successfully: SW_PN {softwarePN}")
 
         return file_record
     
     def delete(self, softwarePN: str) -> None:
         # [BST-255]
-        search_pattern = os.path.join(self.storage_path, f"{softwarePN}*")
-        files_to_delete = glob.glob(search_pattern)
-        
-        if not files_to_delete:
-            # [BST-257]
-            self.logging_service.log(f"Delete operation: No files found for SW_PN {softwarePN}.")
-            return
+        escaped_pn = glob.escape(softwarePN)
+        escaped_dir = glob.escape(self.storage_path)
+        files_to_delete = glob.glob(os.path.join(escaped_dir, f"{escaped_pn}.bin"))
+        files_to_delete += glob.glob(os.path.join(escaped_dir, f"{escaped_pn}-*.txt"))
+        with self._changing(f"{softwarePN}.bin"):
+            self.catalog.remove(softwarePN)
+            self._cache_remove(softwarePN)
+
+            if not files_to_delete:
+                # [BST-257]
+                self.logging_service.log(f"Delete operation: No files found for SW_PN {softwarePN}.")
+                return
 
-        for f_path in files_to_delete:
-            os.remove(f_path)
+            for f_path in files_to_delete:
+                os.remove(f_path)
         
         # [BST-257]
         self.logging_service.log(f"Delete operation successful for SW_PN {softwarePN}. {len(files_to_delete)} files removed.")
 
+    def getManifest(self, softwarePN: str) -> BlockManifest:
+        """
+        Manifesto de blocos da imagem. Imagens indexadas sem manifesto (ex.: por uma
+        reconstrução do catálogo) têm o manifesto calculado e gravado no primeiro acesso.
+        """
+        file_record = self.get(softwarePN)
+        manifest = self.catalog.getManifest(softwarePN)
+        if manifest is None:
+            manifest = self.block_manifest.build(file_record.file.path)
+            self.catalog.putManifest(softwarePN, manifest)
+        return manifest
+
+    def verifyBlocks(self, softwarePN: str, sample_size: int | None = None) -> List[int]:
+        """
+        Confere a imagem contra o seu manifesto e retorna os índices dos blocos corrompidos.
+        Com sample_size, só uma amostra aleatória de blocos é conferida.
+        """
+        file_record = self.get(softwarePN)
+        manifest = self.getManifest(softwarePN)
+        if sample_size is None:
+            corrupted = self.block_manifest.verifyBlocks(file_record.file.path, manifest)
+        else:
+            corrupted = self.block_manifest.spotCheck(file_record.file.path, manifest, sample_size)
+
+        # [BST-257]
+        if corrupted:
+            self.logging_service.log(f"Block check failed for SW_PN {softwarePN}: blocks {corrupted}")
+        else:
+            self.logging_service.log(f"Block check successful for SW_PN {softwarePN}")
+        return corrupted
+
     def importFile(self, file: File) -> FileRecord:
-        # [BST-251]
-        sw_pn, hw_pn, is_identified = self.file_validator.checkIdentification(file)
+        with open(file.path, 'rb') as source:
+            return self._import_stream(source, file.fileName, os.fstat(source.fileno()).st_size)
+
+    def _import_stream(self, source: BinaryIO, file_name: str, size: int) -> FileRecord:
+        # [BST-253]
+        # O arquivo é copiado para um temporário no diretório de armazenamento enquanto o
+        # hash é calculado, e só é renomeado para o destino final depois de verificado.
+        # Assim a origem é lida uma única vez e uma cópia parcial nunca fica visível.
+        # O header é lido antes da cópia para que duplicatas sejam rejeitadas sem copiar a imagem
+        header_bytes = source.read(HEADER_SIZE)
+        sw_pn, hw_pn, is_identified = self.file_validator.identifyStream(io.BytesIO(header_bytes))
         if not is_identified:
             # [BST-257]
-            msg = f"Import failed: Identification check failed for {file.fileName}"
+            msg = f"Import failed: Identification check failed for {file_name}"
             err = IdentificationError(msg)
             self.logging_service.error(msg, err)
             # [BST-252]
             raise err
 
-        # [BST-259]
-        data_section, extracted_hash, is_integrity_valid = self.file_validator.checkIntegrity(file)
-        if not is_integrity_valid:
-            # [BST-257]
-            msg = f"Import failed: Integrity check failed for {file.fileName}"
-            err = IntegrityError(msg)
-            self.logging_service.error(msg, err)
-            # [BST-260]
-            raise err
-        size_bytes = len(data_section)
-
         # [BST-253]
         bin_path = os.path.join(self.storage_path, f"{sw_pn}.bin")
         txt_path = os.path.join(self.storage_path, f"{sw_pn}-{hw_pn}.txt")
 
         # [BST-258]
-        if os.path.exists(bin_path) or os.path.exists(txt_path):
+        if os.path.exists(bin_path) or os.path.exists(txt_path) or self.catalog.get(sw_pn):
             msg = f"Import failed: File with SW_PN {sw_pn} already exists."
             err = DuplicateFileError(msg)
             # [BST-257]
@@ -122,46 +370,298 @@ class ImportedFilesService:
             # [BST-612]
             raise err
 
-        # [BST-253]
-        shutil.copy(file.path, bin_path)
+        # O arquivo fica marcado como alterado pelo app até entrar no catálogo, para que a
+        # sincronização com o diretório não o trate como uma mudança externa
+        with self._changing(os.path.basename(bin_path)):
+            fd, tmp_path = tempfile.mkstemp(prefix=".import-", suffix=".part", dir=self.storage_path)
+            try:
+                with os.fdopen(fd, 'wb') as tmp_file:
+                    # Os hashes por bloco do manifesto são calculados durante a mesma cópia
+                    manifest_writer = self.block_manifest.writer(tmp_file)
+                    try:
+                        # [BST-251, BST-259, BST-267]
+                        report = self.file_validator.validateStream(
+                            source, file_name, size, copy_to=manifest_writer, header_bytes=header_bytes
+                        )
+                        tmp_file.flush()
+                        os.fsync(tmp_file.fileno())
+                    except Exception as e:
+                        # [BST-257]
+                        msg = f"Import failed: Could not write {file_name} to the storage directory"
+                        self.logging_service.error(msg, e)
+                        # [BST-248]
+                        raise FileAccessError(msg) from e
+
+                # [BST-259]
+                if not report.isIntegrityValid:
+                    # [BST-257]
+                    msg = f"Import failed: Integrity check failed for {file_name}"
+                    err = IntegrityError(msg)
+                    self.logging_service.error(msg, err)
+                    # [BST-260]
+                    raise err
+                extracted_hash = report.extractedHash
+                size_bytes = report.dataSize
+
+                manifest = manifest_writer.manifest()
+
+                # [BST-253]
+                # os.link não sobrescreve o destino: se outra importação do mesmo SW PN
+                # publicou primeiro, esta falha como duplicata (o temporário é removido abaixo)
+                try:
+                    os.link(tmp_path, bin_path)
+                except FileExistsError:
+                    msg = f"Import failed: File with SW_PN {sw_pn} already exists."
+                    err = DuplicateFileError(msg)
+                    # [BST-257]
+                    self.logging_service.error(msg, err)
+                    # [BST-612]
+                    raise err
+            finally:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+
+            new_file_obj = File(path=bin_path, fileName=os.path.basename(bin_path))
+            # Os bytes gravados já foram verificados; evita recalcular o hash na transferência
+            self.file_validator.recordVerdict(new_file_obj, report)
+
+            imported_at = datetime.now()
         
-        imported_at = datetime.now()
+            metadata_content = (
+                f"softwarePN={sw_pn}\n"
+                f"hardwarePN={hw_pn}\n"
+                f"dataHash={extracted_hash}\n"
+                f"importedAt={imported_at.isoformat()}\n"
+                f"sizeBytes={size_bytes}\n"
+                f"original_filename={file_name}\n"
+            )
+            # [BST-611]
+            record = FileRecord(
+                file=new_file_obj,
+                softwarePN=sw_pn,
+                hardwarePN=hw_pn,
+                dataHash=extracted_hash,
+                importedAt=imported_at,
+                sizeBytes=size_bytes
+            )
+
+            tmp_txt_path = f"{txt_path}.part"
+            try:
+                with open(tmp_txt_path, 'w') as f:
+                    f.write(metadata_content)
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(tmp_txt_path, txt_path)
+                self.catalog.add(record)
+                self.catalog.putManifest(sw_pn, manifest)
+                self._cache_put(record)
+            except Exception as e:
+                # [BST-249]
+                for path in (bin_path, txt_path, tmp_txt_path):
+                    if os.path.exists(path):
+                        os.remove(path)
+                self.catalog.remove(sw_pn)
+                # [BST-257]
+                msg = f"Import failed: Could not write metadata for {bin_path}"
+                self.logging_service.error(msg, e)
+                # [BST-248]
+                raise FileAccessError(msg) from e
         
-        metadata_content = (
-            f"softwarePN={sw_pn}\n"
-            f"hardwarePN={hw_pn}\n"
-            f"dataHash={extracted_hash}\n"
-            f"importedAt={imported_at.isoformat()}\n"
-            f"sizeBytes={size_bytes}\n"
-            f"original_filename={file.fileName}\n"
-        )
-        with open(txt_path, 'w') as f:
-            f.write(metadata_content)
-
-        # [BST-267]
-        created_bin_file = File(path=bin_path, fileName=os.path.basename(bin_path))
-        if not self.file_validator.checkIntegrity(created_bin_file):
-            # [BST-249]
-            os.remove(bin_path)
-            os.remove(txt_path)
             # [BST-257]
-            msg = f"Import failed: Integrity check failed for created file {bin_path}"
-            err = IntegrityError(msg)
-            self.logging_service.error(msg, err)
-            # [BST-248]
-            raise err
+            self.logging_service.log(f"Import successful: {file_name} imported as {sw_pn}.bin")
         
+            return record
+
+    def _collect_sources(self, path: str) -> List[_ImportSource]:
+        """
+        Expande um caminho (arquivo, diretório, .zip ou .tar) em fontes de importação.
+        Membros de arquivos compactados são lidos diretamente, sem extração para o disco.
+        """
+        lower_path = path.lower()
+
+        if os.path.isdir(path):
+            sources = []
+            for entry in sorted(os.scandir(path), key=lambda e: e.name):
+                if entry.is_file():
+                    sources.extend(self._collect_sources(entry.path))
+            return sources
+
+        if lower_path.endswith(ZIP_EXTENSIONS):
+            with zipfile.ZipFile(path) as archive:
+                return [
+                    _ImportSource(
+                        f"{os.path.basename(path)}/{info.filename}",
+                        info.file_size,
+                        functools.partial(_open_zip_member, path, info),
+                    )
+                    for info in archive.infolist() if not info.is_dir()
+                ]
+
+        if _is_compressed_tar(lower_path):
+            # Uma única descompressão sequencial lista os membros e lê seus headers
+            sources = []
+            with tarfile.open(path, 'r|*') as archive:
+                for info in archive:
+                    if info.isfile():
+                        with archive.extractfile(info) as member:
+                            header = member.read(HEADER_SIZE)
+                        sources.append(_ImportSource(
+                            f"{os.path.basename(path)}/{info.name}", info.size, None,
+                            archive=path, member=info.name, header=header,
+                        ))
+            return sources
+
+        if lower_path.endswith(TAR_EXTENSIONS):
+            with tarfile.open(path, 'r:') as archive:
+                return [
+                    _ImportSource(
+                        f"{os.path.basename(path)}/{info.name}",
+                        info.size,
+                        functools.partial(_open_tar_member, path, info),
+                    )
+                    for info in archive.getmembers() if info.isfile()
+                ]
+
+        return [
+            _ImportSource(
+                os.path.basename(path), os.path.getsize(path), functools.partial(open, path, 'rb')
+            )
+        ]
+
+    def _import_source(self, source: _ImportSource, stream: BinaryIO | None = None) -> ImportResult:
+        start = time.perf_counter()
+        try:
+            if stream is not None:
+                record = self._import_stream(stream, source.name, source.size)
+            else:
+                with source.open() as stream:
+                    record = self._import_stream(stream, source.name, source.size)
+            return ImportResult(source.name, record, None, source.size, time.perf_counter() - start)
+        except Exception as e:
+            return ImportResult(source.name, None, e, source.size, time.perf_counter() - start)
+
+    def _import_archive_stream(self, archive_path: str, sources: List[_ImportSource]) -> List[ImportResult]:
+        """
+        Importa os membros pedidos de um .tar compactado em uma única passada sequencial.
+        """
+        by_member = {source.member: source for source in sources}
+        results: List[ImportResult] = []
+        try:
+            with tarfile.open(archive_path, 'r|*') as archive:
+                for info in archive:
+                    source = by_member.pop(info.name, None)
+                    if source is None or not info.isfile():
+                        continue
+                    with archive.extractfile(info) as member:
+                        results.append(self._import_source(source, member))
+        except Exception as e:
+            self.logging_service.error(f"Bulk import: could not read {archive_path}", e)
+
+        for source in by_member.values():
+            err = FileAccessError(f"Could not read {source.name} from {archive_path}")
+            results.append(ImportResult(source.name, None, err, source.size, 0.0))
+        return results
+
+    def importMany(self, sources: str | List[str], max_workers: int | None = None) -> BulkImportResult:
+        """
+        Importa vários arquivos de uma vez. Cada item de sources pode ser um arquivo, um
+        diretório (seus arquivos são importados) ou um arquivo .zip/.tar (seus membros são
+        importados). A validação e o hash rodam em paralelo em max_workers threads
+        (padrão: número de núcleos). SW PNs duplicados, no lote ou já importados, são
+        rejeitados antes de qualquer cópia.
+        """
+        if isinstance(sources, str):
+            sources = [sources]
+        if max_workers is None:
+            max_workers = os.cpu_count() or 1
+
+        start = time.perf_counter()
+        results: List[ImportResult] = []
+        pending: List[_ImportSource] = []
+
+        # Lê somente o header de cada fonte para detectar duplicatas antes de importar
+        identified: List[tuple[_ImportSource, str]] = []
+        for path in sources:
+            try:
+                collected = self._collect_sources(path)
+            except Exception as e:
+                self.logging_service.error(f"Bulk import: could not read {path}", e)
+                results.append(ImportResult(path, None, FileAccessError(f"Could not read {path}: {e}"), 0, 0.0))
+                continue
+
+            for source in collected:
+                try:
+                    if source.header is not None:
+                        sw_pn, _, is_identified = self.file_validator.identifyStream(io.BytesIO(source.header))
+                    else:
+                        with source.open() as stream:
+                            sw_pn, _, is_identified = self.file_validator.identifyStream(stream)
+                except Exception:
+                    is_identified = False
+
+                if not is_identified:
+                    msg = f"Import failed: Identification check failed for {source.name}"
+                    results.append(ImportResult(source.name, None, IdentificationError(msg), source.size, 0.0))
+                    continue
+                identified.append((source, sw_pn))
+
+        pn_counts = Counter(sw_pn for _, sw_pn in identified)
+        for source, sw_pn in identified:
+            if pn_counts[sw_pn] > 1:
+                msg = f"Import failed: SW_PN {sw_pn} appears more than once in the batch."
+            elif os.path.exists(os.path.join(self.storage_path, f"{sw_pn}.bin")) or self.catalog.get(sw_pn):
+                msg = f"Import failed: File with SW_PN {sw_pn} already exists."
+            else:
+                pending.append(source)
+                continue
+            # [BST-258]
+            results.append(ImportResult(source.name, None, DuplicateFileError(msg), source.size, 0.0))
+
+        # Membros de .tar compactados de um mesmo arquivo são importados em sequência,
+        # em uma única tarefa; as demais fontes são importadas em paralelo
+        archives: Dict[str, List[_ImportSource]] = {}
+        for source in pending:
+            if source.archive is not None:
+                archives.setdefault(source.archive, []).append(source)
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            archive_futures = [
+                executor.submit(self._import_archive_stream, archive_path, members)
+                for archive_path, members in archives.items()
+            ]
+            results.extend(executor.map(self._import_source, [s for s in pending if s.archive is None]))
+            for future in archive_futures:
+                results.extend(future.result())
+
+        duration = time.perf_counter() - start
+        imported = [r for r in results if r.fileRecord is not None]
+        total_bytes = sum(r.sizeBytes for r in imported)
+        bulk_result = BulkImportResult(
+            results=results,
+            importedCount=len(imported),
+            failedCount=len(results) - len(imported),
+            totalBytes=total_bytes,
+            durationSeconds=duration,
+            throughputBytesPerSecond=total_bytes / duration if duration > 0 else 0.0,
+        )
+
         # [BST-257]
-        self.logging_service.log(f"Import successful: {file.fileName} imported as {sw_pn}.bin")
+        self.logging_service.log(
+            f"Bulk import finished: {bulk_result.importedCount} imported, {bulk_result.failedCount} failed, "
+            f"{total_bytes} bytes in {duration:.3f}s ({bulk_result.throughputBytesPerSecond / 1e6:.1f} MB/s)"
+        )
 
-        new_file_obj = File(path=bin_path, fileName=os.path.basename(bin_path))
-        
-        # [BST-611]
-        return FileRecord(
-            file=new_file_obj,
-            softwarePN=sw_pn,
-            hardwarePN=hw_pn,
-            dataHash=extracted_hash,
-            importedAt=imported_at,
-            sizeBytes=size_bytes
-        )
\ No newline at end of file
+        return bulk_result
+
+
+if __name__ == '__main__':
+    import sys
+
+    # Uso: python -m services.imported_files_service rebuild [storage_path]
+    if len(sys.argv) < 2 or sys.argv[1] != "rebuild":
+        print("Usage: python -m services.imported_files_service rebuild [storage_path]")
+        sys.exit(1)
+
+    storage = sys.argv[2] if len(sys.argv) > 2 else "file_directory/images"
+    service = ImportedFilesService(FileValidatorService(), storage, watch=False)
+    print(f"{len(service.rebuildCatalog())} records indexed in {service.catalog.db_path}")
@@ -1,9 +1,11 @@
-from data.classes import File, FileRecord, TransferStatus
+from data.classes import BulkImportResult, File, FileRecord, TransferSessionStatus, TransferStatus, ValidationReport
 from services.connection_service import ConnectionService
 from services.file_tranfer_service import FileTransferService
 from services.imported_files_service import ImportedFilesService
 from services.user_authentication_service import UserAuthenticationService
 from services.file_validator_service import FileValidatorService
+from services.transfer_scheduler import TransferScheduler
+from services.transfer_session import TransferSession
 from typing import List, Any
 
 from typing import List, Any, Tuple
@@ -18,12 +20,14 @@ class ServiceFacade:
         file_transfer_service: FileTransferService,
         imported_files_service: ImportedFilesService,
         file_validator_service: FileValidatorService,
+        transfer_scheduler: TransferScheduler | None = None,
     ):
         self.authentication_service = authentication_service
         self.connection_service = connection_service
         self.file_transfer_service = file_transfer_service
         self.imported_files_service = imported_files_service
         self.file_validator_service = file_validator_service
+        self.transfer_scheduler = transfer_scheduler or TransferScheduler()
 
     def login(self, username: str, password: str) -> Tuple[bool, str]:
         # [BST-331]
@@ -53,7 +57,7 @@ class ServiceFacade:
     def isConnected(self) -> bool:
         return self.connection_service.isConnected()
 
-    def startTransfer(self, file_record: FileRecord) -> bool:
+    def startTransfer(self, file_record: FileRecord | List[FileRecord]) -> bool:
         # [BST-319]
         return self.file_transfer_service.startTransfer(file_record)
 
@@ -64,6 +68,18 @@ class ServiceFacade:
     def cancelTransfer(self) -> None:
         return self.file_transfer_service.cancel()
 
+    def scheduleTransfer(self, session: TransferSession) -> None:
+        self.transfer_scheduler.submit(session)
+
+    def getTransferSessions(self) -> List[TransferSessionStatus]:
+        return self.transfer_scheduler.getProgress()
+
+    def getAggregateTransferProgress(self) -> int:
+        return self.transfer_scheduler.getAggregateProgress()
+
+    def cancelTransferSession(self, target_id: str) -> None:
+        self.transfer_scheduler.cancel(target_id)
+
     def listImportedFiles(self) -> List[FileRecord]:
         return self.imported_files_service.list()
 
@@ -75,6 +91,15 @@ class ServiceFacade:
         # [BST-333]
         return self.imported_files_service.importFile(file)
 
+    def importFiles(self, sources: str | List[str], max_workers: int | None = None) -> BulkImportResult:
+        return self.imported_files_service.importMany(sources, max_workers)
+
+    def rebuildImageCatalog(self) -> List[FileRecord]:
+        return self.imported_files_service.rebuildCatalog()
+
+    def verifyImportedFileBlocks(self, softwarePN: str, sample_size: int | None = None) -> List[int]:
+        return self.imported_files_service.verifyBlocks(softwarePN, sample_size)
+
     def deleteImportedFile(self, softwarePN: str) -> None:
         return self.imported_files_service.delete(softwarePN)
 
@@ -88,8 +113,15 @@ class ServiceFacade:
     def checkFileIntegrity(self, file: File):
         return self.file_validator_service.checkIntegrity(file)
 
+    def reverifyFileIntegrity(self, file: File):
+        # Ignora o cache de verificação (auditoria)
+        return self.file_validator_service.checkIntegrity(file, force=True)
+
     def checkFileCompatibility(self, file: File, hardwarePN: str) -> bool:
         return self.file_validator_service.checkCompatibility(file, hardwarePN)
+
+    def validateFile(self, file: File, hardwarePN: str | None = None) -> ValidationReport:
+        return self.file_validator_service.validate(file, hardwarePN)
     
     def getWifiConnections(self) -> List[dict]: 
         return self.connection_service.scan() 
@@ -0,0 +1,31 @@
+from typing import BinaryIO
+
+from data.classes import RttEstimate, TftpOptions
+from tftp import AsyncTftpClient, TftpEngine
+
+class TftpTransferClient:
+    """
+    Fachada síncrona do cliente TFTP assíncrono, para os módulos de transporte. As
+    transferências rodam no event loop do TftpEngine; a chamada bloqueia até o fim.
+    """
+
+    def __init__(self, host: str, port: int = 69, options: TftpOptions | None = None, engine: TftpEngine | None = None):
+        self.engine = engine or TftpEngine.default()
+        self._client = AsyncTftpClient(host, port, options)
+
+    @property
+    def options_refused(self) -> bool:
+        return self._client.options_refused
+
+    @property
+    def lastBlockSize(self) -> int:
+        return self._client.lastBlockSize
+
+    def rttEstimate(self) -> RttEstimate | None:
+        return self._client.rttEstimate()
+
+    def upload(self, name: str, source: str | BinaryIO, timeout: float = 60, retries: int = 3) -> None:
+        self.engine.run(self._client.upload(name, source, timeout, retries))
+
+    def download(self, name: str, output: str | BinaryIO, timeout: float = 60, retries: int = 3) -> None:
+        self.engine.run(self._client.download(name, output, timeout, retries))
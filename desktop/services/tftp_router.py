@@ -0,0 +1,184 @@
+import os
+import threading
+from typing import BinaryIO, Callable, Dict, List, Tuple
+
+from data.classes import RttEstimate
+from services.logging_service import LoggingService
+from tftp import AsyncTftpServer, TftpEngine
+from tftp.transfer import PacketTap
+
+# Callback de leitura: recebe o nome pedido e devolve o arquivo a servir, ou None
+ReadHandler = Callable[[str], BinaryIO | None]
+# Callback de escrita: recebe o caminho do upload e devolve onde gravá-lo, ou None
+WriteHandler = Callable[[str], BinaryIO | None]
+
+class TftpRouter:
+    """
+    Servidor TFTP persistente, iniciado uma única vez por endereço e porta. Cada
+    transferência registra os seus handlers para o endereço do alvo, e os pedidos
+    RRQ/WRQ recebidos são encaminhados pelo endereço de origem e pelo nome do arquivo.
+    O servidor roda no event loop do TftpEngine, compartilhado por todas as sessões.
+    """
+
+    _shared: Dict[Tuple[str, int], "TftpRouter"] = {}
+    _shared_lock = threading.Lock()
+
+    def __init__(
+        self,
+        root: str,
+        address: str = "",
+        port: int = 6969,
+        timeout: float = 5,
+        retries: int = 3,
+        engine: TftpEngine | None = None,
+    ):
+        self.logging_service = LoggingService(TftpRouter.__name__)
+        # Arquivos presentes na raiz são servidos quando nenhum handler atende o pedido
+        self.root = root
+        self.address = address
+        self.port = port
+        self.timeout = timeout
+        self.retries = retries
+        self.engine = engine or TftpEngine.default()
+
+        self._handlers: Dict[object, Tuple[str | None, ReadHandler, WriteHandler | None]] = {}
+        self._lock = threading.Lock()
+        self._server: AsyncTftpServer | None = None
+        self._tap: PacketTap | None = None
+
+        os.makedirs(self.root, exist_ok=True)
+
+    @classmethod
+    def shared(cls, root: str, address: str = "", port: int = 6969) -> "TftpRouter":
+        """
+        Servidor do processo para o endereço e porta; o root só é usado na primeira chamada.
+        """
+        with cls._shared_lock:
+            router = cls._shared.get((address, port))
+            if router is None:
+                router = cls(root, address, port)
+                cls._shared[(address, port)] = router
+            return router
+
+    def register(
+        self,
+        owner: object,
+        read_handler: ReadHandler,
+        write_handler: WriteHandler | None = None,
+        peer: str | None = None,
+    ) -> None:
+        """
+        Registra os handlers de owner para os pedidos vindos de peer (qualquer origem se None).
+        Inicia o servidor se ainda não estiver rodando; se ele não subir, o registro é
+        desfeito e o erro é propagado.
+        """
+        with self._lock:
+            self._handlers[owner] = (peer, read_handler, write_handler)
+        try:
+            self.start()
+        except Exception:
+            self.unregister(owner)
+            raise
+
+    def unregister(self, owner: object) -> None:
+        with self._lock:
+            self._handlers.pop(owner, None)
+
+    def isRunning(self) -> bool:
+        return self._server is not None and self._server.isRunning()
+
+    def setTap(self, tap: PacketTap | None) -> None:
+        """
+        Observador dos datagramas TFTP de todas as sessões, inclusive do servidor já no ar.
+        Chamado no event loop do TftpEngine.
+        """
+        with self._lock:
+            self._tap = tap
+            if self._server is not None:
+                self._server.tap = tap
+
+    def rttEstimate(self, peer: str) -> RttEstimate | None:
+        # RTT medido nas sessões com peer; None sem servidor ou sem amostras
+        server = self._server
+        return server.rttEstimate(peer) if server is not None else None
+
+    def start(self) -> None:
+        with self._lock:
+            if self.isRunning():
+                return
+
+            server = AsyncTftpServer(
+                self._read_callback,
+                self._write_callback,
+                self.address,
+                self.port,
+                timeout=self.timeout,
+                retries=self.retries,
+                tap=self._tap,
+            )
+            try:
+                self.engine.run(server.start())
+            except Exception as e:
+                self.logging_service.error(f"Could not start TFTP server on {self.address or '*'}:{self.port}", e)
+                raise
+            self._server = server
+            # Com porta 0 o sistema escolhe a porta
+            self.port = server.port
+
+    def stop(self) -> None:
+        with self._lock:
+            server, self._server = self._server, None
+        if server is not None:
+            self.engine.run(server.stop())
+
+    def _candidates(self, peer: str | None) -> List[Tuple[ReadHandler, WriteHandler | None]]:
+        # Handlers registrados para o endereço de origem vêm antes dos registrados para qualquer origem
+        with self._lock:
+            entries = list(self._handlers.values())
+        exact = [(r, w) for p, r, w in entries if p is not None and p == peer]
+        wildcard = [(r, w) for p, r, w in entries if p is None]
+        return exact + wildcard
+
+    def _root_path(self, filename: str) -> str | None:
+        # Nomes que apontariam para fora da raiz são recusados
+        root = os.path.abspath(self.root)
+        path = os.path.abspath(os.path.join(root, filename.lstrip("/\\")))
+        return path if os.path.commonpath([root, path]) == root and path != root else None
+
+    def _read_callback(self, filename: str, peer: str) -> BinaryIO | None:
+        for read_handler, _ in self._candidates(peer):
+            try:
+                fileobj = read_handler(filename)
+            except Exception as e:
+                self.logging_service.error(f"Read handler failed for {filename}", e)
+                continue
+            if fileobj is not None:
+                return fileobj
+
+        path = self._root_path(filename)
+        if path is not None and os.path.isfile(path):
+            return open(path, "rb")
+
+        self.logging_service.log(f"No handler for read of {filename} from {peer}")
+        return None
+
+    def _write_callback(self, filename: str, peer: str) -> BinaryIO | None:
+        path = self._root_path(filename)
+        if path is None:
+            self.logging_service.log(f"Refusing upload of {filename} from {peer}")
+            return None
+
+        for _, write_handler in self._candidates(peer):
+            if write_handler is None:
+                continue
+            try:
+                fileobj = write_handler(path)
+            except Exception as e:
+                self.logging_service.error(f"Write handler failed for {path}", e)
+                continue
+            if fileobj is not None:
+                return fileobj
+
+        # Uploads sem destinatário são gravados na raiz
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        return open(path, "wb")
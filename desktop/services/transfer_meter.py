@@ -0,0 +1,113 @@
+import io
+import threading
+import time
+from typing import BinaryIO, Callable
+
+# Intervalo mínimo entre amostras da vazão instantânea
+SAMPLE_INTERVAL = 0.5
+
+# Peso de cada nova amostra na média móvel exponencial da vazão
+EWMA_WEIGHT = 0.2
+
+class TransferMeter:
+    """
+    Mede os bytes efetivamente servidos em uma transferência: vazão instantânea e média
+    (EWMA), retransmissões, tempo decorrido e tempo restante estimado. É alimentado pela
+    thread do servidor TFTP e lido pela thread da interface.
+    """
+
+    def __init__(self, total_bytes: int, clock: Callable[[], float] = time.monotonic):
+        self.total_bytes = total_bytes
+        self._clock = clock
+        self._lock = threading.Lock()
+
+        self.bytes_sent = 0
+        self.retransmissions = 0
+        self.throughput = 0.0
+        self.average_throughput: float | None = None
+
+        self._started_at = clock()
+        self._sample_at = self._started_at
+        self._sample_bytes = 0
+
+    def add(self, size: int) -> None:
+        with self._lock:
+            self.bytes_sent += size
+            self._sample(self._clock())
+
+    def retransmitted(self, size: int) -> None:
+        with self._lock:
+            self.retransmissions += 1
+
+    def elapsed(self) -> float:
+        return self._clock() - self._started_at
+
+    def refresh(self) -> None:
+        # Sem novos bytes a vazão instantânea cai para zero após o intervalo de amostragem
+        with self._lock:
+            self._sample(self._clock())
+
+    def eta(self, target_estimate: float | None = None) -> float | None:
+        """
+        Tempo restante em segundos, pela vazão média; combinado com a estimativa do alvo
+        (EstimatedTime do LUS) quando ela é informada.
+        """
+        with self._lock:
+            remaining = max(0, self.total_bytes - self.bytes_sent)
+            local = remaining / self.average_throughput if self.average_throughput else None
+
+        if target_estimate is None or target_estimate <= 0:
+            return local
+        if local is None:
+            return float(target_estimate)
+        return (local + target_estimate) / 2
+
+    def _sample(self, now: float) -> None:
+        interval = now - self._sample_at
+        if interval < SAMPLE_INTERVAL:
+            return
+
+        self.throughput = (self.bytes_sent - self._sample_bytes) / interval
+        if self.average_throughput is None:
+            self.average_throughput = self.throughput
+        else:
+            self.average_throughput += EWMA_WEIGHT * (self.throughput - self.average_throughput)
+        self._sample_at = now
+        self._sample_bytes = self.bytes_sent
+
+class MeteredFile(io.RawIOBase):
+    """
+    Envolve o arquivo servido ao alvo, contando no TransferMeter os bytes lidos pelo
+    servidor TFTP e os blocos que ele retransmite.
+    """
+
+    def __init__(self, fileobj: BinaryIO, meter: TransferMeter):
+        super().__init__()
+        self._file = fileobj
+        self.meter = meter
+        self.name = getattr(fileobj, "name", None)
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return self._file.seekable()
+
+    def readinto(self, b) -> int:
+        read = self._file.readinto(b) or 0
+        self.meter.add(read)
+        return read
+
+    def seek(self, pos: int, whence: int = io.SEEK_SET) -> int:
+        return self._file.seek(pos, whence)
+
+    def tell(self) -> int:
+        return self._file.tell()
+
+    def retransmitted(self, size: int) -> None:
+        self.meter.retransmitted(size)
+
+    def close(self) -> None:
+        if not self.closed:
+            self._file.close()
+        super().close()
@@ -0,0 +1,101 @@
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, List
+
+from data.classes import TransferSessionStatus
+from data.enums import TransferSessionState
+from services.logging_service import LoggingService
+from services.transfer_session import TransferSession
+
+class TransferScheduler:
+    """
+    Executa sessões de transferência para vários alvos, no máximo max_parallel ao mesmo
+    tempo; as demais aguardam na fila. Expõe o progresso de cada alvo e o progresso
+    agregado de todas as sessões.
+    """
+
+    def __init__(self, max_parallel: int = 2, poll_interval: float = 0.5):
+        if max_parallel < 1:
+            raise ValueError(f"Invalid number of parallel transfers: {max_parallel}")
+
+        self.logging_service = LoggingService(TransferScheduler.__name__)
+        self.max_parallel = max_parallel
+        self.poll_interval = poll_interval
+        self._executor = ThreadPoolExecutor(max_workers=max_parallel, thread_name_prefix="transfer")
+        self._sessions: Dict[str, TransferSession] = {}
+        self._futures: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+
+    def submit(self, session: TransferSession) -> None:
+        with self._lock:
+            current = self._sessions.get(session.target_id)
+            if current is not None and not current.isFinished():
+                raise ValueError(f"A transfer to {session.target_id} is already scheduled")
+
+            self._sessions[session.target_id] = session
+            self._futures[session.target_id] = self._executor.submit(self._run, session)
+
+        self.logging_service.log(f"Transfer to {session.target_id} scheduled ({len(session.files)} files)")
+
+    def _run(self, session: TransferSession) -> None:
+        if not session.start():
+            self.logging_service.log(f"Transfer to {session.target_id} did not start: {session.state.value}")
+            return
+
+        while not session.isFinished():
+            session.poll()
+            if session.isFinished():
+                break
+            # Acorda antes do intervalo se a sessão for cancelada
+            session.waitCancelled(self.poll_interval)
+
+        self.logging_service.log(f"Transfer to {session.target_id} finished: {session.state.value}")
+
+    def cancel(self, target_id: str) -> None:
+        with self._lock:
+            session = self._sessions.get(target_id)
+        if session is not None:
+            session.cancel()
+
+    def cancelAll(self) -> None:
+        with self._lock:
+            sessions = list(self._sessions.values())
+        for session in sessions:
+            session.cancel()
+
+    def getProgress(self) -> List[TransferSessionStatus]:
+        with self._lock:
+            sessions = list(self._sessions.values())
+        return [session.snapshot() for session in sessions]
+
+    def getAggregateProgress(self) -> int:
+        """
+        Progresso de todas as sessões, ponderado pelo tamanho das imagens de cada uma.
+        Sessões encerradas sem sucesso contam como concluídas.
+        """
+        total = 0
+        done = 0.0
+        for status in self.getProgress():
+            size = sum(f.sizeBytes for f in status.fileRecords) or 1
+            total += size
+            if status.state in (TransferSessionState.FAILED, TransferSessionState.CANCELLED):
+                done += size
+            else:
+                done += size * status.progressPercent / 100
+        return int(100 * done / total) if total else 0
+
+    def clearFinished(self) -> None:
+        with self._lock:
+            for target_id in [t for t, s in self._sessions.items() if s.isFinished()]:
+                del self._sessions[target_id]
+                del self._futures[target_id]
+
+    def wait(self, timeout: float | None = None) -> None:
+        with self._lock:
+            futures = list(self._futures.values())
+        for future in futures:
+            future.result(timeout)
+
+    def shutdown(self) -> None:
+        self.cancelAll()
+        self._executor.shutdown(wait=True)
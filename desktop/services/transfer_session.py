@@ -0,0 +1,140 @@
+import threading
+
+from data.classes import FileRecord, TransferSessionStatus, TransferStatus
+from data.enums import ArincTransferResult, TransferSessionState
+from interfaces.connection_transport import IConnectionTransport
+from services.arinc_module import ArincModule
+from services.connection_service import ConnectionService
+from services.file_tranfer_service import FileTransferService
+from services.file_validator_service import FileValidatorService
+from services.logging_service import LoggingService
+
+class TransferSession:
+    """
+    Transferência de uma lista de carga para um único alvo. Cada sessão tem o seu próprio
+    FileTransferService (e portanto a sua conexão e módulo ARINC), de modo que várias
+    sessões podem rodar ao mesmo tempo; o servidor TFTP de cada interface é compartilhado.
+    """
+
+    def __init__(
+        self,
+        target_id: str,
+        file_transfer_service: FileTransferService,
+        files: list[FileRecord],
+        password: str | None = None,
+    ):
+        self.logging_service = LoggingService(TransferSession.__name__)
+        self.target_id = target_id
+        self.file_transfer_service = file_transfer_service
+        self.files = list(files)
+        self.password = password
+
+        self.state = TransferSessionState.QUEUED
+        self.last_status: TransferStatus | None = None
+        self.error: Exception | None = None
+        self._cancelled = threading.Event()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def forTransport(
+        cls,
+        target_id: str,
+        transport: IConnectionTransport,
+        file_validator: FileValidatorService,
+        base_path: str,
+        files: list[FileRecord],
+        password: str | None = None,
+        server_address: str = "",
+        server_port: int = 6969,
+    ) -> "TransferSession":
+        """
+        Monta uma sessão com conexão e módulo ARINC próprios. server_address deve ser o
+        endereço local da interface pela qual o alvo é alcançado, e os arquivos da sessão
+        ficam em base_path/sessions/<alvo>.
+        """
+        connection_service = ConnectionService(transport, test_mode=False)
+        arinc_module = ArincModule(
+            connection_service,
+            f"{base_path}/sessions/{target_id}",
+            server_address=server_address,
+            server_port=server_port,
+        )
+        file_transfer_service = FileTransferService(file_validator, connection_service, arinc_module)
+        return cls(target_id, file_transfer_service, files, password)
+
+    def isFinished(self) -> bool:
+        return self.state in (
+            TransferSessionState.SUCCESS, TransferSessionState.FAILED, TransferSessionState.CANCELLED
+        )
+
+    def start(self) -> bool:
+        with self._lock:
+            if self._cancelled.is_set():
+                self.state = TransferSessionState.CANCELLED
+                return False
+            self.state = TransferSessionState.RUNNING
+
+        try:
+            connection_service = self.file_transfer_service.connection_service
+            if not connection_service.isConnected():
+                connection_service.connect(self.target_id, self.password)
+            started = self.file_transfer_service.startTransfer(self.files)
+        except Exception as e:
+            self.logging_service.error(f"Session {self.target_id}: could not start transfer", e)
+            self.error = e
+            started = False
+
+        if not started:
+            self.state = TransferSessionState.FAILED
+        return started
+
+    def poll(self) -> TransferStatus | None:
+        """
+        Atualiza o status da sessão a partir do módulo de transferência.
+        """
+        if self.state != TransferSessionState.RUNNING:
+            return self.last_status
+
+        try:
+            status = self.file_transfer_service.getProgress()
+        except Exception as e:
+            self.logging_service.error(f"Session {self.target_id}: could not read progress", e)
+            self.error = e
+            self.state = TransferSessionState.FAILED
+            return self.last_status
+
+        self.last_status = status
+        if status.transferResult == ArincTransferResult.SUCCESS:
+            self.state = TransferSessionState.SUCCESS
+        elif status.transferResult == ArincTransferResult.FAILED:
+            self.state = TransferSessionState.CANCELLED if self._cancelled.is_set() else TransferSessionState.FAILED
+        return status
+
+    def waitCancelled(self, timeout: float) -> bool:
+        return self._cancelled.wait(timeout)
+
+    def cancel(self) -> None:
+        with self._lock:
+            self._cancelled.set()
+            if self.state == TransferSessionState.QUEUED:
+                self.state = TransferSessionState.CANCELLED
+                return
+
+        if self.state == TransferSessionState.RUNNING:
+            self.file_transfer_service.cancel()
+
+    def snapshot(self) -> TransferSessionStatus:
+        status = self.last_status
+        if self.state == TransferSessionState.SUCCESS:
+            progress = 100
+        else:
+            progress = status.progressPercent if status is not None else 0
+
+        return TransferSessionStatus(
+            targetId=self.target_id,
+            state=self.state,
+            fileRecords=list(self.files),
+            progressPercent=progress,
+            transferStatus=status,
+            error=self.error,
+        )
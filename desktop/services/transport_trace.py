@@ -0,0 +1,294 @@
+import base64
+import gzip
+import json
+import os
+import threading
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, List, TextIO
+
+from data.classes import Connection, Package, Request, Response, TraceEvent
+from data.errors import TftpError, TraceReplayError
+from interfaces.connection_transport import IConnectionTransport
+from services.logging_service import LoggingService
+from services.tftp_router import TftpRouter
+from tftp.packets import ACK, BLOCK_MODULUS, DATA, DEFAULT_BLOCK_SIZE, ERROR, OACK, RRQ, WRQ, decode
+from tftp.transfer import Address
+
+TRACE_VERSION = 1
+
+# Conteúdo de pacotes e arquivos maiores que isso não é gravado, só o tamanho
+MAX_CAPTURED_BYTES = 64 * 1024
+
+# Chamadas de transporte que marcam o andamento da sessão; as sessões TFTP abertas pelo
+# alvo são reproduzidas a partir da última delas
+TRANSPORT_CALLS = ("scan", "connect", "disconnect", "sendPackage", "receivePackage")
+
+def encodeBytes(data: bytes) -> str:
+    return base64.b64encode(data).decode("ascii")
+
+def decodeBytes(text: str) -> bytes:
+    return base64.b64decode(text)
+
+def _open_trace(path: str, mode: str) -> TextIO:
+    if path.endswith(".gz"):
+        return gzip.open(path, mode, encoding="utf-8")
+    return open(path, mode, encoding="utf-8")
+
+def readTrace(path: str) -> List[TraceEvent]:
+    """
+    Eventos de um trace gravado por TransportRecorder, em ordem de tempo.
+    """
+    events = []
+    with _open_trace(path, "rt") as f:
+        try:
+            header = json.loads(f.readline())
+        except ValueError:
+            header = None
+        if not isinstance(header, dict) or header.get("trace") != TRACE_VERSION:
+            raise TraceReplayError(f"Not a version {TRACE_VERSION} transport trace: {path}")
+
+        for line in f:
+            if not line.strip():
+                continue
+            fields = json.loads(line)
+            events.append(TraceEvent(fields.pop("t"), fields.pop("kind"), fields))
+
+    events.sort(key=lambda event: event.time)
+    return events
+
+def _peer(addr: Address) -> str:
+    return f"{addr[0]}:{addr[1]}"
+
+def _captured(data: bytes) -> Dict[str, Any]:
+    fields: Dict[str, Any] = {"size": len(data)}
+    if len(data) <= MAX_CAPTURED_BYTES:
+        fields["data"] = encodeBytes(data)
+    return fields
+
+class _Session:
+    """
+    Sessão TFTP aberta por um par com o servidor, acompanhada pelos pacotes trocados.
+    """
+
+    def __init__(self, request: bytes, opcode: int, filename: str, options: dict, started: float):
+        self.request = request
+        self.opcode = opcode
+        self.filename = filename
+        self.options = options
+        self.started = started
+        self.blockSize = DEFAULT_BLOCK_SIZE
+        self.size = 0
+        self.last_block = 0
+        self.final_block: int | None = None
+        # Conteúdo dos uploads, enquanto não passa de MAX_CAPTURED_BYTES
+        self.chunks: List[bytes] | None = [] if opcode == WRQ else None
+
+    def newBlock(self, block: int) -> bool:
+        # Blocos até meia volta à frente do último são novos (números de 16 bits)
+        if 0 < (block - self.last_block) % BLOCK_MODULUS < BLOCK_MODULUS // 2:
+            self.last_block = block
+            return True
+        return False
+
+class TransportRecorder:
+    """
+    Grava um trace de sessão de carga em JSON Lines (com gzip se o nome termina em
+    .gz): um cabeçalho e um evento por linha, com o instante em segundos desde o início
+    da gravação. Grava as chamadas de transporte (via RecordingTransport), os pacotes
+    TFTP do servidor do carregador (via attach) e um resumo de cada sessão TFTP aberta
+    pelo alvo, com o conteúdo dos arquivos enviados por ele (LUS). Pode ser usado de
+    várias threads.
+    """
+
+    def __init__(self, path: str):
+        self.logging_service = LoggingService(TransportRecorder.__name__)
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._file: TextIO | None = _open_trace(path, "wt")
+        self._started = time.monotonic()
+        self._routers: List[TftpRouter] = []
+        self._sessions: Dict[Address, _Session] = {}
+
+        self._write({"trace": TRACE_VERSION, "startedAt": datetime.now().isoformat()}, flush=True)
+        self.logging_service.log(f"Recording transport trace to {path}")
+
+    def now(self) -> float:
+        return time.monotonic() - self._started
+
+    def record(self, kind: str, at: float | None = None, **fields) -> None:
+        event = {"t": round(self.now() if at is None else at, 6), "kind": kind, **fields}
+        # Pacotes ficam no buffer; os demais eventos vão para o disco na hora
+        self._write(event, flush=kind != "tftp")
+
+    def attach(self, router: TftpRouter) -> None:
+        router.setTap(self.tftpPacket)
+        self._routers.append(router)
+
+    def close(self) -> None:
+        for router in self._routers:
+            router.setTap(None)
+        self._routers = []
+
+        for addr in list(self._sessions):
+            self._end_session(addr, complete=False)
+
+        with self._lock:
+            file, self._file = self._file, None
+        if file is not None:
+            file.close()
+
+    def _write(self, event: dict, flush: bool) -> None:
+        line = json.dumps(event, separators=(",", ":"), default=str)
+        with self._lock:
+            if self._file is None:
+                return
+            self._file.write(line + "\n")
+            if flush:
+                self._file.flush()
+
+    def tftpPacket(self, direction: str, addr: Address, data: bytes) -> None:
+        """
+        Observador de pacotes do TftpRouter (chamado no event loop do TftpEngine).
+        Blocos DATA são gravados só com número e tamanho.
+        """
+        now = self.now()
+        try:
+            packet = decode(data)
+        except TftpError:
+            self.record("tftp", now, dir=direction, peer=_peer(addr), raw=encodeBytes(data))
+            return
+
+        opcode = packet[0]
+        if opcode == DATA:
+            self.record("tftp", now, dir=direction, peer=_peer(addr), op=opcode, block=packet[1], size=len(packet[2]))
+        elif opcode == ACK:
+            self.record("tftp", now, dir=direction, peer=_peer(addr), op=opcode, block=packet[1])
+        else:
+            self.record("tftp", now, dir=direction, peer=_peer(addr), op=opcode, raw=encodeBytes(data[:MAX_CAPTURED_BYTES]))
+
+        try:
+            self._track(direction, addr, packet, data, now)
+        except Exception as e:
+            self.logging_service.error(f"Could not track TFTP session with {_peer(addr)}", e)
+
+    def _track(self, direction: str, addr: Address, packet: tuple, data: bytes, now: float) -> None:
+        opcode = packet[0]
+        session = self._sessions.get(addr)
+
+        if opcode in (RRQ, WRQ):
+            if direction != "in" or (session is not None and session.request == data):
+                # Pedido retransmitido: a sessão já está em andamento
+                return
+            if session is not None:
+                self._end_session(addr, complete=False)
+            _, filename, _, options = packet
+            self._sessions[addr] = _Session(data, opcode, filename, options, now)
+            return
+
+        if session is None:
+            return
+
+        if opcode == OACK and direction == "out":
+            session.blockSize = int(packet[1].get("blksize", DEFAULT_BLOCK_SIZE))
+        elif opcode == ERROR:
+            self._end_session(addr, complete=False, error=f"{packet[1]}: {packet[2]}")
+        elif opcode == DATA and direction == ("out" if session.opcode == RRQ else "in"):
+            payload = packet[2]
+            if not session.newBlock(packet[1]):
+                return
+            session.size += len(payload)
+            if session.chunks is not None:
+                session.chunks.append(payload)
+                if session.size > MAX_CAPTURED_BYTES:
+                    session.chunks = None
+            if len(payload) < session.blockSize:
+                session.final_block = packet[1]
+                if session.opcode == WRQ:
+                    self._end_session(addr, complete=True)
+        elif opcode == ACK and direction == "in" and session.opcode == RRQ and packet[1] == session.final_block:
+            self._end_session(addr, complete=True)
+
+    def _end_session(self, addr: Address, complete: bool, error: str | None = None) -> None:
+        session = self._sessions.pop(addr)
+        fields: Dict[str, Any] = {
+            "peer": _peer(addr),
+            "op": session.opcode,
+            "file": session.filename,
+            "options": session.options,
+            "size": session.size,
+            "duration": round(self.now() - session.started, 6),
+            "complete": complete,
+        }
+        if session.chunks is not None:
+            fields["data"] = encodeBytes(b"".join(session.chunks))
+        if error is not None:
+            fields["error"] = error
+        self.record("session", session.started, **fields)
+
+class RecordingTransport(IConnectionTransport):
+    """
+    Transporte que repassa as chamadas para transport e grava cada uma no trace de
+    recorder, com o resultado (ou o erro) e a duração. Senhas não são gravadas.
+    """
+
+    def __init__(self, transport: IConnectionTransport, recorder: TransportRecorder):
+        self.transport = transport
+        self.recorder = recorder
+
+    def _call(self, kind: str, fields: dict, call: Callable[[], Any], result_fields: Callable[[Any], dict]) -> Any:
+        started = self.recorder.now()
+        try:
+            result = call()
+        except Exception as e:
+            self.recorder.record(
+                kind, started, duration=round(self.recorder.now() - started, 6),
+                error=type(e).__name__, message=str(e), **fields,
+            )
+            raise
+        self.recorder.record(kind, started, duration=round(self.recorder.now() - started, 6), **fields, **result_fields(result))
+        return result
+
+    def scan(self) -> List[dict]:
+        return self._call("scan", {}, self.transport.scan, lambda networks: {"networks": networks})
+
+    def connect(self, target: str, password: str | None = None) -> Connection:
+        return self._call(
+            "connect", {"target": target}, lambda: self.transport.connect(target, password),
+            lambda connection: {"device": connection.device, "address": connection.address},
+        )
+
+    def disconnect(self) -> None:
+        self._call("disconnect", {}, self.transport.disconnect, lambda _: {})
+
+    def sendPackage(self, pkg: Package) -> None:
+        self._call("sendPackage", {"name": pkg.name, **self._package_fields(pkg)}, lambda: self.transport.sendPackage(pkg), lambda _: {})
+
+    def receivePackage(self, file_name: str, in_memory: bool = False) -> Package:
+        return self._call(
+            "receivePackage", {"name": file_name, "inMemory": in_memory},
+            lambda: self.transport.receivePackage(file_name, in_memory), self._package_fields,
+        )
+
+    def sendRequest(self, req: Request, target: str, timeout: int) -> Response:
+        return self._call(
+            "request", {"command": req.command, "target": target, "timeout": timeout},
+            lambda: self.transport.sendRequest(req, target, timeout),
+            lambda response: {"status": response.status, "data": response.data},
+        )
+
+    def _package_fields(self, pkg: Package) -> dict:
+        if pkg.data is not None:
+            return _captured(bytes(pkg.data))
+        try:
+            size = os.path.getsize(pkg.path)
+            if size > MAX_CAPTURED_BYTES:
+                return {"size": size}
+            with open(pkg.path, "rb") as f:
+                return _captured(f.read())
+        except OSError:
+            return {}
@@ -0,0 +1,93 @@
+import json
+import os
+import threading
+from collections import OrderedDict
+
+from data.classes import IntegrityVerdict
+from services.logging_service import LoggingService
+
+class VerificationCache:
+    """
+    Cache persistente de resultados de verificação de integridade, indexado pela identidade
+    do arquivo no sistema de arquivos (device, inode, size, mtime_ns, ctime_ns). Qualquer
+    alteração no arquivo muda a chave, então uma entrada só é reaproveitada enquanto o
+    arquivo comprovadamente não mudou. Entradas antigas são descartadas em ordem LRU.
+    """
+
+    def __init__(self, store_path: str, max_entries: int = 1024):
+        self.logging_service = LoggingService(VerificationCache.__name__)
+        self.store_path = store_path
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, IntegrityVerdict] = OrderedDict()
+        self._lock = threading.Lock()
+
+        store_dir = os.path.dirname(self.store_path)
+        if store_dir and not os.path.exists(store_dir):
+            os.makedirs(store_dir)
+
+        self._load()
+
+    @staticmethod
+    def keyFor(st: os.stat_result) -> str:
+        return f"{st.st_dev}:{st.st_ino}:{st.st_size}:{st.st_mtime_ns}:{st.st_ctime_ns}"
+
+    def get(self, key: str) -> IntegrityVerdict | None:
+        with self._lock:
+            verdict = self._entries.get(key)
+            if verdict is not None:
+                self._entries.move_to_end(key)
+            return verdict
+
+    def put(self, key: str, verdict: IntegrityVerdict) -> None:
+        with self._lock:
+            self._entries[key] = verdict
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            self._save()
+
+    def invalidate(self, key: str) -> None:
+        with self._lock:
+            if self._entries.pop(key, None) is not None:
+                self._save()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._save()
+
+    def _load(self) -> None:
+        if not os.path.exists(self.store_path):
+            return
+
+        try:
+            with open(self.store_path, 'r') as f:
+                # Entradas são gravadas da menos para a mais recentemente usada
+                for key, values in json.load(f):
+                    self._entries[key] = IntegrityVerdict(**values)
+        except Exception as e:
+            # Um cache corrompido apenas força uma nova verificação
+            self.logging_service.error(f"Could not load verification cache {self.store_path}", e)
+            self._entries.clear()
+
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _save(self) -> None:
+        content = [
+            [key, {
+                "calculatedHash": v.calculatedHash,
+                "extractedHash": v.extractedHash,
+                "dataSize": v.dataSize,
+                "isValid": v.isValid,
+            }]
+            for key, v in self._entries.items()
+        ]
+
+        tmp_path = f"{self.store_path}.tmp"
+        try:
+            with open(tmp_path, 'w') as f:
+                json.dump(content, f)
+            os.replace(tmp_path, self.store_path)
+        except Exception as e:
+            self.logging_service.error(f"Could not persist verification cache {self.store_path}", e)
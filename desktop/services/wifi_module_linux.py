@@ -1,17 +1,20 @@
+import io
 from typing import List
 import time
 import traceback
-from tftpy import TftpClient
 
 import subprocess, os, re
 
-from data.classes import Connection, Package, Request, Response
+from data.classes import Connection, Package, Request, Response, TftpOptions
 from data.errors import RequestTimeoutError, ConnectionAuthenticationError
 from interfaces.connection_transport import IConnectionTransport
+from services.tftp_client import TftpTransferClient
 
 class WifiModuleLinux(IConnectionTransport):
     _PASSWORD = "bcappassword"
-    _tftp_client: TftpClient | None = None
+    _tftp_client: TftpTransferClient | None = None
+    # Opções TFTP pedidas ao alvo, com fallback para TFTP básico se recusadas
+    tftp_options: TftpOptions = TftpOptions()
     # _interface: str | None = None
 
     # def __init__(self):
@@ -200,7 +203,7 @@ class WifiModuleLinux(IConnectionTransport):
             print(f"Successfully connected to {target} (via NMCLI).")
             try:
                 ip = self._get_target_ip()
-                self._tftp_client = TftpClient(ip, 69)
+                self._tftp_client = TftpTransferClient(ip, 69, self.tftp_options)
                 return Connection(
                     device=target,
                     hardwarePN="",
@@ -227,12 +230,18 @@ class WifiModuleLinux(IConnectionTransport):
         if (self._tftp_client is None):
             raise Exception("Not connected")
         
-        self._tftp_client.upload(pkg.name, pkg.path, timeout=60, retries=3)
+        source = io.BytesIO(pkg.data) if pkg.data is not None else pkg.path
+        self._tftp_client.upload(pkg.name, source, timeout=60, retries=3)
     
     # [BST-226] - Unchanged logic
-    def receivePackage(self, file_name: str) -> Package:
+    def receivePackage(self, file_name: str, in_memory: bool = False) -> Package:
         if (self._tftp_client is None):
             raise Exception("Not connected")
+
+        if in_memory:
+            buffer = io.BytesIO()
+            self._tftp_client.download(file_name, buffer, timeout=60, retries=3)
+            return Package(file_name, "", buffer.getvalue())
         
         file_path = f'file_directory/tftp/client/{int(time.time())}-{file_name}'
         # Ensure directory exists
@@ -0,0 +1,102 @@
+import struct
+
+import pytest
+
+from arinc615a import decode, encode
+from arinc615a.benchmark import SAMPLES
+from data.classes import ArincLUH, ArincLUI, ArincLUR, ArincLURHeaderFile, ArincLUS, ArincLUSHeaderFile
+from data.enums import ArincFileType, LoadProtocolStatusCode
+from data.errors import ArincCodecError
+
+
+def _legacy_string(text: str) -> bytes:
+    return bytes([len(text) + 1]) + text.encode("ascii") + b"\0"
+
+def _legacy_LUR(lur: ArincLUR) -> bytes:
+    # Encoder anterior ao codec (ArincModule._encode_LUR_file): comprimento em bits
+    body = bytearray(b"A4")
+    body += len(lur.HeaderFiles).to_bytes(2, "big")
+    for hf in lur.HeaderFiles:
+        body += _legacy_string(hf.FileName)
+        body += _legacy_string(hf.PartNumberName)
+    return (32 + len(body) * 8).to_bytes(4, "big") + bytes(body)
+
+def _legacy_LUH(luh: ArincLUH) -> bytes:
+    # Encoder anterior ao codec (ArincModule._encode_LUH_file)
+    body = bytearray(b"A4")
+    body += _legacy_string(luh.SoftwarePartNumber)
+    body += _legacy_string(luh.HardwarePartNumber)
+    body += _legacy_string(luh.DataHash)
+    return (32 + len(body) * 8).to_bytes(4, "big") + bytes(body)
+
+# LUI como gerado por loadUploadingInitialization no firmware: comprimento de 1 byte,
+# descrição sem NUL e comprimento do arquivo em bytes
+FIRMWARE_LUI = (
+    struct.pack(">I", 4 + 2 + 2 + 1 + 18) + b"A4" + b"\x00\x01" + bytes([18]) + b"Operation accepted"
+)
+
+# LUS como gerado por sendStatusToClient no firmware: cada texto é seguido de um NUL
+# que não entra no byte de comprimento
+_FIRMWARE_LUS_BODY = (
+    b"A4"
+    + b"\x00\x02"
+    + bytes([9]) + b"Receiving\0"
+    + struct.pack(">HHH", 7, 30, 0)
+    + b"000"
+    + struct.pack(">H", 1)
+    + bytes([14]) + b"EMB-SW-001.LUH\0"
+    + bytes([10]) + b"EMB-SW-001\0"
+    + b"000"
+    + b"\x00\x02"
+    + bytes([9]) + b"Receiving\0"
+)
+FIRMWARE_LUS = struct.pack(">I", 4 + len(_FIRMWARE_LUS_BODY)) + _FIRMWARE_LUS_BODY
+
+
+@pytest.mark.parametrize("message", SAMPLES, ids=lambda m: m.FileType.value)
+def test_round_trip(message):
+    assert decode(message.FileType, encode(message)) == message
+
+def test_samples_cover_every_file_type():
+    assert {message.FileType for message in SAMPLES} == set(ArincFileType)
+
+def test_decode_firmware_LUI():
+    assert decode(ArincFileType.LUI, FIRMWARE_LUI) == ArincLUI(LoadProtocolStatusCode.ACCEPTED, "Operation accepted")
+
+def test_encode_LUI_matches_firmware():
+    assert encode(ArincLUI(LoadProtocolStatusCode.ACCEPTED, "Operation accepted")) == FIRMWARE_LUI
+
+def test_decode_firmware_LUS():
+    in_progress = LoadProtocolStatusCode.IN_PROGRESS
+    assert decode(ArincFileType.LUS, FIRMWARE_LUS) == ArincLUS(
+        in_progress, "Receiving", 7, 30, 0, 0,
+        [ArincLUSHeaderFile("EMB-SW-001.LUH", "EMB-SW-001", 0, in_progress, "Receiving")],
+    )
+
+def test_encode_LUS_matches_firmware():
+    assert encode(decode(ArincFileType.LUS, FIRMWARE_LUS)) == FIRMWARE_LUS
+
+def test_LUR_matches_legacy_encoder():
+    lur = ArincLUR([ArincLURHeaderFile(f"EMB-SW-00{i}.LUH", f"EMB-SW-00{i}") for i in range(3)])
+    assert encode(lur) == _legacy_LUR(lur)
+
+def test_LUH_matches_legacy_encoder():
+    luh = ArincLUH("EMB-SW-007-137-045", "EMB-HW-002-021-003", "ab" * 32)
+    assert encode(luh) == _legacy_LUH(luh)
+
+@pytest.mark.parametrize("message", SAMPLES, ids=lambda m: m.FileType.value)
+def test_truncated_input_raises(message):
+    data = encode(message)
+    for length in range(len(data)):
+        with pytest.raises(ArincCodecError):
+            decode(message.FileType, data[:length])
+
+def test_length_mismatch_raises():
+    with pytest.raises(ArincCodecError):
+        decode(ArincFileType.LUI, FIRMWARE_LUI + b"\0")
+
+def test_unknown_status_code_raises():
+    data = bytearray(FIRMWARE_LUI)
+    data[6:8] = b"\x12\x34"
+    with pytest.raises(ArincCodecError):
+        decode(ArincFileType.LUI, bytes(data))
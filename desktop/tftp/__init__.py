@@ -0,0 +1,5 @@
+from tftp.client import AsyncTftpClient
+from tftp.engine import TftpEngine
+from tftp.rtt import RttEstimator
+from tftp.server import AsyncTftpServer
+from tftp.streams import AsyncSink, AsyncSource
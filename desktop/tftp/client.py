@@ -0,0 +1,233 @@
+import asyncio
+import socket
+from typing import BinaryIO, Callable, Tuple
+
+from data.classes import RttEstimate, TftpOptions
+from data.errors import TftpError, TftpOptionsRefusedError, TftpTimeoutError
+from services.logging_service import LoggingService
+from tftp.packets import (
+    ACK,
+    DATA,
+    DEFAULT_BLOCK_SIZE,
+    ERR_ILLEGAL_OPERATION,
+    ERROR,
+    OACK,
+    RRQ,
+    WRQ,
+    Options,
+    encodeAck,
+    encodeError,
+    encodeRequest,
+)
+from tftp.rtt import RttEstimator
+from tftp.streams import AsyncSink, AsyncSource, asSink, asSource
+from tftp.transfer import (
+    Channel,
+    TransferParams,
+    checkOack,
+    closeChannel,
+    isOptionsRefusal,
+    raiseFromError,
+    receiveFile,
+    refuse,
+    sendFile,
+)
+
+class AsyncTftpClient:
+    """
+    Cliente TFTP sobre asyncio. Pede as opções de TftpOptions ao servidor; se o servidor
+    recusar as opções, a transferência é repetida sem elas e o servidor passa a ser
+    tratado como TFTP básico. Servidores que ignoram as opções (respondem direto com
+    DATA ou ACK 0) seguem com os valores padrão.
+
+    Com adaptive_timeout, as retransmissões seguem o RTT medido (o timeout de cada
+    transferência passa a ser o maior RTO), partindo da estimativa da transferência
+    anterior.
+    """
+
+    def __init__(
+        self,
+        host: str,
+        port: int = 69,
+        options: TftpOptions | None = None,
+        bind_address: str = "",
+        adaptive_timeout: bool = True,
+    ):
+        self.logging_service = LoggingService(AsyncTftpClient.__name__)
+        self.host = host
+        self.port = port
+        self.options = options or TftpOptions()
+        # Endereço local de origem dos pedidos; vazio deixa a escolha para o sistema
+        self.bind_address = bind_address
+        self.options_refused = False
+        # Parâmetros efetivamente usados na última transferência
+        self.lastBlockSize = DEFAULT_BLOCK_SIZE
+        self.lastWindowSize = 1
+        self.adaptive_timeout = adaptive_timeout
+        # Estimador de RTT da última transferência
+        self.rtt: RttEstimator | None = None
+
+    def rttEstimate(self) -> RttEstimate | None:
+        return self.rtt.estimate() if self.rtt is not None else None
+
+    def _estimator(self, timeout: float) -> RttEstimator | None:
+        if not self.adaptive_timeout:
+            return None
+        self.rtt = RttEstimator.following(self.rtt, timeout)
+        return self.rtt
+
+    def _requested(self, size: int | None) -> Options:
+        if self.options_refused:
+            return {}
+
+        options: Options = {}
+        if self.options.blockSize:
+            options["blksize"] = str(self.options.blockSize)
+        if self.options.windowSize and self.options.windowSize > 1:
+            options["windowsize"] = str(self.options.windowSize)
+        if self.options.transferSize:
+            # No download o tamanho é informado pelo servidor no OACK
+            options["tsize"] = str(size if size is not None else 0)
+        return options
+
+    async def _open_channel(self) -> Tuple[Channel, Tuple[str, int]]:
+        loop = asyncio.get_running_loop()
+        infos = await loop.getaddrinfo(self.host, self.port, family=socket.AF_INET, type=socket.SOCK_DGRAM)
+        server = infos[0][4]
+        return await Channel.open((self.bind_address or "0.0.0.0", 0), peer_host=server[0]), server
+
+    async def _request(self, channel: Channel, server: Tuple[str, int], request: bytes, params: TransferParams) -> Tuple:
+        # Repete o pedido até a primeira resposta, que fixa a porta (TID) do servidor
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        retransmitted = False
+        while True:
+            sent_at = loop.time()
+            channel.send(request, server)
+            try:
+                packet, addr = await channel.receive(sent_at + params.waitTime())
+            except TftpTimeoutError:
+                if params.expired(started):
+                    raise TftpTimeoutError(f"No answer from {self.host}:{self.port}") from None
+                params.backoff()
+                retransmitted = True
+                continue
+            if not retransmitted:
+                params.sample(loop.time() - sent_at)
+            channel.lockPeer(addr)
+            return packet
+
+    def _negotiated(self, channel: Channel, requested: Options, offered: Options) -> Options:
+        try:
+            return checkOack(requested, offered)
+        except TftpOptionsRefusedError as e:
+            refuse(channel, str(e))
+            raise
+
+    async def _with_fallback(self, transfer, size: int | None) -> int:
+        options = self._requested(size)
+        try:
+            return await transfer(options)
+        except TftpOptionsRefusedError as e:
+            if not options:
+                raise
+            # Nenhum dado foi trocado antes da negociação, então basta repetir o pedido
+            self.logging_service.error(f"Server {self.host} refused TFTP options {options}, retrying without them", e)
+            self.options_refused = True
+            return await transfer({})
+
+    async def download(
+        self,
+        filename: str,
+        output: str | BinaryIO | AsyncSink,
+        timeout: float = 5.0,
+        retries: int = 3,
+        on_block: Callable[[int, int], None] | None = None,
+    ) -> int:
+        """
+        Baixa filename para output. on_block(número absoluto do bloco, tamanho) é chamado
+        a cada bloco recebido em ordem.
+        """
+        sink = asSink(output)
+        try:
+            return await self._with_fallback(
+                lambda options: self._download(filename, sink, options, timeout, retries, on_block), None
+            )
+        finally:
+            await sink.close()
+
+    async def _download(
+        self,
+        filename: str,
+        sink: AsyncSink,
+        options: Options,
+        timeout: float,
+        retries: int,
+        on_block: Callable[[int, int], None] | None,
+    ) -> int:
+        channel, server = await self._open_channel()
+        rtt = self._estimator(timeout)
+        try:
+            request = encodeRequest(RRQ, filename, options)
+            packet = await self._request(channel, server, request, TransferParams({}, timeout, retries, rtt))
+
+            if packet[0] == ERROR:
+                if options and isOptionsRefusal(packet):
+                    raise TftpOptionsRefusedError(f"Server refused options: {packet[2]}")
+                raiseFromError(packet)
+
+            first = None
+            if packet[0] == OACK:
+                negotiated = self._negotiated(channel, options, packet[1])
+                resend = encodeAck(0)
+                channel.send(resend)
+            elif packet[0] == DATA:
+                # Servidor ignorou as opções
+                negotiated = {}
+                resend = request
+                first = packet
+            else:
+                channel.send(encodeError(ERR_ILLEGAL_OPERATION, "Unexpected packet"))
+                raise TftpError(f"Unexpected answer to RRQ: opcode {packet[0]}")
+
+            params = TransferParams(negotiated, timeout, retries, rtt)
+            self.lastBlockSize, self.lastWindowSize = params.blockSize, params.windowSize
+            return await receiveFile(channel, sink, params, resend, first, on_block)
+        finally:
+            closeChannel(channel)
+
+    async def upload(self, filename: str, source: str | bytes | BinaryIO | AsyncSource, timeout: float = 5.0, retries: int = 3) -> int:
+        source = asSource(source)
+        try:
+            return await self._with_fallback(
+                lambda options: self._upload(filename, source, options, timeout, retries), source.size()
+            )
+        finally:
+            await source.close()
+
+    async def _upload(self, filename: str, source: AsyncSource, options: Options, timeout: float, retries: int) -> int:
+        channel, server = await self._open_channel()
+        rtt = self._estimator(timeout)
+        try:
+            request = encodeRequest(WRQ, filename, options)
+            packet = await self._request(channel, server, request, TransferParams({}, timeout, retries, rtt))
+
+            if packet[0] == ERROR:
+                if options and isOptionsRefusal(packet):
+                    raise TftpOptionsRefusedError(f"Server refused options: {packet[2]}")
+                raiseFromError(packet)
+
+            if packet[0] == OACK:
+                negotiated = self._negotiated(channel, options, packet[1])
+            elif packet[0] == ACK and packet[1] == 0:
+                # Servidor ignorou as opções
+                negotiated = {}
+            else:
+                channel.send(encodeError(ERR_ILLEGAL_OPERATION, "Unexpected packet"))
+                raise TftpError(f"Unexpected answer to WRQ: opcode {packet[0]}")
+
+            params = TransferParams(negotiated, timeout, retries, rtt)
+            self.lastBlockSize, self.lastWindowSize = params.blockSize, params.windowSize
+            return await sendFile(channel, source, params)
+        finally:
+            closeChannel(channel)
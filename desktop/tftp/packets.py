@@ -0,0 +1,100 @@
+import struct
+from typing import Dict, Tuple
+
+from data.errors import TftpError
+
+# Opcodes (RFC 1350 e RFC 2347)
+RRQ = 1
+WRQ = 2
+DATA = 3
+ACK = 4
+ERROR = 5
+OACK = 6
+
+# Códigos de erro
+ERR_UNDEFINED = 0
+ERR_FILE_NOT_FOUND = 1
+ERR_ACCESS_VIOLATION = 2
+ERR_DISK_FULL = 3
+ERR_ILLEGAL_OPERATION = 4
+ERR_UNKNOWN_TID = 5
+ERR_FILE_EXISTS = 6
+ERR_NO_SUCH_USER = 7
+ERR_OPTIONS = 8
+
+DEFAULT_BLOCK_SIZE = 512
+MIN_BLOCK_SIZE = 8
+MAX_BLOCK_SIZE = 65464
+MAX_WINDOW_SIZE = 65535
+
+# Números de bloco têm 16 bits; depois de 65535 o próximo bloco é o 0
+BLOCK_MODULUS = 1 << 16
+
+_OPCODE = struct.Struct(">H")
+_OPCODE_BLOCK = struct.Struct(">HH")
+
+Options = Dict[str, str]
+
+def encodeRequest(opcode: int, filename: str, options: Options | None = None, mode: str = "octet") -> bytes:
+    fields = [filename, mode]
+    for name, value in (options or {}).items():
+        fields += [name, str(value)]
+    return _OPCODE.pack(opcode) + b"".join(f.encode("ascii") + b"\0" for f in fields)
+
+def encodeData(block: int, payload: bytes) -> bytes:
+    return _OPCODE_BLOCK.pack(DATA, block % BLOCK_MODULUS) + payload
+
+def encodeAck(block: int) -> bytes:
+    return _OPCODE_BLOCK.pack(ACK, block % BLOCK_MODULUS)
+
+def encodeError(code: int, message: str) -> bytes:
+    return _OPCODE_BLOCK.pack(ERROR, code) + message.encode("ascii", "replace") + b"\0"
+
+def encodeOack(options: Options) -> bytes:
+    fields = []
+    for name, value in options.items():
+        fields += [name, str(value)]
+    return _OPCODE.pack(OACK) + b"".join(f.encode("ascii") + b"\0" for f in fields)
+
+def _strings(data: bytes) -> list[str]:
+    if not data.endswith(b"\0"):
+        raise TftpError("Malformed packet: strings must be NUL terminated")
+    return [s.decode("ascii", "replace") for s in data[:-1].split(b"\0")]
+
+def _options(strings: list[str]) -> Options:
+    if len(strings) % 2:
+        raise TftpError("Malformed packet: option without value")
+    # Nomes de opção não diferenciam maiúsculas (RFC 2347)
+    return {strings[i].lower(): strings[i + 1] for i in range(0, len(strings), 2)}
+
+def decode(packet: bytes) -> Tuple:
+    """
+    Decodifica um pacote TFTP em uma tupla que começa pelo opcode:
+    (RRQ|WRQ, filename, mode, options), (DATA, block, payload), (ACK, block),
+    (ERROR, code, message) ou (OACK, options).
+    """
+    if len(packet) < 2:
+        raise TftpError("Malformed packet: too short")
+
+    (opcode,) = _OPCODE.unpack_from(packet)
+    if opcode in (RRQ, WRQ):
+        strings = _strings(packet[2:])
+        if len(strings) < 2:
+            raise TftpError("Malformed request: missing file name or mode")
+        return opcode, strings[0], strings[1].lower(), _options(strings[2:])
+
+    if opcode in (DATA, ACK, ERROR):
+        if len(packet) < 4:
+            raise TftpError("Malformed packet: missing block number")
+        (_, value) = _OPCODE_BLOCK.unpack_from(packet)
+        if opcode == DATA:
+            return opcode, value, packet[4:]
+        if opcode == ACK:
+            return opcode, value
+        message = packet[4:].split(b"\0", 1)[0].decode("ascii", "replace")
+        return opcode, value, message
+
+    if opcode == OACK:
+        return opcode, _options(_strings(packet[2:]) if len(packet) > 2 else [])
+
+    raise TftpError(f"Unknown opcode: {opcode}")
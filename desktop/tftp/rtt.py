@@ -0,0 +1,67 @@
+from data.classes import RttEstimate
+
+# RTO antes da primeira amostra (RFC 6298)
+INITIAL_RTO = 1.0
+
+# Menor RTO. A RFC 6298 pede 1 s, pensando na internet; no Wi-Fi local do módulo o RTT
+# é de poucos milissegundos e um pacote perdido não deve parar a carga por um segundo
+MIN_RTO = 0.1
+
+# Ganhos da RFC 6298 e granularidade do relógio (s)
+ALPHA = 1 / 8
+BETA = 1 / 4
+K = 4
+CLOCK_GRANULARITY = 0.001
+
+class RttEstimator:
+    """
+    RTT de um par e timeout de retransmissão (RTO), como na RFC 6298: cada amostra
+    atualiza SRTT e RTTVAR, o RTO é SRTT + 4 * RTTVAR dentro de [min_rto, max_rto] e
+    dobra a cada timeout até a próxima amostra. Quem mede deve descartar amostras de
+    pacotes retransmitidos (algoritmo de Karn).
+    """
+
+    def __init__(self, max_rto: float, initial_rto: float = INITIAL_RTO, min_rto: float = MIN_RTO):
+        self.min_rto = min(min_rto, max_rto)
+        self.max_rto = max_rto
+        self.srtt: float | None = None
+        self.rttvar: float | None = None
+        self.rto = self._clamp(initial_rto)
+        self.samples = 0
+        self.timeouts = 0
+
+    @classmethod
+    def following(cls, previous: "RttEstimator | None", max_rto: float) -> "RttEstimator":
+        """
+        Estimador de uma nova sessão com o mesmo par, partindo da estimativa da anterior
+        (sem o backoff acumulado por ela).
+        """
+        rtt = cls(max_rto)
+        if previous is not None and previous.srtt is not None:
+            rtt.srtt = previous.srtt
+            rtt.rttvar = previous.rttvar
+            rtt.rto = rtt._computed()
+        return rtt
+
+    def sample(self, rtt: float) -> None:
+        if self.srtt is None:
+            self.srtt = rtt
+            self.rttvar = rtt / 2
+        else:
+            self.rttvar = (1 - BETA) * self.rttvar + BETA * abs(self.srtt - rtt)
+            self.srtt = (1 - ALPHA) * self.srtt + ALPHA * rtt
+        self.samples += 1
+        self.rto = self._computed()
+
+    def backoff(self) -> None:
+        self.timeouts += 1
+        self.rto = min(self.rto * 2, self.max_rto)
+
+    def estimate(self) -> RttEstimate:
+        return RttEstimate(self.srtt, self.rttvar, self.rto, self.samples, self.timeouts)
+
+    def _computed(self) -> float:
+        return self._clamp(self.srtt + max(CLOCK_GRANULARITY, K * self.rttvar))
+
+    def _clamp(self, rto: float) -> float:
+        return min(max(rto, self.min_rto), self.max_rto)
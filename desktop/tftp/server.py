@@ -0,0 +1,238 @@
+import asyncio
+from typing import Any, BinaryIO, Callable, Dict
+
+from data.classes import RttEstimate
+from data.errors import TftpError, TftpTimeoutError
+from services.logging_service import LoggingService
+from tftp.packets import (
+    ACK,
+    ERR_ACCESS_VIOLATION,
+    ERR_FILE_NOT_FOUND,
+    ERR_ILLEGAL_OPERATION,
+    ERR_UNDEFINED,
+    ERROR,
+    MAX_BLOCK_SIZE,
+    MAX_WINDOW_SIZE,
+    RRQ,
+    WRQ,
+    decode,
+    encodeAck,
+    encodeError,
+    encodeOack,
+)
+from tftp.rtt import RttEstimator
+from tftp.streams import AsyncSink, AsyncSource, asSink, asSource
+from tftp.transfer import (
+    Address,
+    Channel,
+    PacketTap,
+    TransferParams,
+    acceptOptions,
+    closeChannel,
+    raiseFromError,
+    receiveFile,
+    sendFile,
+)
+
+# Handler de leitura: (nome do arquivo, endereço do par) -> origem dos dados, ou None
+ReadHandler = Callable[[str, str], BinaryIO | bytes | AsyncSource | None]
+# Handler de escrita: (nome do arquivo, endereço do par) -> destino dos dados, ou None
+WriteHandler = Callable[[str, str], BinaryIO | AsyncSink | None]
+
+class AsyncTftpServer(asyncio.DatagramProtocol):
+    """
+    Servidor TFTP sobre asyncio. Cada pedido RRQ/WRQ vira uma tarefa com o seu próprio
+    socket, e todas as sessões rodam no mesmo event loop. Suporta blksize, windowsize,
+    tsize e timeout (RFC 2347-2349 e 7440).
+
+    Com adaptive_timeout, as retransmissões seguem o RTT medido em cada sessão (timeout
+    passa a ser o maior RTO), e a sessão seguinte com o mesmo par parte da estimativa
+    da anterior. tap, se informado, recebe cada datagrama trocado pelo servidor.
+    """
+
+    def __init__(
+        self,
+        read_handler: ReadHandler,
+        write_handler: WriteHandler,
+        address: str = "",
+        port: int = 69,
+        timeout: float = 5.0,
+        retries: int = 3,
+        max_block_size: int = MAX_BLOCK_SIZE,
+        max_window_size: int = MAX_WINDOW_SIZE,
+        negotiate_options: bool = True,
+        adaptive_timeout: bool = True,
+        tap: PacketTap | None = None,
+    ):
+        self.logging_service = LoggingService(AsyncTftpServer.__name__)
+        self.read_handler = read_handler
+        self.write_handler = write_handler
+        self.address = address or "0.0.0.0"
+        self.port = port
+        self.timeout = timeout
+        self.retries = retries
+        self.max_block_size = max_block_size
+        self.max_window_size = max_window_size
+        # Sem negociação, as opções dos pedidos são ignoradas (TFTP básico, como o firmware)
+        self.negotiate_options = negotiate_options
+        self.adaptive_timeout = adaptive_timeout
+        self.tap = tap
+
+        self.transport: asyncio.DatagramTransport | None = None
+        self._sessions: Dict[Address, asyncio.Task] = {}
+        # Estimadores de RTT das sessões ativas e da última sessão encerrada de cada par
+        self._session_rtt: Dict[Address, RttEstimator] = {}
+        self._rtt: Dict[str, RttEstimator] = {}
+
+    async def start(self) -> None:
+        loop = asyncio.get_running_loop()
+        await loop.create_datagram_endpoint(lambda: self, local_addr=(self.address, self.port))
+        # Com porta 0 o sistema escolhe uma porta livre
+        self.port = self.transport.get_extra_info("sockname")[1]
+
+    async def stop(self) -> None:
+        if self.transport is not None:
+            self.transport.close()
+            self.transport = None
+
+        sessions = list(self._sessions.values())
+        for task in sessions:
+            task.cancel()
+        await asyncio.gather(*sessions, return_exceptions=True)
+
+    def isRunning(self) -> bool:
+        return self.transport is not None and not self.transport.is_closing()
+
+    def sessionCount(self) -> int:
+        return len(self._sessions)
+
+    def rttEstimate(self, host: str) -> RttEstimate | None:
+        """
+        Estimativa de RTT do par host: a da sessão ativa com mais amostras ou a da última
+        sessão encerrada. Pode ser chamado de outra thread.
+        """
+        rtt = self._last_rtt(host)
+        return rtt.estimate() if rtt is not None else None
+
+    def connection_made(self, transport) -> None:
+        self.transport = transport
+
+    def datagram_received(self, data: bytes, addr: Address) -> None:
+        if self.tap is not None:
+            self.tap("in", addr, data)
+        try:
+            packet = decode(data)
+        except TftpError:
+            return
+
+        if packet[0] not in (RRQ, WRQ):
+            # Pacotes de sessão não são aceitos na porta do servidor
+            error = encodeError(ERR_ILLEGAL_OPERATION, "Expected a request")
+            if self.tap is not None:
+                self.tap("out", addr, error)
+            self.transport.sendto(error, addr)
+            return
+        if addr in self._sessions:
+            # Pedido retransmitido pelo cliente; a sessão já está respondendo
+            return
+
+        task = asyncio.get_running_loop().create_task(self._serve(packet, addr))
+        self._sessions[addr] = task
+        task.add_done_callback(lambda _: self._sessions.pop(addr, None))
+
+    async def _serve(self, request: tuple, addr: Address) -> None:
+        opcode, filename, mode, options = request
+        if not self.negotiate_options:
+            options = {}
+        if self.adaptive_timeout:
+            self._session_rtt[addr] = RttEstimator.following(self._last_rtt(addr[0]), self.timeout)
+        channel = await Channel.open((self.address, 0), addr, tap=self.tap)
+        try:
+            if mode not in ("octet", "netascii"):
+                channel.send(encodeError(ERR_ILLEGAL_OPERATION, f"Unsupported mode: {mode}"))
+                return
+
+            if opcode == RRQ:
+                await self._serve_read(channel, filename, options, addr)
+            else:
+                await self._serve_write(channel, filename, options, addr)
+        except TftpError as e:
+            self.logging_service.error(f"TFTP session with {addr[0]}:{addr[1]} for {filename} failed", e)
+        except Exception as e:
+            self.logging_service.error(f"TFTP session with {addr[0]}:{addr[1]} for {filename} failed", e)
+            channel.send(encodeError(ERR_UNDEFINED, "Internal error"))
+        finally:
+            closeChannel(channel)
+            rtt = self._session_rtt.pop(addr, None)
+            if rtt is not None and rtt.samples:
+                self._rtt[addr[0]] = rtt
+
+    def _last_rtt(self, host: str) -> RttEstimator | None:
+        # Sessão ativa com o mesmo par mais bem informada, ou a última encerrada
+        active = [rtt for addr, rtt in list(self._session_rtt.items()) if addr[0] == host and rtt.samples]
+        if active:
+            return max(active, key=lambda rtt: rtt.samples)
+        return self._rtt.get(host)
+
+    def _open(self, handler: Callable, filename: str, host: str) -> Any:
+        try:
+            return handler(filename, host)
+        except Exception as e:
+            self.logging_service.error(f"Handler failed for {filename} from {host}", e)
+            return None
+
+    async def _serve_read(self, channel: Channel, filename: str, options: dict, addr: Address) -> None:
+        fileobj = self._open(self.read_handler, filename, addr[0])
+        if fileobj is None:
+            channel.send(encodeError(ERR_FILE_NOT_FOUND, "File not found"))
+            return
+
+        source = asSource(fileobj, owned=True)
+        try:
+            accepted = acceptOptions(RRQ, options, source.size(), self.max_block_size, self.max_window_size)
+            params = TransferParams(accepted, self.timeout, self.retries, self._session_rtt.get(addr))
+            if accepted:
+                await self._send_oack(channel, accepted, params)
+            await sendFile(channel, source, params)
+        finally:
+            await source.close()
+
+    async def _send_oack(self, channel: Channel, accepted: dict, params: TransferParams) -> None:
+        # No RRQ com opções, a transferência começa depois do ACK 0 do cliente
+        loop = asyncio.get_running_loop()
+        oack = encodeOack(accepted)
+        started = loop.time()
+        retransmitted = False
+        while True:
+            sent_at = loop.time()
+            channel.send(oack)
+            try:
+                while True:
+                    packet, _ = await channel.receive(sent_at + params.waitTime())
+                    if packet[0] == ERROR:
+                        raiseFromError(packet)
+                    if packet[0] == ACK and packet[1] == 0:
+                        if not retransmitted:
+                            params.sample(loop.time() - sent_at)
+                        return
+            except TftpTimeoutError:
+                if params.expired(started):
+                    raise TftpTimeoutError("Timed out waiting for the OACK acknowledgement") from None
+                params.backoff()
+                retransmitted = True
+
+    async def _serve_write(self, channel: Channel, filename: str, options: dict, addr: Address) -> None:
+        fileobj = self._open(self.write_handler, filename, addr[0])
+        if fileobj is None:
+            channel.send(encodeError(ERR_ACCESS_VIOLATION, "Upload not accepted"))
+            return
+
+        sink = asSink(fileobj, owned=True)
+        try:
+            accepted = acceptOptions(WRQ, options, None, self.max_block_size, self.max_window_size)
+            params = TransferParams(accepted, self.timeout, self.retries, self._session_rtt.get(addr))
+            first = encodeOack(accepted) if accepted else encodeAck(0)
+            channel.send(first)
+            await receiveFile(channel, sink, params, first)
+        finally:
+            await sink.close()
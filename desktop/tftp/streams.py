@@ -0,0 +1,169 @@
+import asyncio
+import io
+import os
+from typing import BinaryIO
+
+# Escritas em disco são agrupadas em trechos deste tamanho e feitas fora do event loop
+CHUNK_SIZE = 256 * 1024
+
+class AsyncSource:
+    """
+    Origem dos dados de uma transferência (leitura sequencial).
+    """
+
+    async def read(self, size: int) -> bytes:
+        raise NotImplementedError
+
+    def size(self) -> int | None:
+        return None
+
+    def retransmitted(self, size: int) -> None:
+        """
+        Chamado a cada bloco reenviado ao par (já lido antes).
+        """
+        pass
+
+    async def close(self) -> None:
+        pass
+
+class AsyncSink:
+    """
+    Destino dos dados de uma transferência (escrita sequencial).
+    """
+
+    async def write(self, data: bytes) -> None:
+        raise NotImplementedError
+
+    async def close(self) -> None:
+        pass
+
+class MemorySource(AsyncSource):
+    def __init__(self, data: bytes | bytearray | memoryview):
+        self._view = memoryview(data).cast("B")
+        self._pos = 0
+
+    async def read(self, size: int) -> bytes:
+        chunk = self._view[self._pos:self._pos + size]
+        self._pos += len(chunk)
+        return bytes(chunk)
+
+    def size(self) -> int | None:
+        return len(self._view)
+
+class FileSource(AsyncSource):
+    """
+    Lê um objeto de arquivo síncrono em uma thread auxiliar. Cada leitura pede exatamente
+    um bloco, então a posição do arquivo acompanha os blocos enviados.
+    """
+
+    def __init__(self, fileobj: BinaryIO, close_file: bool = True):
+        self._file = fileobj
+        self._close_file = close_file
+        self._size = self._measure()
+
+    def _measure(self) -> int | None:
+        try:
+            start = self._file.tell()
+            end = self._file.seek(0, io.SEEK_END)
+            self._file.seek(start)
+            return end - start
+        except (OSError, AttributeError, ValueError):
+            return None
+
+    def _read_block(self, size: int) -> bytes:
+        # Uma leitura curta antes do fim do arquivo seria tomada como o último bloco
+        data = self._file.read(size) or b""
+        while data and len(data) < size:
+            more = self._file.read(size - len(data))
+            if not more:
+                break
+            data += more
+        return data
+
+    async def read(self, size: int) -> bytes:
+        return await asyncio.to_thread(self._read_block, size)
+
+    def size(self) -> int | None:
+        return self._size
+
+    def retransmitted(self, size: int) -> None:
+        # Objetos de arquivo que medem a transferência recebem a contagem de retransmissões
+        notify = getattr(self._file, "retransmitted", None)
+        if notify is not None:
+            notify(size)
+
+    async def close(self) -> None:
+        if self._close_file:
+            await asyncio.to_thread(self._file.close)
+
+class MemorySink(AsyncSink):
+    """
+    Acumula os dados em um objeto de arquivo em memória (ex.: BytesIO), sem threads.
+    O objeto é fechado ao fim só se close_file for verdadeiro.
+    """
+
+    def __init__(self, fileobj: BinaryIO, close_file: bool = False):
+        self._file = fileobj
+        self._close_file = close_file
+
+    async def write(self, data: bytes) -> None:
+        self._file.write(data)
+
+    async def close(self) -> None:
+        if self._close_file:
+            self._file.close()
+
+class FileSink(AsyncSink):
+    """
+    Grava em um objeto de arquivo síncrono em trechos de CHUNK_SIZE, em uma thread auxiliar.
+    """
+
+    def __init__(self, fileobj: BinaryIO, close_file: bool = True):
+        self._file = fileobj
+        self._close_file = close_file
+        self._buffer = bytearray()
+
+    async def write(self, data: bytes) -> None:
+        self._buffer += data
+        if len(self._buffer) >= CHUNK_SIZE:
+            await self._flush()
+
+    async def _flush(self) -> None:
+        if self._buffer:
+            data, self._buffer = bytes(self._buffer), bytearray()
+            await asyncio.to_thread(self._file.write, data)
+
+    async def close(self) -> None:
+        await self._flush()
+        if self._close_file:
+            await asyncio.to_thread(self._file.close)
+
+def _is_in_memory(fileobj) -> bool:
+    return isinstance(fileobj, io.BytesIO)
+
+def asSource(source: str | bytes | BinaryIO | AsyncSource, owned: bool = False) -> AsyncSource:
+    """
+    Adapta caminhos, bytes e objetos de arquivo síncronos a um AsyncSource. Objetos de
+    arquivo só são fechados ao fim se owned for verdadeiro; arquivos abertos aqui sempre são.
+    """
+    if isinstance(source, AsyncSource):
+        return source
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return MemorySource(source)
+    if isinstance(source, (str, os.PathLike)):
+        return FileSource(open(source, "rb"))
+    if _is_in_memory(source):
+        data = source.getvalue()[source.tell():]
+        if owned:
+            source.close()
+        return MemorySource(data)
+    return FileSource(source, close_file=owned)
+
+def asSink(sink: str | BinaryIO | AsyncSink, owned: bool = False) -> AsyncSink:
+    if isinstance(sink, AsyncSink):
+        return sink
+    if isinstance(sink, (str, os.PathLike)):
+        return FileSink(open(sink, "wb"))
+    if _is_in_memory(sink):
+        return MemorySink(sink, close_file=owned)
+    return FileSink(sink, close_file=owned)
@@ -0,0 +1,431 @@
+import asyncio
+import socket
+from typing import Callable, Tuple
+
+from data.errors import TftpError, TftpFileNotFoundError, TftpOptionsRefusedError, TftpTimeoutError
+from tftp.packets import (
+    ACK,
+    BLOCK_MODULUS,
+    DATA,
+    DEFAULT_BLOCK_SIZE,
+    ERR_FILE_NOT_FOUND,
+    ERR_ILLEGAL_OPERATION,
+    ERR_OPTIONS,
+    ERR_UNDEFINED,
+    ERR_UNKNOWN_TID,
+    ERROR,
+    MAX_BLOCK_SIZE,
+    MAX_WINDOW_SIZE,
+    MIN_BLOCK_SIZE,
+    RRQ,
+    Options,
+    decode,
+    encodeAck,
+    encodeData,
+    encodeError,
+)
+from tftp.rtt import RttEstimator
+from tftp.streams import AsyncSink, AsyncSource
+
+Address = Tuple[str, int]
+
+# Observador dos datagramas de uma sessão: (sentido "in"/"out", endereço do par, datagrama)
+PacketTap = Callable[[str, Address, bytes], None]
+
+# Buffer de recepção dos sockets de sessão; com janelas grandes o padrão do sistema
+# descarta o fim de cada janela antes de o loop ler os pacotes
+RECEIVE_BUFFER_SIZE = 1024 * 1024
+
+# Tarefas em segundo plano (espera do último ACK) mantidas vivas até terminarem
+_background: set[asyncio.Task] = set()
+
+class Channel(asyncio.DatagramProtocol):
+    """
+    Socket UDP de uma sessão TFTP. Pacotes de outra origem que não o par da sessão
+    (TID) são respondidos com ERR 5 e descartados.
+    """
+
+    def __init__(self, peer: Address | None = None, peer_host: str | None = None, tap: PacketTap | None = None):
+        self.transport: asyncio.DatagramTransport | None = None
+        self.peer = peer
+        # Enquanto a porta do par não é conhecida (cliente antes da primeira resposta),
+        # só o endereço é conferido
+        self.peer_host = peer_host if peer is None else peer[0]
+        self.connected = peer is not None
+        # Em espera do último ACK; o canal é fechado pela própria espera
+        self.dallying = False
+        self.tap = tap
+        self._packets: asyncio.Queue[Tuple[bytes, Address]] = asyncio.Queue()
+
+    @classmethod
+    async def open(
+        cls, local: Address, peer: Address | None = None, peer_host: str | None = None, tap: PacketTap | None = None
+    ) -> "Channel":
+        loop = asyncio.get_running_loop()
+        transport, channel = await loop.create_datagram_endpoint(
+            lambda: cls(peer, peer_host, tap), local_addr=local, remote_addr=peer
+        )
+        try:
+            transport.get_extra_info("socket").setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, RECEIVE_BUFFER_SIZE)
+        except OSError:
+            pass
+        return channel
+
+    def connection_made(self, transport) -> None:
+        self.transport = transport
+
+    def datagram_received(self, data: bytes, addr: Address) -> None:
+        if self.tap is not None:
+            self.tap("in", addr, data)
+        if self.peer is not None and addr != self.peer:
+            self.transport.sendto(encodeError(ERR_UNKNOWN_TID, "Unknown transfer ID"), None if self.connected else addr)
+            return
+        if self.peer is None and self.peer_host is not None and addr[0] != self.peer_host:
+            return
+        self._packets.put_nowait((data, addr))
+
+    def error_received(self, exc: Exception) -> None:
+        # Ex.: ICMP port unreachable; a sessão segue até o timeout
+        pass
+
+    def lockPeer(self, addr: Address) -> None:
+        self.peer = addr
+
+    def send(self, packet: bytes, addr: Address | None = None) -> None:
+        if self.transport is None or self.transport.is_closing():
+            return
+        if self.tap is not None:
+            self.tap("out", addr or self.peer, packet)
+        self.transport.sendto(packet, None if self.connected else (addr or self.peer))
+
+    async def receive(self, deadline: float) -> Tuple[Tuple, Address]:
+        """
+        Próximo pacote válido até o instante deadline (relógio do loop).
+        """
+        loop = asyncio.get_running_loop()
+        while True:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                raise TftpTimeoutError("Timed out waiting for the peer")
+            try:
+                data, addr = await asyncio.wait_for(self._packets.get(), remaining)
+            except asyncio.TimeoutError:
+                raise TftpTimeoutError("Timed out waiting for the peer") from None
+            try:
+                return decode(data), addr
+            except TftpError:
+                # Pacotes malformados são ignorados
+                continue
+
+    def close(self) -> None:
+        if self.transport is not None:
+            self.transport.close()
+
+def raiseFromError(packet: Tuple) -> None:
+    _, code, message = packet
+    if code == ERR_FILE_NOT_FOUND:
+        raise TftpFileNotFoundError(f"File not found: {message}")
+    if code == ERR_OPTIONS:
+        raise TftpOptionsRefusedError(f"Options refused by peer: {message}")
+    raise TftpError(f"Peer error {code}: {message}")
+
+def _int_option(options: Options, name: str, low: int, high: int) -> int | None:
+    try:
+        value = int(options[name])
+    except (KeyError, ValueError):
+        return None
+    return value if low <= value <= high else None
+
+def acceptOptions(
+    opcode: int,
+    requested: Options,
+    size: int | None,
+    max_block_size: int = MAX_BLOCK_SIZE,
+    max_window_size: int = MAX_WINDOW_SIZE,
+) -> Options:
+    """
+    Opções aceitas pelo servidor para um pedido (RFC 2347). Opções desconhecidas ou
+    inválidas ficam de fora da resposta, o que o cliente trata como recusa.
+    """
+    accepted: Options = {}
+
+    block_size = _int_option(requested, "blksize", MIN_BLOCK_SIZE, MAX_BLOCK_SIZE)
+    if block_size is not None:
+        accepted["blksize"] = str(min(block_size, max_block_size))
+
+    window_size = _int_option(requested, "windowsize", 1, MAX_WINDOW_SIZE)
+    if window_size is not None:
+        accepted["windowsize"] = str(min(window_size, max_window_size))
+
+    timeout = _int_option(requested, "timeout", 1, 255)
+    if timeout is not None:
+        accepted["timeout"] = str(timeout)
+
+    if "tsize" in requested:
+        if opcode == RRQ and size is not None:
+            accepted["tsize"] = str(size)
+        elif opcode != RRQ and _int_option(requested, "tsize", 0, 1 << 63) is not None:
+            accepted["tsize"] = requested["tsize"]
+
+    return accepted
+
+def checkOack(requested: Options, offered: Options) -> Options:
+    """
+    Confere a resposta OACK contra o que foi pedido e retorna as opções valendo.
+    """
+    for name in offered:
+        if name not in requested:
+            raise TftpOptionsRefusedError(f"Peer acknowledged an option that was not requested: {name}")
+
+    if "blksize" in offered:
+        block_size = _int_option(offered, "blksize", MIN_BLOCK_SIZE, int(requested["blksize"]))
+        if block_size is None:
+            raise TftpOptionsRefusedError(f"Invalid blksize in OACK: {offered['blksize']}")
+    if "windowsize" in offered:
+        window_size = _int_option(offered, "windowsize", 1, int(requested["windowsize"]))
+        if window_size is None:
+            raise TftpOptionsRefusedError(f"Invalid windowsize in OACK: {offered['windowsize']}")
+    if "timeout" in offered and offered["timeout"] != requested["timeout"]:
+        raise TftpOptionsRefusedError(f"Invalid timeout in OACK: {offered['timeout']}")
+    if "tsize" in offered and _int_option(offered, "tsize", 0, 1 << 63) is None:
+        raise TftpOptionsRefusedError(f"Invalid tsize in OACK: {offered['tsize']}")
+    return offered
+
+class TransferParams:
+    """
+    Parâmetros valendo em uma sessão, depois da negociação. Com rtt, cada espera por
+    resposta dura o RTO estimado, limitado a timeout; sem ele, ou com a opção timeout
+    negociada (RFC 2349), dura timeout. Nos dois casos a sessão desiste depois de
+    timeout * (retries + 1) segundos sem progresso.
+    """
+
+    def __init__(self, options: Options, timeout: float, retries: int, rtt: RttEstimator | None = None):
+        self.blockSize = int(options.get("blksize", DEFAULT_BLOCK_SIZE))
+        self.windowSize = int(options.get("windowsize", 1))
+        self.timeout = float(options.get("timeout", timeout))
+        self.retries = retries
+        self.rtt = rtt if "timeout" not in options else None
+
+    def waitTime(self) -> float:
+        return self.rtt.rto if self.rtt is not None else self.timeout
+
+    def sample(self, rtt: float) -> None:
+        if self.rtt is not None:
+            self.rtt.sample(rtt)
+
+    def backoff(self) -> None:
+        if self.rtt is not None:
+            self.rtt.backoff()
+
+    def expired(self, since: float) -> bool:
+        # since é o instante (relógio do loop) do último progresso da sessão
+        return asyncio.get_running_loop().time() - since >= self.timeout * (self.retries + 1)
+
+async def sendFile(
+    channel: Channel,
+    source: AsyncSource,
+    params: TransferParams,
+    on_block: Callable[[int, int], None] | None = None,
+) -> int:
+    """
+    Envia o conteúdo de source em blocos DATA, com até windowSize blocos sem
+    confirmação (RFC 7440). Retorna o número de bytes enviados.
+    """
+    loop = asyncio.get_running_loop()
+    # Números de bloco absolutos (sem a volta de 16 bits)
+    acked = 0
+    next_block = 1
+    last_block: int | None = None
+    pending: dict[int, bytes] = {}
+    # Instante do envio dos blocos pendentes que ainda não foram retransmitidos; só eles
+    # medem o RTT (algoritmo de Karn)
+    sent_at: dict[int, float] = {}
+    sent_bytes = 0
+    progress_at = loop.time()
+    # Último bloco confirmado a partir do qual a janela já foi reenviada por ACK repetido
+    rewound_at = -1
+
+    while last_block is None or acked < last_block:
+        while next_block <= acked + params.windowSize and (last_block is None or next_block <= last_block):
+            payload = pending.get(next_block)
+            if payload is None:
+                payload = await source.read(params.blockSize)
+                pending[next_block] = payload
+                if len(payload) < params.blockSize:
+                    last_block = next_block
+                sent_at[next_block] = loop.time()
+            else:
+                source.retransmitted(len(payload))
+                sent_at.pop(next_block, None)
+            channel.send(encodeData(next_block, payload))
+            next_block += 1
+
+        deadline = loop.time() + params.waitTime()
+        progressed = False
+        while not progressed:
+            try:
+                packet, _ = await channel.receive(deadline)
+            except TftpTimeoutError:
+                if params.expired(progress_at):
+                    raise
+                params.backoff()
+                # Reenvia a janela a partir do primeiro bloco não confirmado
+                next_block = acked + 1
+                break
+
+            if packet[0] == ERROR:
+                raiseFromError(packet)
+            if packet[0] != ACK:
+                continue
+
+            # Converte o número de 16 bits para o bloco absoluto mais próximo já enviado
+            block = acked + (packet[1] - acked) % BLOCK_MODULUS
+            if acked < block < next_block:
+                if block in sent_at:
+                    params.sample(loop.time() - sent_at[block])
+                for number in range(acked + 1, block + 1):
+                    payload = pending.pop(number)
+                    sent_at.pop(number, None)
+                    sent_bytes += len(payload)
+                    if on_block is not None:
+                        on_block(number, len(payload))
+                acked = block
+                progress_at = loop.time()
+                progressed = True
+                # ACK antes do último bloco enviado: o receptor descartou o resto da janela
+                # (RFC 7440), que é reenviada a partir do bloco seguinte
+                next_block = block + 1
+            elif block == acked and params.windowSize > 1 and next_block > acked + 1 and rewound_at != acked:
+                # Com janela, um ACK repetido indica perda: reenvia uma vez a partir do bloco seguinte
+                next_block = acked + 1
+                rewound_at = acked
+                progressed = True
+            # Em lock-step, ACKs duplicados são ignorados (Sorcerer's Apprentice)
+
+    return sent_bytes
+
+async def receiveFile(
+    channel: Channel,
+    sink: AsyncSink,
+    params: TransferParams,
+    resend: bytes,
+    first: Tuple | None = None,
+    on_block: Callable[[int, int], None] | None = None,
+) -> int:
+    """
+    Recebe blocos DATA e grava em sink, confirmando a cada windowSize blocos (RFC 7440).
+    resend é o último pacote enviado ao par (pedido, OACK ou ACK 0), repetido em caso
+    de timeout antes do primeiro bloco. Retorna o número de bytes recebidos.
+    """
+    loop = asyncio.get_running_loop()
+    expected = 1
+    received = 0
+    in_window = 0
+    last_ack = resend
+    progress_at = loop.time()
+    # Instante do último ACK (ou de resend) enviado uma única vez; o próximo bloco em
+    # ordem mede o RTT
+    acked_at = loop.time() if first is None else None
+    # Posição, relativa ao bloco esperado, do pacote que gerou a última confirmação de
+    # lacuna. Os pacotes seguintes da mesma rajada não geram outra; um pacote na mesma
+    # posição ou antes indica que o par retransmitiu e precisa de nova confirmação
+    gap_acked_at: int | None = None
+
+    while True:
+        if first is not None:
+            packet, first = first, None
+        else:
+            try:
+                packet, _ = await channel.receive(loop.time() + params.waitTime())
+            except TftpTimeoutError:
+                if params.expired(progress_at):
+                    raise
+                params.backoff()
+                # O fim da janela se perdeu: confirma o último bloco recebido em ordem
+                if expected > 1:
+                    last_ack = encodeAck(expected - 1)
+                channel.send(last_ack)
+                acked_at = None
+                in_window = 0
+                continue
+
+        if packet[0] == ERROR:
+            raiseFromError(packet)
+        if packet[0] != DATA:
+            continue
+
+        if packet[1] != expected % BLOCK_MODULUS:
+            # Bloco repetido ou fora de ordem: confirma o último bloco recebido em ordem
+            position = (packet[1] - expected + BLOCK_MODULUS // 2) % BLOCK_MODULUS - BLOCK_MODULUS // 2
+            if expected > 1 and (gap_acked_at is None or position <= gap_acked_at):
+                last_ack = encodeAck(expected - 1)
+                channel.send(last_ack)
+                gap_acked_at = position
+                acked_at = None
+            in_window = 0
+            continue
+
+        payload = packet[2]
+        if len(payload) > params.blockSize:
+            channel.send(encodeError(ERR_ILLEGAL_OPERATION, "Block larger than negotiated"))
+            raise TftpError(f"Received a {len(payload)} bytes block, negotiated {params.blockSize}")
+
+        if acked_at is not None:
+            params.sample(loop.time() - acked_at)
+            acked_at = None
+
+        await sink.write(payload)
+        received += len(payload)
+        if on_block is not None:
+            on_block(expected, len(payload))
+        progress_at = loop.time()
+        gap_acked_at = None
+        in_window += 1
+
+        if len(payload) < params.blockSize:
+            channel.send(encodeAck(expected))
+            _dally(channel, expected, params.timeout)
+            return received
+
+        if in_window >= params.windowSize:
+            last_ack = encodeAck(expected)
+            channel.send(last_ack)
+            acked_at = loop.time()
+            in_window = 0
+        expected += 1
+
+def _dally(channel: Channel, last_block: int, timeout: float) -> None:
+    """
+    Mantém o socket aberto após o último ACK, reconfirmando o último bloco caso o par
+    não tenha recebido a confirmação (RFC 1350). A espera cobre duas retransmissões do
+    par e recomeça a cada reconfirmação.
+    """
+    async def dally():
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + 2 * timeout
+        try:
+            while True:
+                packet, _ = await channel.receive(deadline)
+                if packet[0] == DATA and packet[1] == last_block % BLOCK_MODULUS:
+                    channel.send(encodeAck(last_block))
+                    deadline = loop.time() + 2 * timeout
+        except (TftpTimeoutError, asyncio.CancelledError):
+            pass
+        finally:
+            channel.close()
+
+    channel.dallying = True
+    task = asyncio.get_running_loop().create_task(dally())
+    _background.add(task)
+    task.add_done_callback(_background.discard)
+
+def closeChannel(channel: Channel) -> None:
+    if not channel.dallying:
+        channel.close()
+
+def refuse(channel: Channel, message: str) -> None:
+    channel.send(encodeError(ERR_OPTIONS, message))
+
+def isOptionsRefusal(packet: Tuple) -> bool:
+    # Servidores antigos respondem a opções desconhecidas com ERR 0 ou ERR 4 em vez de ERR 8
+    return packet[0] == ERROR and packet[1] in (ERR_OPTIONS, ERR_ILLEGAL_OPERATION, ERR_UNDEFINED)